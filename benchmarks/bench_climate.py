@@ -0,0 +1,194 @@
+"""
+Benchmark suite of climate scripts run on synthetic data sets (see generate_climate_data.py):
+    - load - parsing data file (as climate_diagram_generator does it), loading binary snapshot
+    - limits - Y axis limits of diagrams (get_yaxis_limits) of data frame and of compact data set
+      (ClimateDataset, used by climate_diagram_generator)
+    - convert - conversion C_mm -> F_inch and F_inch -> C_mm of the whole data set
+    - render - creating diagrams of sample of stations at several resolutions, both backends,
+      pyramid of all resolutions rendered once
+Data files are generated once and kept in the data directory (default benchmarks/data).
+Results are saved as JSON file, results of two runs (e.g. of two commits) are compared by compare_benchmarks.py.
+
+Usage:
+    python benchmarks/bench_climate.py [--stations STATIONS ...] [--dpi DPI ...] [--repeat REPEAT]
+                                       [--render-stations RENDER_STATIONS] [--data-dir DATA_DIR] [-o OUTPUT]
+"""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import argparse
+import sys
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_common import (  # pylint: disable=wrong-import-position
+    save_results,
+    time_function
+)
+from generate_climate_data import write_climate_data  # pylint: disable=wrong-import-position
+from climate_data_loader import load_climate_data  # pylint: disable=wrong-import-position
+from climate_data_unit_converter import convert_data  # pylint: disable=wrong-import-position
+from climate_dataset import ClimateDataset  # pylint: disable=wrong-import-position
+from climate_diagram_generator import (  # pylint: disable=wrong-import-position
+    DATA_DTYPE,
+    DiagramTemplate,
+    RenderSettings,
+    create_diagram,
+    get_yaxis_limits,
+    render_diagram
+)
+from climate_diagram_svg import SvgDiagramTemplate  # pylint: disable=wrong-import-position
+
+STATIONS = (10, 1_000, 100_000, 1_000_000)
+DPIS = (72, 150, 300, 600)
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(description='Benchmark climate scripts on synthetic data sets')
+    parser.add_argument('--stations', type=int, nargs='+', default=STATIONS,
+                        help='Numbers of stations of data sets, default 10 1000 100000 1000000')
+    parser.add_argument('--dpi', type=int, nargs='+', default=DPIS,
+                        help='Resolutions of rendered diagrams, default 72 150 300 600')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of repetitions, default 3')
+    parser.add_argument('--render-stations', type=int, default=5,
+                        help='Number of stations rendered at every resolution, default 5')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR,
+                        help='Directory of generated data files, default benchmarks/data')
+    parser.add_argument('-o', '--output', type=str, default='benchmark_results.json',
+                        help='Path to results file, default benchmark_results.json')
+    return parser.parse_args()
+
+
+def get_data_path(data_dir: Path, num_stations: int, unit: str) -> Path:
+    """Return path of synthetic data file, generate the file if it does not exist.
+
+    :param data_dir: directory of generated data files
+    :param num_stations: number of stations
+    :param unit: unit of data, C_mm or F_inch
+    :return: path of data file
+    """
+    data_path = data_dir / f'climate_{num_stations}_{unit}.csv'
+    if not data_path.exists():
+        data_dir.mkdir(parents=True, exist_ok=True)
+        print(f'Generating {data_path}')
+        tmp_path = data_path.with_name(f'{data_path.name}.tmp')
+        write_climate_data(str(tmp_path), num_stations, unit=unit)
+        tmp_path.replace(data_path)
+    return data_path
+
+
+def bench_data_set(num_stations: int, data_dir: Path, repeat: int) -> dict[str, list[float]]:
+    """Return times of loading, Y axis limits and conversions of data set.
+
+    :param num_stations: number of stations
+    :param data_dir: directory of generated data files
+    :param repeat: number of repetitions
+    :return: times of benchmarks, key - benchmark name
+    """
+    c_mm_path = get_data_path(data_dir, num_stations, 'C_mm')
+    f_inch_path = get_data_path(data_dir, num_stations, 'F_inch')
+    c_mm_data = load_climate_data(c_mm_path, np.float64, use_snapshot=False)
+    c_mm_dataset = ClimateDataset.from_frame(c_mm_data, DATA_DTYPE)
+    f_inch_data = load_climate_data(f_inch_path, np.float64, use_snapshot=False)
+    load_climate_data(c_mm_path, DATA_DTYPE)  # snapshot is created before it is timed
+    return {
+        'load_csv': time_function(lambda: load_climate_data(c_mm_path, DATA_DTYPE, use_snapshot=False), repeat),
+        'load_snapshot': time_function(lambda: load_climate_data(c_mm_path, DATA_DTYPE), repeat),
+        'limits': time_function(lambda: get_yaxis_limits(c_mm_data), repeat),
+        'limits_dataset': time_function(lambda: get_yaxis_limits(c_mm_dataset), repeat),
+        'convert_to_f_inch': time_function(lambda: convert_data(c_mm_data, 'F_inch'), repeat),
+        'convert_to_c_mm': time_function(lambda: convert_data(f_inch_data, 'C_mm'), repeat)
+    }
+
+
+def bench_rendering(data_dir: Path, dpis: list[int], num_stations: int, repeat: int) -> dict[str, list[float]]:
+    """Return times of rendering diagrams, time of single diagram (mean of sample of stations).
+
+    :param data_dir: directory of generated data files
+    :param dpis: resolutions of diagrams
+    :param num_stations: number of rendered stations
+    :param repeat: number of repetitions
+    :return: times of benchmarks, key - benchmark name
+    """
+    data = load_climate_data(get_data_path(data_dir, num_stations, 'C_mm'), DATA_DTYPE, use_snapshot=False)
+    y_axis_limits = get_yaxis_limits(data)
+    stations = [(station, data.loc[station]) for station in data.index.unique(level='Station')]
+
+    results = {}
+    with TemporaryDirectory() as output_dir:
+        def render_all(template: DiagramTemplate | SvgDiagramTemplate) -> None:
+            for station, station_data in stations:
+                render_diagram(template, station_data, station)
+
+        def create_all() -> None:
+            for station, station_data in stations:
+                create_diagram(y_axis_limits, station_data, station, RenderSettings(output_dir=output_dir))
+
+        results['create_diagram'] = time_function(create_all, repeat)
+        dpis = sorted(dpis, reverse=True)
+        settings = [RenderSettings(dpi, 'jpg', 'matplotlib', output_dir) for dpi in dpis]
+        settings += [RenderSettings(dpi, 'png', 'fast', output_dir) for dpi in dpis]
+        settings += [RenderSettings(file_format='svg', backend='fast', output_dir=output_dir)]
+        if len(dpis) > 1:
+            settings += [RenderSettings(dpis[0], 'jpg', 'matplotlib', output_dir, tuple(dpis[1:])),
+                         RenderSettings(dpis[0], 'png', 'fast', output_dir, tuple(dpis[1:]))]
+        for setting in settings:
+            template_class = SvgDiagramTemplate if setting.backend == 'fast' else DiagramTemplate
+            with template_class(y_axis_limits, setting) as template:
+                name = f'render_{setting.backend}_{setting.file_format}'
+                name += f'_{setting.dpi}dpi' if setting.file_format != 'svg' else ''
+                name += '_pyramid' if setting.pyramid else ''
+                results[name] = time_function(lambda template=template: render_all(template), repeat)
+    return {name: [time / len(stations) for time in times] for name, times in results.items()}
+
+
+def summarize(name: str, num_stations: int | None, times: list[float]) -> dict:
+    """Return result of benchmark.
+
+    :param name: benchmark name
+    :param num_stations: number of stations of data set, None for rendering benchmarks
+    :param times: times of repetitions
+    :return: dictionary with benchmark name, number of stations, best, mean time and all times
+    """
+    return {'benchmark': name, 'stations': num_stations, 'best': min(times), 'mean': float(np.mean(times)),
+            'times': times}
+
+
+def main(
+        stations: list[int],
+        dpis: list[int],
+        repeat: int,
+        render_stations: int,
+        data_dir: Path,
+        output_path: str
+) -> None:
+    """Run benchmarks, print and save results.
+
+    :param stations: numbers of stations of data sets
+    :param dpis: resolutions of rendered diagrams
+    :param repeat: number of repetitions
+    :param render_stations: number of stations rendered at every resolution
+    :param data_dir: directory of generated data files
+    :param output_path: path to results file
+    """
+    results = []
+    for num_stations in stations:
+        for name, times in bench_data_set(num_stations, data_dir, repeat).items():
+            results.append(summarize(name, num_stations, times))
+            print(f'{name:36} {num_stations:>9} stations  {min(times) * 1000:10.2f} ms')
+    for name, times in bench_rendering(data_dir, dpis, render_stations, repeat).items():
+        results.append(summarize(name, None, times))
+        print(f'{name:36} {"per diagram":>18}  {min(times) * 1000:10.2f} ms')
+
+    save_results(output_path, results, repeat, numpy=np.__version__, pandas=pd.__version__,
+                 matplotlib=matplotlib.__version__)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    main(args.stations, args.dpi, args.repeat, args.render_stations, args.data_dir, args.output)
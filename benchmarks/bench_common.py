@@ -0,0 +1,60 @@
+"""
+Helpers shared by benchmark suites (bench_climate.py, bench_morse.py, bench_unit_conversion.py):
+timing of functions, description of environment and saving results as JSON file (see compare_benchmarks.py).
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+import json
+import platform
+import subprocess
+
+
+def time_function(func: Callable, repeat: int) -> list[float]:
+    """Return execution times of function.
+
+    :param func: function to benchmark, called without arguments
+    :param repeat: number of repetitions
+    :return: times in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+    return times
+
+
+def get_environment(**versions: str) -> dict:
+    """Return description of environment benchmarks are run in.
+
+    :param versions: versions of libraries used by benchmarks, e.g. numpy=np.__version__
+    :return: dictionary with commit, platform, versions of Python and libraries
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=Path(__file__).resolve().parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'python': platform.python_version(),
+        **versions
+    }
+
+
+def save_results(output_path: str, results: list[dict], repeat: int, **versions: str) -> None:
+    """Save results of benchmarks with description of environment into JSON file.
+
+    :param output_path: path to results file
+    :param results: results of benchmarks
+    :param repeat: number of repetitions
+    :param versions: versions of libraries used by benchmarks, see get_environment
+    """
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': get_environment(**versions), 'repeat': repeat, 'results': results}, f, indent=1)
+    print(f'Results saved to {output_path}')
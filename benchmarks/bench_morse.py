@@ -0,0 +1,230 @@
+"""
+Benchmark suite of Morse code scripts run on synthetic corpora (see generate_morse_corpus.py):
+    - encode - text corpus encoded as stream (file in chunks, morse_encoder --file), in memory (whole file
+      read and encoded at once) and by batch API (lines as messages, morse_batch), throughput in characters/s
+    - decode - Morse code corpus decoded as stream (morse_decoder --file) and in memory (decode_text)
+    - audio - Morse code synthesized to audio (morse_audio) and decoded from it (morse_audio_decoder),
+      real-time factor: duration of audio / time of processing
+Peak memory (tracemalloc) of every encode and decode mode is measured in separate run (not timed).
+In-memory modes are skipped for corpora larger than --max-in-memory.
+Corpora are generated once and kept in the data directory (default benchmarks/data).
+Results are saved as JSON file, results of two runs (e.g. of two commits) are compared by compare_benchmarks.py.
+
+Usage:
+    python benchmarks/bench_morse.py [--sizes SIZES ...] [--repeat REPEAT] [--max-in-memory MAX_IN_MEMORY]
+                                     [--audio-chars AUDIO_CHARS] [--data-dir DATA_DIR] [-o OUTPUT]
+"""
+from io import StringIO
+from pathlib import Path
+from typing import Callable
+import argparse
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_common import (  # pylint: disable=wrong-import-position
+    save_results,
+    time_function
+)
+from generate_morse_corpus import (  # pylint: disable=wrong-import-position
+    format_size,
+    parse_size,
+    write_morse_corpus,
+    write_text_corpus
+)
+from morse_audio import (  # pylint: disable=wrong-import-position
+    AudioSettings,
+    synthesize
+)
+from morse_audio_decoder import decode_audio  # pylint: disable=wrong-import-position
+from morse_batch import encode_batch  # pylint: disable=wrong-import-position
+from morse_decoder import (  # pylint: disable=wrong-import-position
+    decode_file,
+    decode_text
+)
+from morse_encoder import (  # pylint: disable=wrong-import-position
+    encode_file,
+    encode_stream
+)
+
+SIZES = ('1K', '1M', '100M', '1G')
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(description='Benchmark Morse code scripts on synthetic corpora')
+    parser.add_argument('--sizes', type=parse_size, nargs='+', default=[parse_size(size) for size in SIZES],
+                        help='Sizes of corpora (K, M, G - binary units), default 1K 1M 100M 1G')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of repetitions, default 3')
+    parser.add_argument('--max-in-memory', type=parse_size, default=parse_size('100M'),
+                        help='Max size of corpus processed in memory, default 100M')
+    parser.add_argument('--audio-chars', type=int, default=16_384,
+                        help='Number of characters of Morse code synthesized to audio, default 16384 (about 1 hour)')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR,
+                        help='Directory of generated corpora, default benchmarks/data')
+    parser.add_argument('-o', '--output', type=str, default='benchmark_morse_results.json',
+                        help='Path to results file, default benchmark_morse_results.json')
+    return parser.parse_args()
+
+
+def get_peak_memory(func: Callable) -> int:
+    """Return peak memory allocated while function is executed (by Python and NumPy).
+
+    :param func: function to measure, called without arguments
+    :return: peak memory in bytes
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def get_corpus_path(data_dir: Path, size: int, morse: bool = False) -> Path:
+    """Return path of synthetic corpus, generate the file if it does not exist.
+
+    :param data_dir: directory of generated corpora
+    :param size: size of corpus (bytes)
+    :param morse: Morse code corpus, otherwise text corpus
+    :return: path of corpus
+    """
+    corpus_path = data_dir / f'morse_corpus_{format_size(size)}.{"morse" if morse else "txt"}'
+    if not corpus_path.exists():
+        data_dir.mkdir(parents=True, exist_ok=True)
+        print(f'Generating {corpus_path}')
+        tmp_path = corpus_path.with_name(f'{corpus_path.name}.tmp')
+        (write_morse_corpus if morse else write_text_corpus)(str(tmp_path), size)
+        tmp_path.replace(corpus_path)
+    return corpus_path
+
+
+def read_text(path: Path) -> str:
+    """Return content of corpus.
+
+    :param path: path of corpus
+    :return: text
+    """
+    with open(path, encoding='ascii') as f:
+        return f.read()
+
+
+def encode_in_memory(path: Path) -> str:
+    """Return Morse code of text file read and encoded at once (encode_stream with single chunk).
+
+    :param path: path of text corpus
+    :return: Morse code
+    """
+    text = read_text(path)
+    output = StringIO()
+    encode_stream(StringIO(text), output, chunk_size=len(text) or 1)
+    return output.getvalue()
+
+
+def encode_lines(path: Path) -> int:
+    """Encode lines of text file with batch API.
+
+    :param path: path of text corpus
+    :return: number of encoded lines
+    """
+    with open(path, encoding='ascii') as f:
+        return sum(1 for _ in encode_batch(line.rstrip('\n') for line in f))
+
+
+def bench_corpus(size: int, data_dir: Path, repeat: int, in_memory: bool) -> dict[str, tuple[list[float], int, int]]:
+    """Return times and peak memory of encoding and decoding corpora.
+
+    :param size: size of corpora (bytes)
+    :param data_dir: directory of generated corpora
+    :param repeat: number of repetitions
+    :param in_memory: run in-memory modes
+    :return: times, peak memory (bytes) and number of input characters of benchmarks, key - benchmark name
+    """
+    text_path = get_corpus_path(data_dir, size)
+    morse_path = get_corpus_path(data_dir, size, morse=True)
+    benchmarks = {
+        'encode_stream': lambda: encode_file(str(text_path), os.devnull),
+        'encode_batch': lambda: encode_lines(text_path),
+        'decode_stream': lambda: decode_file(str(morse_path), os.devnull)
+    }
+    if in_memory:
+        benchmarks['encode_in_memory'] = lambda: encode_in_memory(text_path)
+        benchmarks['decode_in_memory'] = lambda: decode_text(read_text(morse_path))
+    return {name: (time_function(func, repeat), get_peak_memory(func),
+                   os.path.getsize(morse_path if name.startswith('decode') else text_path))
+            for name, func in benchmarks.items()}
+
+
+def bench_audio(data_dir: Path, num_chars: int, repeat: int) -> dict[str, tuple[list[float], float]]:
+    """Return times of synthesis and decoding of audio of Morse code.
+
+    :param data_dir: directory of generated corpora
+    :param num_chars: number of characters of Morse code
+    :param repeat: number of repetitions
+    :return: times and duration of audio (seconds) of benchmarks, key - benchmark name
+    """
+    code = read_text(get_corpus_path(data_dir, parse_size('1M'), morse=True))[:num_chars]
+    code = code[:code.rfind(' ')]
+    settings = AudioSettings()
+    samples = synthesize(code, settings)
+    duration = samples.size / settings.sample_rate
+    audio = samples.astype(np.float32) / 32768
+    return {
+        'synthesize': (time_function(lambda: synthesize(code, settings), repeat), duration),
+        'decode_audio': (time_function(lambda: decode_audio([audio], settings.sample_rate), repeat), duration)
+    }
+
+
+def summarize(name: str, size: int, times: list[float], **values) -> dict:
+    """Return result of benchmark.
+
+    :param name: benchmark name
+    :param size: size of input (bytes, characters)
+    :param times: times of repetitions
+    :param values: other values of result (throughput, memory)
+    :return: dictionary with benchmark name, size, best, mean time, all times and values
+    """
+    return {'benchmark': name, 'size': size, 'best': min(times), 'mean': float(np.mean(times)), 'times': times,
+            **values}
+
+
+def main(
+        sizes: list[int],
+        repeat: int,
+        max_in_memory: int,
+        audio_chars: int,
+        data_dir: Path,
+        output_path: str
+) -> None:
+    """Run benchmarks, print and save results.
+
+    :param sizes: sizes of corpora (bytes)
+    :param repeat: number of repetitions
+    :param max_in_memory: max size of corpus processed in memory
+    :param audio_chars: number of characters of Morse code synthesized to audio
+    :param data_dir: directory of generated corpora
+    :param output_path: path to results file
+    """
+    results = []
+    for size in sizes:
+        for name, (times, peak_memory, chars) in bench_corpus(size, data_dir, repeat, size <= max_in_memory).items():
+            chars_per_s = chars / min(times)
+            results.append(summarize(name, size, times, chars_per_s=chars_per_s, peak_memory=peak_memory))
+            print(f'{name:20} {format_size(size):>6}  {min(times) * 1000:10.2f} ms  '
+                  f'{chars_per_s / 1e6:8.2f} M chars/s  {peak_memory / (1 << 20):8.1f} MB peak')
+    for name, (times, duration) in bench_audio(data_dir, audio_chars, repeat).items():
+        realtime_factor = duration / min(times)
+        results.append(summarize(name, audio_chars, times, audio_seconds=duration, realtime_factor=realtime_factor))
+        print(f'{name:20} {duration:>6.0f} s  {min(times) * 1000:10.2f} ms  {realtime_factor:8.0f} x real time')
+
+    save_results(output_path, results, repeat, numpy=np.__version__)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    main(args.sizes, args.repeat, args.max_in_memory, args.audio_chars, args.data_dir, args.output)
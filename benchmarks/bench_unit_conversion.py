@@ -0,0 +1,59 @@
+"""
+Benchmark of climate data unit conversion: per column apply of scalar conversion functions
+compared with vectorized conversion (new data frame and in place).
+
+Usage:
+    python benchmarks/bench_unit_conversion.py [--rows ROWS] [--repeat REPEAT]
+"""
+from pathlib import Path
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_common import time_function  # pylint: disable=wrong-import-position
+from climate_data_unit_converter import (  # pylint: disable=wrong-import-position
+    celsius_to_fahrenheit,
+    mm_to_inch,
+    convert_to_f_inch
+)
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(description='Benchmark climate data unit conversion')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Number of rows (temperature and precipitation)')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of repetitions, best time is reported')
+    return parser.parse_args()
+
+
+def main(rows: int, repeat: int) -> None:
+    """Run benchmark and print results.
+
+    :param rows: number of rows (half temperature, half precipitation)
+    :param repeat: number of repetitions
+    """
+    rng = np.random.default_rng(0)
+    t = pd.DataFrame(np.round(rng.uniform(-60, 40, (rows // 2, 12)), 1), columns=MONTHS)
+    p = pd.DataFrame(np.round(rng.uniform(0, 500, (rows // 2, 12)), 1), columns=MONTHS)
+
+    benchmarks = {
+        'apply': lambda: (t.apply(celsius_to_fahrenheit), p.apply(mm_to_inch)),
+        'vectorized': lambda: convert_to_f_inch(t, p),
+        'vectorized inplace (+ copy)': lambda: convert_to_f_inch(t.copy(), p.copy(), inplace=True),
+        'copy only (inplace overhead)': lambda: (t.copy(), p.copy())
+    }
+    results = {name: min(time_function(func, repeat)) for name, func in benchmarks.items()}
+    print(f'{rows} rows, best of {repeat}')
+    for name, seconds in results.items():
+        print(f'{name:30} {seconds * 1000:9.1f} ms  x{results["apply"] / seconds:.1f}')
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    main(args.rows, args.repeat)
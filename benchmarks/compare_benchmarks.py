@@ -0,0 +1,77 @@
+"""
+Compare two results files of bench_climate.py (or of bench_morse.py), e.g. of two commits.
+Best times of the same benchmarks are compared, benchmark is regression if it is slower by more than threshold.
+Script exits with code 1 if there is any regression.
+
+Usage:
+    python benchmarks/compare_benchmarks.py [--threshold THRESHOLD] baseline_path results_path
+"""
+import argparse
+import json
+import sys
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(description='Compare results of two benchmark runs')
+    parser.add_argument('baseline_path', type=str, help='Path to baseline results file')
+    parser.add_argument('results_path', type=str, help='Path to compared results file')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Relative slowdown treated as regression, default 0.1 (10%%)')
+    return parser.parse_args()
+
+
+def load_results(path: str) -> tuple[dict, dict[tuple[str, int | None], float]]:
+    """Return environment and best times of benchmarks from results file.
+
+    :param path: path to results file
+    :return: environment, best times - key (benchmark name, number of stations or size of input)
+    """
+    with open(path, encoding='utf-8') as f:
+        results = json.load(f)
+    best_times = {(result['benchmark'], result['stations'] if 'stations' in result else result['size']): result['best']
+                  for result in results['results']}
+    return results['environment'], best_times
+
+
+def compare(baseline: dict, results: dict) -> list[tuple[str, int | None, float, float, float]]:
+    """Return comparison of benchmarks present in both results.
+
+    :param baseline: best times of baseline run
+    :param results: best times of compared run
+    :return: tuples (benchmark name, number of stations, baseline time, time, ratio) of compared benchmarks
+    """
+    return [(name, stations, baseline[(name, stations)], best, best / baseline[(name, stations)])
+            for (name, stations), best in results.items() if (name, stations) in baseline]
+
+
+def main(baseline_path: str, results_path: str, threshold: float) -> bool:
+    """Print comparison of two results files.
+
+    :param baseline_path: path to baseline results file
+    :param results_path: path to compared results file
+    :param threshold: relative slowdown treated as regression
+    :return: True if there is any regression, False otherwise
+    """
+    baseline_env, baseline = load_results(baseline_path)
+    results_env, results = load_results(results_path)
+    print(f'baseline: {baseline_env.get("commit")}  compared: {results_env.get("commit")}')
+
+    regression = False
+    for name, stations, baseline_time, best, ratio in compare(baseline, results):
+        status = ''
+        if ratio > 1 + threshold:
+            status = 'REGRESSION'
+            regression = True
+        elif ratio < 1 - threshold:
+            status = 'improvement'
+        stations = '' if stations is None else stations
+        print(f'{name:36} {stations:>9} {baseline_time * 1000:10.2f} ms {best * 1000:10.2f} ms '
+              f'x{ratio:6.2f} {status}')
+    return regression
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if main(args.baseline_path, args.results_path, args.threshold):
+        sys.exit(1)
@@ -0,0 +1,74 @@
+"""
+Generate synthetic climate data file in the format of climate scripts (Station;Element;Jan;...;Dec).
+Data is deterministic - the same number of stations and seed give the same file on every machine.
+Temperature follows seasonal curve (annual mean, amplitude, northern or southern hemisphere),
+precipitation is drawn from gamma distribution.
+
+Usage:
+    python benchmarks/generate_climate_data.py [--seed SEED] [--unit {C_mm,F_inch}] num_stations output_path
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+INCH_MM = 25.4
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(description='Generate synthetic climate data file')
+    parser.add_argument('num_stations', type=int, help='Number of stations')
+    parser.add_argument('output_path', type=str, help='Path to output data file')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of random generator, default 0')
+    parser.add_argument('--unit', type=str, default='C_mm', choices=['C_mm', 'F_inch'],
+                        help='Unit of data, C_mm (default) - Celsius degrees, mm, F_inch - Fahrenheit degrees, inches')
+    return parser.parse_args()
+
+
+def generate_climate_data(num_stations: int, seed: int = 0, unit: str = 'C_mm') -> pd.DataFrame:
+    """Return synthetic climate data, rows of station are next to each other (temperature, precipitation).
+
+    :param num_stations: number of stations
+    :param seed: seed of random generator
+    :param unit: C_mm - Celsius degrees, millimetres, F_inch - Fahrenheit degrees, inches
+    :return: data frame indexed by station and element
+    """
+    rng = np.random.default_rng(seed)
+    annual_mean = rng.uniform(-30, 30, (num_stations, 1))
+    amplitude = rng.uniform(0, 20, (num_stations, 1))
+    hemisphere = rng.choice([1, -1], (num_stations, 1))
+    season = -np.cos(2 * np.pi * (np.arange(12) - 0.5) / 12)  # -1 in January, 1 in July
+    temp = annual_mean + hemisphere * amplitude * season + rng.normal(0, 0.5, (num_stations, 12))
+    precip = rng.gamma(2, rng.uniform(1, 100, (num_stations, 1)), (num_stations, 12))
+
+    if unit == 'C_mm':
+        temp, precip = np.round(temp, 1), np.round(precip, 1)
+    else:
+        temp, precip = np.round(temp * 9 / 5 + 32, 1), np.round(precip / INCH_MM, 2)
+
+    values = np.empty((2 * num_stations, 12))
+    values[0::2] = temp
+    values[1::2] = precip
+    index = pd.MultiIndex.from_arrays([
+        np.repeat([f'Station{i:07d}' for i in range(num_stations)], 2),
+        np.tile(['Temp', 'Precipitation'], num_stations)
+    ], names=['Station', 'Element'])
+    return pd.DataFrame(values, index=index, columns=MONTHS)
+
+
+def write_climate_data(output_path: str, num_stations: int, seed: int = 0, unit: str = 'C_mm') -> None:
+    """Write synthetic climate data file.
+
+    :param output_path: path to output data file
+    :param num_stations: number of stations
+    :param seed: seed of random generator
+    :param unit: C_mm - Celsius degrees, millimetres, F_inch - Fahrenheit degrees, inches
+    """
+    generate_climate_data(num_stations, seed, unit).to_csv(output_path, sep=';')
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    write_climate_data(args.output_path, args.num_stations, args.seed, args.unit)
@@ -0,0 +1,137 @@
+"""
+Generate synthetic text corpus for Morse code scripts, or Morse code corpus (encoded text corpus).
+Text is deterministic - the same seed gives the same file on every machine, and corpus of smaller size
+is the beginning of larger one. Words are drawn from random vocabulary (letters, digits, punctuation
+supported by morse_encoder) with Zipf distribution, about 12 words per line.
+
+Usage:
+    python benchmarks/generate_morse_corpus.py [--seed SEED] [--morse] size output_path
+"""
+from pathlib import Path
+from typing import Iterator
+import argparse
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from morse_encoder import get_translation_table  # pylint: disable=wrong-import-position
+
+UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+VOCABULARY_SIZE = 10_000
+WORDS_PER_CHUNK = 1 << 18
+WORDS_PER_LINE = 12
+
+
+def parse_size(size: str) -> int:
+    """Return size in bytes.
+
+    :param size: number with optional unit K, M or G (binary, e.g. 1K = 1024), e.g. 100M
+    :return: size in bytes
+    """
+    size = size.strip().upper().removesuffix('B')
+    unit = size[-1] if size and size[-1] in UNITS else ''
+    return int(float(size.removesuffix(unit)) * UNITS[unit])
+
+
+def format_size(size: int) -> str:
+    """Return size with the largest unit it is multiple of, e.g. 1048576 -> 1M.
+
+    :param size: size in bytes
+    :return: size as in parse_size
+    """
+    for unit in ('G', 'M', 'K'):
+        if size % UNITS[unit] == 0:
+            return f'{size // UNITS[unit]}{unit}'
+    return str(size)
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(description='Generate synthetic text (or Morse code) corpus')
+    parser.add_argument('size', type=parse_size, help='Size of corpus, e.g. 1K, 100M, 1G')
+    parser.add_argument('output_path', type=str, help='Path to output file')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of random generator, default 0')
+    parser.add_argument('--morse', action='store_true', help='Generate Morse code of text corpus')
+    return parser.parse_args()
+
+
+def get_vocabulary(rng: np.random.Generator) -> np.ndarray:
+    """Return random words, mostly letters, some digits and punctuation at the end of words.
+
+    :param rng: random generator
+    :return: object array of words
+    """
+    letters = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
+    digits = np.array(list('0123456789'))
+    punctuation = np.array(['', '', '', '', '', '', '.', ',', '?', ':', '-'])
+    lengths = rng.integers(1, 12, VOCABULARY_SIZE)
+    words = []
+    for length, numeric, end in zip(lengths, rng.random(VOCABULARY_SIZE) < 0.05,
+                                    rng.choice(punctuation, VOCABULARY_SIZE)):
+        chars = rng.choice(digits if numeric else letters, length)
+        words.append(''.join(chars) + end)
+    return np.array(words, dtype=object)
+
+
+def generate_text(seed: int = 0) -> Iterator[str]:
+    """Yield chunks of endless text, words separated by spaces and line breaks.
+
+    :param seed: seed of random generator
+    :return: chunks of text
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = get_vocabulary(rng)
+    separators = np.where(np.arange(WORDS_PER_CHUNK) % WORDS_PER_LINE == WORDS_PER_LINE - 1, '\n', ' ')
+    tokens = np.empty(2 * WORDS_PER_CHUNK, dtype=object)
+    tokens[1::2] = separators
+    while True:
+        tokens[::2] = vocabulary[np.minimum(rng.zipf(1.2, WORDS_PER_CHUNK), VOCABULARY_SIZE) - 1]
+        yield ''.join(tokens.tolist())
+
+
+def write_text_corpus(path: str, size: int, seed: int = 0) -> None:
+    """Save text corpus.
+
+    :param path: path to output file
+    :param size: size of corpus (bytes, text is ASCII)
+    :param seed: seed of random generator
+    """
+    with open(path, 'w', encoding='ascii', newline='\n') as f:
+        written = 0
+        for chunk in generate_text(seed):
+            chunk = chunk[:size - written]
+            f.write(chunk)
+            written += len(chunk)
+            if written == size:
+                break
+
+
+def write_morse_corpus(path: str, size: int, seed: int = 0) -> None:
+    """Save Morse code of text corpus, cut after the last complete symbol within size.
+
+    :param path: path to output file
+    :param size: max size of corpus (bytes)
+    :param seed: seed of random generator
+    """
+    table = get_translation_table()
+    with open(path, 'w', encoding='ascii', newline='\n') as f:
+        written = 0
+        for chunk in generate_text(seed):
+            code = chunk.translate(table)
+            code = code[1:] if not written else code  # space before the first symbol
+            if written + len(code) >= size:
+                code = code[:code.rfind(' ', 0, size - written + 1)]
+                f.write(code)
+                break
+            f.write(code)
+            written += len(code)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.morse:
+        write_morse_corpus(args.output_path, args.size, args.seed)
+    else:
+        write_text_corpus(args.output_path, args.size, args.seed)
@@ -0,0 +1,254 @@
+"""
+Climate atlas - diagrams of all stations in a few files instead of a file per station:
+    - multi-page PDF file, a diagram per page (matplotlib backend), pages are written one by one
+    - contact sheets - raster images (PNG, JPEG, WebP) with grid of diagrams, sheet is saved when it is full
+Index file (CSV, separator semicolon) maps station to file and page of atlas and position on contact sheet:
+Station;File;Page;Row;Column
+Warsaw;atlas_001.png;1;1;1
+"""
+from pathlib import Path
+from typing import (
+    Iterable,
+    Iterator,
+    NamedTuple
+)
+import csv
+
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+from PIL import Image
+
+from climate_diagram_image import (
+    get_raster_formats,
+    save_image
+)
+from climate_statistics import StationStatistics
+
+
+class AtlasEntry(NamedTuple):
+    """Keep location of station diagram in atlas"""
+    station: str
+    file: str
+    page: int
+    row: int = 1
+    column: int = 1
+
+
+class AtlasResult(NamedTuple):
+    """Keep result of adding station diagram to atlas"""
+    station: str
+    entry: AtlasEntry | None = None
+    error: str | None = None
+
+
+def get_atlas_formats() -> tuple[str, ...]:
+    """Return file formats of atlas: pdf and raster formats of contact sheets.
+
+    :return: file formats (file extensions)
+    """
+    return ('pdf', *get_raster_formats())
+
+
+def get_index_path(atlas_path: str | Path) -> Path:
+    """Return path of index file of atlas.
+
+    :param atlas_path: path of atlas (PDF file or contact sheets name pattern)
+    :return: path of index file
+    """
+    return Path(atlas_path).with_suffix('.index.csv')
+
+
+class PdfAtlas:
+    """Diagrams of stations written page by page into PDF file, template figure is reused for every page"""
+
+    def __init__(self, atlas_path: str | Path, template) -> None:
+        """
+        :param atlas_path: path of PDF file
+        :param template: DiagramTemplate - matplotlib diagram template
+        """
+        if not hasattr(template, 'figure'):
+            raise ValueError('PDF atlas requires matplotlib backend')
+        self.path = Path(atlas_path)
+        self.template = template
+        self.pdf = PdfPages(self.path)
+        self.page = 0
+
+    def __enter__(self) -> 'PdfAtlas':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add(
+            self,
+            station: str,
+            station_data: pd.DataFrame,
+            statistics: StationStatistics | None = None
+    ) -> AtlasEntry:
+        """Add page with diagram of station.
+
+        :param station: station name
+        :param station_data: data (temperature, precipitation) for single station
+        :param statistics: precomputed statistics of station, None - computed from station data
+        :return: location of diagram in atlas
+        """
+        self.template.update(station_data, statistics)
+        self.pdf.savefig(self.template.figure, bbox_inches='tight')
+        self.page += 1
+        return AtlasEntry(station, self.path.name, self.page)
+
+    def close(self) -> None:
+        """Finish PDF file."""
+        self.pdf.close()
+
+
+class ContactSheetAtlas:
+    """Diagrams of stations tiled into grid of contact sheet images, a sheet is kept in memory until it is full"""
+
+    def __init__(self, atlas_path: str | Path, template, columns: int = 4, rows: int = 4) -> None:
+        """
+        :param atlas_path: path of atlas, sheets are saved as <name>_001.<format>, <name>_002.<format> etc.
+        :param template: DiagramTemplate or SvgDiagramTemplate - diagram template, resolution of tiles as in settings
+        :param columns: number of columns of sheet grid
+        :param rows: number of rows of sheet grid
+        """
+        self.path = Path(atlas_path)
+        self.file_format = self.path.suffix[1:].lower()
+        if self.file_format not in get_raster_formats():
+            raise ValueError(f'Not supported format of contact sheet: {self.file_format}')
+        self.template = template
+        self.columns = columns
+        self.rows = rows
+        self.sheet: Image.Image | None = None
+        self.tile_size: tuple[int, int] | None = None
+        self.page = 0
+        self.tiles = 0  # number of tiles on the current sheet
+
+    def __enter__(self) -> 'ContactSheetAtlas':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def sheet_path(self, page: int) -> Path:
+        """Return path of contact sheet.
+
+        :param page: page (sheet) number, starting from 1
+        :return: path of sheet image
+        """
+        return self.path.with_name(f'{self.path.stem}_{page:03d}{self.path.suffix}')
+
+    def add(
+            self,
+            station: str,
+            station_data: pd.DataFrame,
+            statistics: StationStatistics | None = None
+    ) -> AtlasEntry:
+        """Add tile with diagram of station, save sheet if it is full.
+        Size of tile is the size of the first diagram, other diagrams are centered in tiles.
+
+        :param station: station name
+        :param station_data: data (temperature, precipitation) for single station
+        :param statistics: precomputed statistics of station, None - computed from station data
+        :return: location of diagram in atlas
+        """
+        image = self.template.render_image(station_data, statistics)
+        if self.tile_size is None:
+            self.tile_size = image.size
+        if self.sheet is None:
+            width, height = self.tile_size
+            self.sheet = Image.new('RGB', (width * self.columns, height * self.rows), 'white')
+            self.page += 1
+
+        width, height = self.tile_size
+        row, column = divmod(self.tiles, self.columns)
+        self.sheet.paste(image.convert('RGB'), (column * width + (width - image.width) // 2,
+                                                row * height + (height - image.height) // 2))
+        self.tiles += 1
+        if self.tiles == self.columns * self.rows:
+            self.save_sheet()
+        return AtlasEntry(station, self.sheet_path(self.page).name, self.page, row + 1, column + 1)
+
+    def save_sheet(self) -> None:
+        """Save the current sheet and start the next one."""
+        save_image(self.sheet, str(self.sheet_path(self.page)), self.file_format, self.template.settings.dpi)
+        self.sheet = None
+        self.tiles = 0
+
+    def close(self) -> None:
+        """Save the last, not full sheet."""
+        if self.sheet is not None:
+            self.save_sheet()
+
+
+def add_stations(
+        atlas: PdfAtlas | ContactSheetAtlas,
+        stations: Iterable[tuple[str, pd.DataFrame]],
+        statistics: dict[str, StationStatistics] | None = None
+) -> Iterator[AtlasResult]:
+    """Add diagrams of stations to atlas, report error of station instead of raising it.
+
+    :param atlas: atlas
+    :param stations: tuples (station name, station data)
+    :param statistics: precomputed statistics of stations, key - station name, None - computed from station data
+    :return: results of adding diagrams
+    """
+    for station, station_data in stations:
+        try:
+            yield AtlasResult(station, atlas.add(station, station_data,
+                                                 statistics.get(station) if statistics else None))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            yield AtlasResult(station, error=f'{type(e).__name__}: {e}')
+
+
+def create_atlas(
+        stations: Iterable[tuple[str, pd.DataFrame]],
+        template,
+        atlas_path: str | Path,
+        grid: tuple[int, int] = (4, 4),
+        num_stations: int | None = None,
+        statistics: dict[str, StationStatistics] | None = None
+) -> list[AtlasEntry]:
+    """Create atlas of station diagrams and its index file, print progress.
+
+    :param stations: tuples (station name, station data)
+    :param template: diagram template, DiagramTemplate for PDF atlas
+    :param atlas_path: path of atlas, PDF file or name of contact sheets, e.g. atlas.png
+    :param grid: number of columns, rows of contact sheets
+    :param num_stations: number of stations if known, used to print progress
+    :param statistics: precomputed statistics of stations, key - station name, None - computed from station data
+    :return: locations of station diagrams in atlas
+    """
+    if Path(atlas_path).suffix.lower() == '.pdf':
+        atlas = PdfAtlas(atlas_path, template)
+    else:
+        atlas = ContactSheetAtlas(atlas_path, template, *grid)
+
+    entries = []
+    failed = 0
+    with atlas:
+        for i, result in enumerate(add_stations(atlas, stations, statistics), start=1):
+            position = f'{i}/{num_stations}' if num_stations else f'{i}'
+            if result.error:
+                failed += 1
+                print(f'Failed to add diagram of {result.station} to atlas [{position}]: {result.error}')
+            else:
+                entries.append(result.entry)
+                print(f'Diagram of {result.station} added to {result.entry.file} [{position}]')
+
+    index_path = get_index_path(atlas_path)
+    write_index(index_path, entries)
+    print(f'{len(entries)} diagram(s) added to atlas, {failed} failed, index saved to {index_path}')
+    return entries
+
+
+def write_index(index_path: str | Path, entries: list[AtlasEntry]) -> None:
+    """Write index file of atlas.
+
+    :param index_path: path of index file
+    :param entries: locations of station diagrams in atlas
+    """
+    with open(index_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['Station', 'File', 'Page', 'Row', 'Column'])
+        writer.writerows(entries)
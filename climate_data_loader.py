@@ -0,0 +1,128 @@
+"""
+Load climate data CSV file (Station;Element;Jan;...;Dec) into data frame indexed by station and element.
+On the first load, binary snapshot of parsed data is saved next to the data file (directory <file>.<dtype>.snapshot):
+    - values.npy - monthly values
+    - stations.npy, elements.npy - codes of station and element of every row
+    - meta.json - station and element names, column names, modification time and size of the data file
+Next loads memory-map snapshot instead of parsing CSV file.
+Snapshot is rebuilt if the data file has been modified since the snapshot was saved (modification time or size).
+"""
+from pathlib import Path
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+INDEX_COLUMNS = ['Station', 'Element']
+
+
+def get_snapshot_dir(data_path: str | Path, dtype: np.dtype) -> Path:
+    """Return path of snapshot directory of the data file.
+
+    :param data_path: path to data file
+    :param dtype: type of values kept in snapshot
+    :return: path of snapshot directory
+    """
+    return Path(f'{data_path}.{np.dtype(dtype).name}.snapshot')
+
+
+def get_source_stamp(data_path: str | Path) -> dict:
+    """Return modification time and size of data file.
+
+    :param data_path: path to data file
+    :return: dictionary with modification time (ns) and size (bytes)
+    """
+    stat = os.stat(data_path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def read_snapshot(data_path: str | Path, dtype: np.dtype) -> pd.DataFrame | None:
+    """Return data frame with memory-mapped values of the snapshot, None if there is no up to date snapshot.
+
+    :param data_path: path to data file
+    :param dtype: type of values
+    :return: data frame indexed by station and element or None
+    """
+    snapshot_dir = get_snapshot_dir(data_path, dtype)
+    try:
+        meta = json.loads((snapshot_dir / 'meta.json').read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if meta.get('source') != get_source_stamp(data_path):
+        return None
+
+    try:
+        values = np.load(snapshot_dir / 'values.npy', mmap_mode='r')
+        index = pd.MultiIndex(
+            levels=[meta['stations'], meta['elements']],
+            codes=[np.load(snapshot_dir / 'stations.npy'), np.load(snapshot_dir / 'elements.npy')],
+            names=INDEX_COLUMNS
+        )
+        return pd.DataFrame(values, index=index, columns=meta['columns'], copy=False)
+    except (OSError, ValueError, KeyError):  # missing or damaged snapshot files, data file is parsed instead
+        return None
+
+
+def write_snapshot(data_path: str | Path, df: pd.DataFrame, dtype: np.dtype) -> None:
+    """Save snapshot of parsed data file. Metadata is written last - snapshot without it is not used.
+    ValueError is raised, before snapshot directory is changed, if values cannot be converted to dtype.
+
+    :param data_path: path to data file
+    :param df: parsed data
+    :param dtype: type of values
+    """
+    values = df.to_numpy(dtype=dtype)
+    snapshot_dir = get_snapshot_dir(data_path, dtype)
+    snapshot_dir.mkdir(exist_ok=True)
+    (snapshot_dir / 'meta.json').unlink(missing_ok=True)
+
+    np.save(snapshot_dir / 'values.npy', values)
+    np.save(snapshot_dir / 'stations.npy', df.index.codes[0])
+    np.save(snapshot_dir / 'elements.npy', df.index.codes[1])
+    meta = {
+        'source': get_source_stamp(data_path),
+        'columns': df.columns.tolist(),
+        'stations': df.index.levels[0].tolist(),
+        'elements': df.index.levels[1].tolist()
+    }
+    (snapshot_dir / 'meta.json').write_text(json.dumps(meta), encoding='utf-8')
+
+
+def read_climate_csv(data_path: str | Path) -> pd.DataFrame:
+    """Return climate data parsed from CSV file, type of values inferred by pandas.
+
+    :param data_path: path to data file
+    :return: data frame indexed by station and element
+    """
+    return pd.read_csv(data_path, sep=';', index_col=INDEX_COLUMNS)
+
+
+def load_climate_data(
+        data_path: str | Path,
+        dtype: np.dtype = np.float32,
+        use_snapshot: bool = True
+) -> pd.DataFrame:
+    """Return climate data indexed by station and element.
+
+    :param data_path: path to data file
+    :param dtype: type of values, use float64 if values have to be exactly as in data file
+    :param use_snapshot: load data from snapshot (create it if it does not exist or is stale)
+    :return: data frame indexed by station and element
+    """
+    if use_snapshot:
+        df = read_snapshot(data_path, dtype)
+        if df is not None:
+            return df
+
+    df = read_climate_csv(data_path)
+    if use_snapshot:
+        try:
+            write_snapshot(data_path, df, dtype)
+        except OSError as e:
+            print(f'Snapshot of {data_path} not saved: {e}')
+        else:
+            snapshot = read_snapshot(data_path, dtype)
+            if snapshot is not None:
+                return snapshot
+    return df.astype(dtype)
@@ -0,0 +1,166 @@
+"""
+Read climate data CSV file in chunks, memory used is bounded by the chunk size instead of the file size
+if rows of every station are next to each other (or close, within a few chunks) - as files written
+by climate scripts. In a file ordered by element (all temperature rows first) stations wait for their
+second row in memory, so memory grows with the number of stations.
+Input data format is the same as for climate_diagram_generator and climate_data_unit_converter:
+Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
+Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73
+"""
+from typing import (
+    Callable,
+    Collection,
+    Iterable,
+    Iterator
+)
+import sys
+
+import numpy as np
+import pandas as pd
+
+ELEMENTS = ('Temp', 'Precipitation')
+
+
+def read_chunks(
+        data_path: str,
+        chunk_size: int,
+        dtype: np.dtype | None = None,
+        exclude: Collection[str] = ()
+) -> Iterator[pd.DataFrame]:
+    """Yield consecutive parts of data file.
+
+    :param data_path: path to data file
+    :param chunk_size: max number of rows in single chunk
+    :param dtype: type of values, if not set - type inferred by pandas
+    :param exclude: stations which rows are skipped (e.g. invalid ones)
+    :return: data frames with at most chunk_size rows, indexed by station and element
+    """
+    with pd.read_csv(data_path, sep=';', index_col=['Station', 'Element'], chunksize=chunk_size) as reader:
+        for chunk in reader:
+            if exclude:
+                chunk = chunk[~chunk.index.get_level_values('Station').isin(exclude)]
+            yield chunk if dtype is None else chunk.astype(dtype)
+
+
+def get_extremes(
+        data_path: str,
+        chunk_size: int,
+        dtype: np.dtype | None = None,
+        exclude: Collection[str] = ()
+) -> tuple[float, float, float]:
+    """Return minimum, maximum monthly temperature and maximum monthly precipitation for the whole data file.
+    Extremes are updated chunk by chunk, only one chunk is kept in memory.
+
+    :param data_path: path to data file
+    :param chunk_size: max number of rows read at once
+    :param dtype: type of values, if not set - type inferred by pandas
+    :param exclude: stations which are skipped
+    :return: min temperature, max temperature, max precipitation
+    """
+    tmin, tmax, pmax = np.inf, -np.inf, -np.inf
+    for chunk in read_chunks(data_path, chunk_size, dtype, exclude):
+        elements = chunk.index.get_level_values('Element')
+        temp_arr = chunk[elements == 'Temp'].to_numpy()
+        precip_arr = chunk[elements == 'Precipitation'].to_numpy()
+        if temp_arr.size:
+            tmin = min(tmin, temp_arr.min())
+            tmax = max(tmax, temp_arr.max())
+        if precip_arr.size:
+            pmax = max(pmax, precip_arr.max())
+    return tmin, tmax, pmax
+
+
+def update_extremes(extremes: dict[str, float], station_values: pd.Series, func: Callable) -> None:
+    """Update extremes of stations with extremes of added rows.
+
+    :param extremes: station: extreme value so far, updated in place
+    :param station_values: extreme value of added rows of every station, NaN if there is no numeric value
+    :param func: min or max
+    """
+    for station, value in station_values.dropna().items():
+        extremes[station] = func(extremes[station], value) if station in extremes else value
+
+
+class StationExtremes:
+    """Track extremes of every station while chunks are read, e.g. in the validation pass over data file.
+    Invalid stations are known only when the whole file is read, so extremes are kept per station
+    (three values per station, like element presence kept by validation) and combined for valid stations at the end.
+    Non-numeric values are ignored - stations with such values are invalid."""
+
+    def __init__(self) -> None:
+        self.tmin: dict[str, float] = {}
+        self.tmax: dict[str, float] = {}
+        self.pmax: dict[str, float] = {}
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        """Add rows.
+
+        :param chunk: data frame indexed by station and element, values as parsed from data file
+        """
+        values = chunk.apply(pd.to_numeric, errors='coerce')
+        elements = values.index.get_level_values('Element')
+        temp = values[elements == 'Temp'].droplevel('Element')
+        precip = values[elements == 'Precipitation'].droplevel('Element')
+        temp_groups = temp.groupby(level='Station', sort=False)
+        update_extremes(self.tmin, temp_groups.min().min(axis=1), min)
+        update_extremes(self.tmax, temp_groups.max().max(axis=1), max)
+        update_extremes(self.pmax, precip.groupby(level='Station', sort=False).max().max(axis=1), max)
+
+    def track(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Add chunks while they are passed on.
+
+        :param chunks: data frames indexed by station and element
+        :return: the same data frames
+        """
+        for chunk in chunks:
+            self.add(chunk)
+            yield chunk
+
+    def get(self, exclude: Collection[str] = ()) -> tuple[float, float, float]:
+        """Return minimum, maximum monthly temperature and maximum monthly precipitation, see get_extremes.
+
+        :param exclude: stations which are skipped (e.g. invalid ones)
+        :return: min temperature, max temperature, max precipitation
+        """
+        def get_extreme(extremes: dict[str, float], func: Callable, default: float) -> float:
+            return func((value for station, value in extremes.items() if station not in exclude), default=default)
+
+        return get_extreme(self.tmin, min, np.inf), get_extreme(self.tmax, max, -np.inf), \
+            get_extreme(self.pmax, max, -np.inf)
+
+
+def iter_stations(
+        data_path: str,
+        chunk_size: int,
+        dtype: np.dtype | None = None,
+        exclude: Collection[str] = ()
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """Yield data of stations one by one.
+    Rows of a station can be split between chunks - station is kept aside until both temperature
+    and precipitation are read. Stations still incomplete at the end of file are yielded as they are.
+    Only incomplete stations are kept, so rows of a station read after it was yielded (repeated station)
+    are yielded as another station - validate data first (see climate_validation.validate_chunks, it reports
+    duplicated rows) and exclude invalid stations. Duplicated rows of a not yet yielded station are skipped and reported.
+
+    :param data_path: path to data file
+    :param chunk_size: max number of rows read at once
+    :param dtype: type of values, if not set - type inferred by pandas
+    :param exclude: stations which are skipped
+    :return: tuples (station name, data of single station indexed by element)
+    """
+    incomplete: dict[str, pd.DataFrame] = {}
+    for chunk in read_chunks(data_path, chunk_size, dtype, exclude):
+        for station, station_data in chunk.groupby(level='Station', sort=False):
+            station_data = station_data.droplevel('Station')
+            if station in incomplete:
+                station_data = pd.concat([incomplete.pop(station), station_data])
+            duplicated = station_data.index.duplicated()
+            if duplicated.any():
+                print(f'Repeated rows of station {station} skipped', file=sys.stderr)
+                station_data = station_data[~duplicated]
+            if all(element in station_data.index for element in ELEMENTS):
+                yield station, station_data
+            else:
+                incomplete[station] = station_data
+    yield from incomplete.items()
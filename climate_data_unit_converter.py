@@ -12,13 +12,92 @@ Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
 Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73
 
 Output file - Fahrenheit degrees, inches
+
+Input can be also a directory (all *.csv files in it are converted) or a glob pattern, then output is
+a directory and files are converted in a process pool.
+
+Large files can be converted in chunks (--chunk-size): every chunk is converted, sorted and saved into temporary
+spill file, then spill files are merged into output file - memory used depends on the chunk size, not on file size.
+
+Input data is validated before conversion (see climate_validation), file with invalid stations is not converted
+unless --skip-invalid is set - then invalid stations are left out of output file.
 """
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import (
+    ExitStack,
+    contextmanager
+)
+from glob import glob, has_magic
+from tempfile import TemporaryDirectory
+from typing import (
+    Callable,
+    Iterator,
+    NamedTuple
+)
 import argparse
-from typing import Callable
+import csv
+import heapq
+import json
+import os
+import sys
 
+import numpy as np
 import pandas as pd
 
+from climate_data_loader import get_source_stamp
+from climate_data_stream import read_chunks
+from climate_dataset import ClimateDataset
+from climate_profiler import (
+    NULL_PROFILER,
+    NullProfiler,
+    Profiler,
+    Stopwatch,
+    Timing
+)
+from climate_validation import (
+    InvalidDataError,
+    check_report,
+    get_valid_data,
+    load_unchecked_data,
+    validate_chunks
+)
+
 INCH_MM = 25.4
+BLOCK_SIZE = 65536  # number of values converted at once, block fits in CPU cache
+MERGE_FAN_IN = 64  # max number of spill files merged at once, keeps number of open files low
+MANIFEST_NAME = ".climate_conversions.json"  # conversions of files of batch, kept in output directory
+
+
+class UnitConversion(NamedTuple):
+    """Keep linear conversion: round((value + offset_before) * multiplier / divisor + offset_after, decimals).
+    Steps with neutral parameters (offset 0, multiplier/divisor 1) are skipped,
+    so result is exactly the same as of the scalar conversion functions."""
+    offset_before: float
+    multiplier: float
+    divisor: float
+    offset_after: float
+    decimals: int
+
+
+class FileResult(NamedTuple):
+    """Keep result of converting single file of batch"""
+    input_path: str
+    output_path: str
+    status: str  # converted, skipped (output is up to date), failed
+    error: str | None = None
+    timing: Timing | None = None  # set only if file is profiled
+
+
+C_TO_F = UnitConversion(offset_before=0, multiplier=9, divisor=5, offset_after=32, decimals=1)
+F_TO_C = UnitConversion(offset_before=-32, multiplier=5, divisor=9, offset_after=0, decimals=1)
+MM_TO_INCH = UnitConversion(offset_before=0, multiplier=1, divisor=INCH_MM, offset_after=0, decimals=2)
+INCH_TO_MM = UnitConversion(offset_before=0, multiplier=INCH_MM, divisor=1, offset_after=0, decimals=1)
+ELEMENT_CONVERSIONS = {
+    "C_mm": {"Temp": F_TO_C, "Precipitation": INCH_TO_MM},
+    "F_inch": {"Temp": C_TO_F, "Precipitation": MM_TO_INCH}
+}
+SOURCE_UNITS = {"C_mm": "F_inch", "F_inch": "C_mm"}  # target unit: unit of input data
 
 
 def parse_args() -> argparse.Namespace:
@@ -27,10 +106,27 @@ def parse_args() -> argparse.Namespace:
         description="""Convert climate data Celsius degrees, mm to Fahrenheit degrees, inches,
                         and Fahrenheit degrees, inches to Celsius degrees, mm"""
     )
-    parser.add_argument("-i", "--input", type=str, required=True, help="Path to input data file")
-    parser.add_argument("-o", "--output", type=str, required=True, help="Path to output data")
+    parser.add_argument("-i", "--input", type=str, required=True,
+                        help="Path to input data file, directory or glob pattern (quoted) of input data files")
+    parser.add_argument("-o", "--output", type=str, required=True,
+                        help="Path to output data, output directory if input is directory or glob pattern")
     parser.add_argument("-t", "--target-unit", type=str, required=True, choices=["C_mm", "F_inch"],
                         help="Target unit, C_mm for Celsius, millimeters, F_inch - Fahrenheit, inches")
+    parser.add_argument("-c", "--chunk-size", type=int,
+                        help="Convert input file in chunks of CHUNK_SIZE rows, for files larger than memory")
+    parser.add_argument("--skip-invalid", action="store_true",
+                        help="Skip invalid stations (missing element, duplicated row, invalid value) instead of "
+                             "not converting file with them")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="Parse input file, do not use (and do not create) its binary snapshot")
+    parser.add_argument("-w", "--workers", type=int,
+                        help="Number of processes converting files if input is directory or glob pattern, "
+                             "default number of CPUs")
+    parser.add_argument("--force", action="store_true",
+                        help="Convert all files if input is directory or glob pattern, also the up to date ones")
+    parser.add_argument("--profile", type=str, metavar="REPORT_PATH",
+                        help="Save time and memory used by stages (files in batch mode) into REPORT_PATH "
+                             "(.json or .csv)")
 
     return parser.parse_args()
 
@@ -71,24 +167,117 @@ def inch_to_mm(value: float) -> float:
     return round(value * INCH_MM, 1)
 
 
-def convert_to_c_mm(t: pd.DataFrame, p: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+def convert_array(
+        values: np.ndarray,
+        conversion: UnitConversion,
+        out: np.ndarray | None = None
+) -> np.ndarray:
+    """Return array with converted values.
+    Values are converted in blocks of BLOCK_SIZE, all steps of conversion are done for the block
+    while it is in CPU cache, instead of passing the whole array for every step.
+    Rounding is the same as numpy/pandas round - the one applied by scalar conversion functions to data frame columns.
+
+    :param values: values to convert
+    :param conversion: conversion parameters
+    :param out: array to store result in, with the same shape and memory layout as values, it can be values itself
+    :return: array with converted values
+    """
+    if out is None:
+        out = np.empty_like(values, dtype=np.float64)
+    if not (out.flags.c_contiguous or out.flags.f_contiguous):
+        raise ValueError('Output array has to be contiguous')
+    order = 'C' if out.flags.c_contiguous else 'F'
+    flat_values = np.ravel(values, order=order)
+    flat_out = np.ravel(out, order=order)
+
+    for start in range(0, flat_values.size, BLOCK_SIZE):
+        src = flat_values[start:start + BLOCK_SIZE]
+        dst = flat_out[start:start + BLOCK_SIZE]
+        if conversion.offset_before:
+            src = np.add(src, conversion.offset_before, out=dst)
+        if conversion.multiplier != 1:
+            src = np.multiply(src, conversion.multiplier, out=dst)
+        if conversion.divisor != 1:
+            src = np.divide(src, conversion.divisor, out=dst)
+        if conversion.offset_after:
+            src = np.add(src, conversion.offset_after, out=dst)
+        np.round(src, conversion.decimals, out=dst)
+    return out
+
+
+def convert_dataframe(df: pd.DataFrame, conversion: UnitConversion, inplace: bool = False) -> pd.DataFrame:
+    """Return data frame with converted values.
+
+    :param df: data frame with values to convert
+    :param conversion: conversion parameters
+    :param inplace: convert values of df instead of creating new data frame
+    :return: data frame with converted values (df itself if inplace)
+    """
+    values = df.to_numpy(dtype=np.float64, copy=not inplace)
+    if not values.flags.writeable:  # with copy-on-write pandas returns read-only view of data frame values
+        values = values.copy(order='K')
+    convert_array(values, conversion, out=values)
+    if not inplace:
+        return pd.DataFrame(values, index=df.index, columns=df.columns, copy=False)
+    if not np.may_share_memory(values, df.to_numpy()):
+        df.iloc[:, :] = values
+    return df
+
+
+def convert_dataset(
+        dataset: ClimateDataset,
+        temp_conversion: UnitConversion,
+        precip_conversion: UnitConversion,
+        inplace: bool = False
+) -> ClimateDataset:
+    """Return data set with converted values.
+
+    :param dataset: data set with values to convert
+    :param temp_conversion: conversion parameters of temperature
+    :param precip_conversion: conversion parameters of precipitation
+    :param inplace: convert values in arrays of data set (in their precision) instead of creating float64 arrays
+    :return: data set with converted values
+    """
+    return dataset._replace(
+        temp=convert_array(dataset.temp, temp_conversion, out=dataset.temp if inplace else None),
+        precip=convert_array(dataset.precip, precip_conversion, out=dataset.precip if inplace else None)
+    )
+
+
+def convert_to_c_mm(
+        t: pd.DataFrame | ClimateDataset,
+        p: pd.DataFrame | None = None,
+        inplace: bool = False
+) -> tuple[pd.DataFrame, pd.DataFrame] | ClimateDataset:
     """Return tuple (temperature, precipitation) dataframes with values in Celsius degrees and millimeters.
+    If t is data set (with both elements), converted data set is returned.
 
-    :param t: data frame with temperature from input data
-    :param p: data frame with precipitation from input data
-    :return: tuple (data frame temperature, data frame precipitation) with converted values
+    :param t: data frame with temperature from input data or data set
+    :param p: data frame with precipitation from input data, None if t is data set
+    :param inplace: convert values of input data frames instead of creating new ones
+    :return: tuple (data frame temperature, data frame precipitation) with converted values or converted data set
     """
-    return t.apply(fahrenheit_to_celsius), p.apply(inch_to_mm)
+    if isinstance(t, ClimateDataset):
+        return convert_dataset(t, F_TO_C, INCH_TO_MM, inplace)
+    return convert_dataframe(t, F_TO_C, inplace), convert_dataframe(p, INCH_TO_MM, inplace)
 
 
-def convert_to_f_inch(t: pd.DataFrame, p: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+def convert_to_f_inch(
+        t: pd.DataFrame | ClimateDataset,
+        p: pd.DataFrame | None = None,
+        inplace: bool = False
+) -> tuple[pd.DataFrame, pd.DataFrame] | ClimateDataset:
     """Return tuple (temperature, precipitation) dataframes with values in Fahrenheit degrees and inches.
+    If t is data set (with both elements), converted data set is returned.
 
-    :param t: data frame with temperature from input
-    :param p: data frame with precipitation from input
-    :return: tuple (data frame temperature, data frame precipitation) with converted values
+    :param t: data frame with temperature from input or data set
+    :param p: data frame with precipitation from input, None if t is data set
+    :param inplace: convert values of input data frames instead of creating new ones
+    :return: tuple (data frame temperature, data frame precipitation) with converted values or converted data set
     """
-    return t.apply(celsius_to_fahrenheit), p.apply(mm_to_inch)
+    if isinstance(t, ClimateDataset):
+        return convert_dataset(t, C_TO_F, MM_TO_INCH, inplace)
+    return convert_dataframe(t, C_TO_F, inplace), convert_dataframe(p, MM_TO_INCH, inplace)
 
 
 def get_conversion_function(target_unit: str) -> Callable:
@@ -104,30 +293,388 @@ def get_conversion_function(target_unit: str) -> Callable:
         case _: raise ValueError(f"Not supported target unit: {target_unit}")
 
 
-def main(
+def convert_chunk(chunk: pd.DataFrame, target_unit: str) -> pd.DataFrame:
+    """Return data frame with converted values, conversion of row is chosen by its element.
+    Rows of elements other than temperature and precipitation are skipped.
+
+    :param chunk: data frame with temperature and precipitation rows
+    :param target_unit: unit to which data will be converted
+    :return: data frame with converted values
+    """
+    conversions = ELEMENT_CONVERSIONS[target_unit]
+    chunk = chunk[chunk.index.get_level_values("Element").isin(conversions)]
+    elements = chunk.index.get_level_values("Element")
+    values = chunk.to_numpy(dtype=np.float64, copy=True)
+    for element, conversion in conversions.items():
+        rows = elements == element
+        values[rows] = convert_array(values[rows], conversion)
+    return pd.DataFrame(values, index=chunk.index, columns=chunk.columns, copy=False)
+
+
+def merge_sorted_files(paths: list[str], output_path: str, header: list[str] | None = None) -> None:
+    """Merge sorted CSV files into output file in single pass, sort order - station, element.
+
+    :param paths: paths to sorted CSV files without header
+    :param output_path: path to the output data file
+    :param header: header of output file, None - output file without header
+    """
+    with ExitStack() as stack:
+        readers = [csv.reader(stack.enter_context(open(path, newline="", encoding="utf-8"))) for path in paths]
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            if header is not None:
+                writer.writerow(header)
+            writer.writerows(heapq.merge(*readers, key=lambda row: (row[0], row[1])))
+
+
+def merge_spill_files(spill_paths: list[str], output_path: str, header: list[str], fan_in: int = MERGE_FAN_IN) -> None:
+    """Merge sorted CSV files into output file, sort order - station, element.
+    At most fan_in files are open at once: if there are more spill files, they are merged in passes
+    into intermediate files next to spill files (removed once merged, spill files are kept).
+
+    :param spill_paths: paths to sorted CSV files without header
+    :param output_path: path to the output data file
+    :param header: header of output file
+    :param fan_in: max number of files merged at once
+    """
+    if fan_in < 2:
+        raise ValueError(f"Fan-in of merge has to be at least 2, got {fan_in}")
+    paths = list(spill_paths)
+    merge_pass = 0
+    while len(paths) > fan_in:
+        merged_paths = []
+        for i in range(0, len(paths), fan_in):
+            group = paths[i:i + fan_in]
+            merged_paths.append(os.path.join(os.path.dirname(group[0]), f"merged-{merge_pass}-{i // fan_in}.csv"))
+            merge_sorted_files(group, merged_paths[-1])
+            if merge_pass:
+                for path in group:
+                    os.remove(path)
+        paths = merged_paths
+        merge_pass += 1
+    merge_sorted_files(paths, output_path, header)
+    if merge_pass:
+        for path in paths:
+            os.remove(path)
+
+
+@contextmanager
+def atomic_output(output_path: str) -> Iterator[str]:
+    """Return path of temporary file, replace output file with it if block succeeds, remove it otherwise.
+    Partially written output file is never left at output path.
+
+    :param output_path: path to the output data file
+    :return: path of temporary file next to output file
+    """
+    tmp_path = os.path.join(os.path.dirname(os.path.abspath(output_path)), f".{os.path.basename(output_path)}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def convert_stream(
         input_path: str,
         output_path: str,
-        target_unit: str
+        target_unit: str,
+        chunk_size: int,
+        profiler: Profiler | NullProfiler = NULL_PROFILER,
+        skip_invalid: bool = False
+) -> None:
+    """Convert climate data to target units chunk by chunk, output is sorted as in main.
+    Input file is validated in the first pass over it.
+
+    :param input_path: path to the input data file
+    :param output_path: path to the output data file
+    :param target_unit: unit to which input data will be converted
+    :param chunk_size: max number of rows kept in memory
+    :param profiler: profiler collecting timing of stages
+    :param skip_invalid: skip invalid stations, by default InvalidDataError is raised before conversion
+    """
+    with profiler.stage("validate"):
+        report = validate_chunks(read_chunks(input_path, chunk_size), SOURCE_UNITS[target_unit])
+        invalid = check_report(report, skip_invalid)
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    with TemporaryDirectory(dir=output_dir, prefix=".spill-") as spill_dir:
+        spill_paths = []
+        header = None
+        with profiler.stage("convert"):  # reading chunks and writing spill files is included
+            for i, chunk in enumerate(read_chunks(input_path, chunk_size, exclude=invalid)):
+                converted = convert_chunk(chunk, target_unit).sort_index()
+                header = [*converted.index.names, *converted.columns]
+                spill_paths.append(os.path.join(spill_dir, f"{i}.csv"))
+                converted.to_csv(spill_paths[-1], header=False)
+        with profiler.stage("merge"):
+            merge_spill_files(spill_paths, output_path, header)
+
+
+def convert_file(
+        input_path: str,
+        output_path: str,
+        target_unit: str,
+        chunk_size: int | None = None,
+        use_snapshot: bool = True,
+        profiler: Profiler | NullProfiler = NULL_PROFILER,
+        skip_invalid: bool = False
 ):
-    """Convert climate data to target units.
+    """Convert climate data file to target units, output file is replaced only if conversion succeeds.
 
     :param input_path: path to the input data file
     :param output_path: path to the output data file
     :param target_unit: unit to which input data will be converted
-    :return:
+    :param chunk_size: if set, convert input data in chunks of that many rows instead of loading it at once
+    :param use_snapshot: load input data from its binary snapshot, create it if needed
+    :param profiler: profiler collecting timing of stages
+    :param skip_invalid: skip invalid stations, by default InvalidDataError is raised before conversion
+    """
+    with atomic_output(output_path) as tmp_path:
+        if chunk_size:
+            convert_stream(input_path, tmp_path, target_unit, chunk_size, profiler, skip_invalid)
+            return
+
+        with profiler.stage("load"):
+            # values are converted with double precision to keep results exactly as for values from the input file
+            src_data = load_unchecked_data(input_path, np.float64, use_snapshot)
+        with profiler.stage("validate"):
+            src_data = get_valid_data(src_data, np.float64, SOURCE_UNITS[target_unit], skip_invalid)
+        with profiler.stage("convert"):
+            output_data = convert_data(src_data, target_unit)
+        with profiler.stage("write"):
+            output_data.to_csv(tmp_path)
+
+
+def convert_data(src_data: pd.DataFrame, target_unit: str) -> pd.DataFrame:
+    """Return climate data converted to target units, sorted by station and element.
+
+    :param src_data: climate data indexed by station and element
+    :param target_unit: unit to which data will be converted
+    :return: data frame with temperature and precipitation in target units
     """
-    src_data = pd.read_csv(input_path, sep=';', index_col=['Station', 'Element'])
     src_temp = src_data[src_data.index.get_level_values('Element') == 'Temp']
     src_precip = src_data[src_data.index.get_level_values('Element') == 'Precipitation']
 
     convert_func = get_conversion_function(target_unit)
-    target_temp, target_precip = convert_func(src_temp, src_precip)
+    target_temp, target_precip = convert_func(src_temp, src_precip, inplace=True)
 
     output_data = pd.concat([target_temp, target_precip])
     output_data.sort_index(inplace=True)
-    output_data.to_csv(output_path)
+    return output_data
+
+
+def convert_batch_file(
+        input_path: str,
+        output_path: str,
+        target_unit: str,
+        chunk_size: int | None = None,
+        use_snapshot: bool = True,
+        profile: bool = False,
+        skip_invalid: bool = False
+) -> FileResult:
+    """Convert single file of batch, report error instead of raising it.
+
+    :param input_path: path to the input data file
+    :param output_path: path to the output data file
+    :param target_unit: unit to which input data will be converted
+    :param chunk_size: if set, convert input data in chunks of that many rows instead of loading it at once
+    :param use_snapshot: load input data from its binary snapshot, create it if needed
+    :param profile: measure time and memory used to convert file
+    :param skip_invalid: skip invalid stations, by default file with invalid stations fails
+    :return: result of conversion
+    """
+    try:
+        if not profile:
+            convert_file(input_path, output_path, target_unit, chunk_size, use_snapshot, skip_invalid=skip_invalid)
+            return FileResult(input_path, output_path, "converted")
+        with Stopwatch() as stopwatch:
+            convert_file(input_path, output_path, target_unit, chunk_size, use_snapshot, skip_invalid=skip_invalid)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return FileResult(input_path, output_path, "failed", f"{type(e).__name__}: {e}")
+    return FileResult(input_path, output_path, "converted", timing=stopwatch.timing)
+
+
+def load_manifest(output_dir: str) -> dict[str, dict]:
+    """Return entries of manifest of previous conversions into output directory, empty if there is no manifest.
+
+    :param output_dir: output directory
+    :return: conversion of every output file, key - output file name
+    """
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir: str, entries: dict[str, dict]) -> None:
+    """Write manifest of conversions into output directory, replace the previous one atomically.
+
+    :param output_dir: output directory
+    :param entries: conversion of every output file, key - output file name
+    """
+    with atomic_output(os.path.join(output_dir, MANIFEST_NAME)) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=1)
+
+
+def get_manifest_entry(input_path: str, output_path: str, target_unit: str, skip_invalid: bool) -> dict:
+    """Return manifest entry of conversion - input file (path, modification time, size), parameters affecting output
+    and output file (modification time, size).
+
+    :param input_path: path to the input data file
+    :param output_path: path to the existing output data file
+    :param target_unit: unit to which input data is converted
+    :param skip_invalid: invalid stations are skipped
+    :return: manifest entry
+    """
+    return {
+        "input": os.path.abspath(input_path),
+        "source": get_source_stamp(input_path),
+        "target_unit": target_unit,
+        "skip_invalid": skip_invalid,
+        "output": get_source_stamp(output_path)
+    }
+
+
+def is_batch_input(input_path: str) -> bool:
+    """Return True if input is a directory or glob pattern.
+
+    :param input_path: input path
+    :return: True if input should be converted in batch mode, False otherwise
+    """
+    return os.path.isdir(input_path) or has_magic(input_path)
+
+
+def convert_batch(
+        input_path: str,
+        output_dir: str,
+        target_unit: str,
+        chunk_size: int | None = None,
+        workers: int | None = None,
+        use_snapshot: bool = True,
+        profiler: Profiler | NullProfiler = NULL_PROFILER,
+        skip_invalid: bool = False,
+        force: bool = False
+) -> list[FileResult]:
+    """Convert all files from directory or matching glob pattern in a process pool, print result of every file.
+    File is skipped if it has been converted with the same parameters (see manifest in output directory)
+    and neither input nor output file has changed since. Input files with the same name fail - their output files
+    would overwrite each other.
+
+    :param input_path: directory (all *.csv files are converted) or glob pattern of input data files
+    :param output_dir: output directory, output files have the same names as input ones
+    :param target_unit: unit to which input data will be converted
+    :param chunk_size: if set, convert input data in chunks of that many rows instead of loading it at once
+    :param workers: number of processes, default number of CPUs
+    :param use_snapshot: load input data from binary snapshots, create them if needed
+    :param profiler: profiler collecting timing of every converted file
+    :param skip_invalid: skip invalid stations, by default files with invalid stations fail
+    :param force: convert also files with up to date output
+    :return: results of conversion of all files
+    """
+    pattern = os.path.join(input_path, "*.csv") if os.path.isdir(input_path) else input_path
+    input_paths = sorted(path for path in glob(pattern) if os.path.isfile(path))
+    output_paths = [os.path.join(output_dir, os.path.basename(path)) for path in input_paths]
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    output_counts = Counter(output_paths)
+
+    # results known before conversion (None - file is converted), output files are not written concurrently
+    known_results = []
+    for input_file, output_file in zip(input_paths, output_paths):
+        name = os.path.basename(output_file)
+        if output_counts[output_file] > 1:
+            error = f"Output file {name} would be shared with other input files of the same name"
+            known_results.append(FileResult(input_file, output_file, "failed", error))
+            manifest.pop(name, None)
+        elif (not force and name in manifest and os.path.exists(output_file)
+              and manifest[name] == get_manifest_entry(input_file, output_file, target_unit, skip_invalid)):
+            known_results.append(FileResult(input_file, output_file, "skipped"))
+        else:
+            known_results.append(None)
+    convert_paths = [paths for paths, result in zip(zip(input_paths, output_paths), known_results) if result is None]
+    convert_inputs = [input_file for input_file, _ in convert_paths]
+    convert_outputs = [output_file for _, output_file in convert_paths]
+
+    num_files = len(input_paths)
+    num_converted = len(convert_paths)
+    print(f"{num_files} file(s) found in {input_path}")
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            converted = executor.map(convert_batch_file, convert_inputs, convert_outputs,
+                                     [target_unit] * num_converted, [chunk_size] * num_converted,
+                                     [use_snapshot] * num_converted,
+                                     [profiler.enabled] * num_converted,
+                                     [skip_invalid] * num_converted)
+            for i, result in enumerate(known_results, start=1):
+                result = result or next(converted)
+                error = f": {result.error}" if result.error else ""
+                print(f"{result.input_path} {result.status} [{i}/{num_files}]{error}")
+                if result.timing:
+                    profiler.add_item(result.input_path, result.timing)
+                name = os.path.basename(result.output_path)
+                if result.status == "converted":
+                    manifest[name] = get_manifest_entry(result.input_path, result.output_path, target_unit,
+                                                        skip_invalid)
+                elif result.status == "failed":
+                    manifest.pop(name, None)
+                results.append(result)
+    finally:
+        save_manifest(output_dir, manifest)
+
+    summary = {status: sum(result.status == status for result in results)
+               for status in ("converted", "skipped", "failed")}
+    print(", ".join(f"{count} {status}" for status, count in summary.items()))
+    return results
+
+
+def main(
+        input_path: str,
+        output_path: str,
+        target_unit: str,
+        chunk_size: int | None = None,
+        workers: int | None = None,
+        use_snapshot: bool = True,
+        profile_path: str | None = None,
+        skip_invalid: bool = False,
+        force: bool = False
+) -> list[FileResult] | None:
+    """Convert climate data to target units.
+
+    :param input_path: path to the input data file, directory or glob pattern of input data files
+    :param output_path: path to the output data file, output directory if input is directory or glob pattern
+    :param target_unit: unit to which input data will be converted
+    :param chunk_size: if set, convert input data in chunks of that many rows instead of loading it at once
+    :param workers: number of processes converting files in batch mode, default number of CPUs
+    :param use_snapshot: load input data from binary snapshots, create them if needed
+    :param profile_path: if set, save time and memory used by stages (files in batch mode) into this report file
+    :param skip_invalid: skip invalid stations, by default InvalidDataError is raised (file fails in batch mode)
+    :param force: in batch mode convert also files with up to date output
+    :return: results of conversion of files in batch mode
+    """
+    profiler = Profiler("file") if profile_path else NULL_PROFILER
+    results = None
+    if is_batch_input(input_path):
+        with profiler.stage("batch"):
+            results = convert_batch(input_path, output_path, target_unit, chunk_size, workers, use_snapshot,
+                                    profiler, skip_invalid, force)
+    else:
+        convert_file(input_path, output_path, target_unit, chunk_size, use_snapshot, profiler, skip_invalid)
+
+    if profile_path:
+        profiler.save(profile_path)
+        print(f"Profile report saved to {profile_path}")
+    return results
 
 
 if __name__ == "__main__":
     args = parse_args()
-    main(args.input, args.output, args.target_unit)
+    try:
+        batch_results = main(args.input, args.output, args.target_unit, args.chunk_size, args.workers,
+                             not args.no_snapshot, args.profile, args.skip_invalid, args.force)
+    except InvalidDataError as e:
+        sys.exit(f"{e}")
+    if batch_results and any(result.status == "failed" for result in batch_results):
+        sys.exit(1)
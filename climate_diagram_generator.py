@@ -11,22 +11,83 @@ Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
 Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
 Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73
 """
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 from math import (
     ceil,
     floor
 )
-from typing import NamedTuple
+from typing import (
+    Iterable,
+    Iterator,
+    NamedTuple
+)
+import argparse
+import os
 import sys
+import threading
 
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import pandas as pd
+from PIL import Image
+
+from climate_atlas import (
+    create_atlas,
+    get_atlas_formats
+)
+from climate_diagram_image import (
+    get_raster_formats,
+    save_pyramid
+)
+from climate_diagram_svg import SvgDiagramTemplate
+from climate_data_stream import (
+    StationExtremes,
+    iter_stations,
+    read_chunks
+)
+from climate_dataset import ClimateDataset
+from climate_profiler import (
+    NULL_PHASE_TIMER,
+    NULL_PROFILER,
+    NullPhaseTimer,
+    NullProfiler,
+    PhaseTimer,
+    Profiler,
+    Stopwatch,
+    Timing
+)
+from climate_render_cache import RenderCache
+from climate_statistics import (
+    StationStatistics,
+    compute_statistics,
+    get_annual_values,
+    iter_statistics,
+    save_statistics
+)
+from climate_validation import (
+    InvalidDataError,
+    check_report,
+    get_valid_data,
+    load_unchecked_data,
+    validate_chunks
+)
 
 
 TempMin = float
 TempMax = float
 TempRange = tuple[TempMin, TempMax]
 
+MONTHS = np.arange(1, 13).astype(str)
+DATA_DTYPE = np.float32  # precision of single precision float is enough to draw diagram
+BACKEND_FORMATS = {  # first format is the default one, webp only if supported by Pillow
+    'matplotlib': (*get_raster_formats(), 'svg'),
+    'fast': ('svg', *get_raster_formats())
+}
+
+_local = threading.local()  # diagram template (attribute template) reused by the current process or thread
+
 
 class YAxisLimits(NamedTuple):
     """Keep Y axis limits fr temperature, precipitation"""
@@ -35,6 +96,123 @@ class YAxisLimits(NamedTuple):
     pmax: int
 
 
+class RenderSettings(NamedTuple):
+    """Keep settings of diagram rendering"""
+    dpi: int = 600
+    file_format: str = 'jpg'
+    backend: str = 'matplotlib'
+    output_dir: str = '.'
+    pyramid: tuple[int, ...] = ()  # lower resolutions of diagram copies downscaled from diagram rendered at dpi
+
+
+class StationResult(NamedTuple):
+    """Keep result of creating diagram for single station"""
+    station: str
+    error: str | None = None
+    timing: Timing | None = None  # set only if station is profiled
+    phases: dict[str, float] | None = None  # wall time of setup (template), draw and save, parts of timing
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(
+        description='Create climate diagrams based on monthly temperature, precipitation data stored in CSV file'
+    )
+    parser.add_argument('data_path', type=str, help='Path to climate data file')
+    parser.add_argument('-c', '--chunk-size', type=int,
+                        help='Read data file in chunks of CHUNK_SIZE rows, for data files larger than memory')
+    add_render_arguments(parser)
+    parser.add_argument('--atlas', type=str, metavar='ATLAS_PATH',
+                        help='Create atlas of all diagrams instead of diagram files: multi-page PDF file (.pdf) '
+                             'or contact sheets (.png, .jpg, .webp), station index is saved into <ATLAS>.index.csv')
+    parser.add_argument('--atlas-grid', type=str, default='4x4', metavar='COLUMNSxROWS',
+                        help='Grid of diagrams on contact sheet, default 4x4')
+    parser.add_argument('--statistics', type=str, metavar='STATISTICS_PATH',
+                        help='Save climate statistics and Köppen-Geiger class of stations into STATISTICS_PATH (CSV)')
+    parser.add_argument('--skip-invalid', action='store_true',
+                        help='Skip invalid stations (missing element, duplicated row, invalid value) instead of '
+                             'stopping before diagrams are created')
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help='Parse data file, do not use (and do not create) its binary snapshot')
+    parser.add_argument('--profile', type=str, metavar='REPORT_PATH',
+                        help='Save time and memory used by stages and stations into REPORT_PATH (.json or .csv)')
+
+    args_ = parser.parse_args()
+    args_.settings = get_render_settings(parser, args_)
+    args_.atlas_grid = get_atlas_grid(parser, args_)
+    if args_.statistics and args_.chunk_size:
+        parser.error('statistics are computed for data set loaded into memory, not available with --chunk-size')
+    return args_
+
+
+def get_atlas_grid(parser: argparse.ArgumentParser, args_: argparse.Namespace) -> tuple[int, int]:
+    """Return grid of contact sheets, exit with error if atlas arguments are not valid.
+
+    :param parser: parser of script arguments
+    :param args_: parsed arguments
+    :return: number of columns, rows
+    """
+    try:
+        columns, rows = (int(size) for size in args_.atlas_grid.lower().split('x'))
+    except ValueError:
+        parser.error(f'grid has to be given as COLUMNSxROWS, e.g. 4x4, not {args_.atlas_grid}')
+    if columns < 1 or rows < 1:
+        parser.error(f'grid has to have at least one column and row, not {args_.atlas_grid}')
+    if args_.atlas:
+        atlas_format = os.path.splitext(args_.atlas)[1][1:].lower()
+        if atlas_format not in get_atlas_formats():
+            parser.error(f'atlas format has to be one of: {", ".join(get_atlas_formats())}')
+        if atlas_format == 'pdf' and args_.settings.backend != 'matplotlib':
+            parser.error('PDF atlas requires matplotlib backend')
+        if args_.settings.pyramid:
+            parser.error('pyramid of diagrams is not available for atlas')
+    return columns, rows
+
+
+def add_render_arguments(parser: argparse.ArgumentParser, workers: bool = True) -> None:
+    """Add arguments of diagram rendering, shared by scripts creating diagrams.
+
+    :param parser: parser of script arguments
+    :param workers: add argument of number of processes creating diagrams
+    """
+    raster_formats = ', '.join(get_raster_formats())
+    if workers:
+        parser.add_argument('-w', '--workers', type=int, default=1,
+                            help='Number of processes used to create diagrams, default 1 (no process pool)')
+    parser.add_argument('-b', '--backend', type=str, default='matplotlib', choices=BACKEND_FORMATS,
+                        help='Diagram renderer, fast - write SVG or raster image directly, without matplotlib figure')
+    parser.add_argument('-f', '--format', type=str,
+                        help=f'Format of diagram files: svg, {raster_formats}; '
+                             f'default jpg for matplotlib backend, svg for fast backend')
+    parser.add_argument('-d', '--dpi', type=int, default=RenderSettings().dpi,
+                        help='Resolution of raster diagrams, default 600')
+    parser.add_argument('--output-dir', type=str, default=RenderSettings().output_dir,
+                        help='Directory of diagram files, default current directory')
+    parser.add_argument('--pyramid', type=int, nargs='+', default=(), metavar='DPI',
+                        help='Save also copies of diagrams at lower resolutions, downscaled from diagram '
+                             'rendered at DPI, e.g. --pyramid 150 48')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Create diagrams for all stations, even if their data has not changed since last run')
+
+
+def get_render_settings(parser: argparse.ArgumentParser, args_: argparse.Namespace) -> RenderSettings:
+    """Return render settings of parsed arguments, exit with error if they are not valid.
+
+    :param parser: parser of script arguments
+    :param args_: parsed arguments (see add_render_arguments)
+    :return: render settings
+    """
+    file_format = args_.format or BACKEND_FORMATS[args_.backend][0]
+    if file_format not in BACKEND_FORMATS[args_.backend]:
+        parser.error(f'format {file_format} not supported by {args_.backend} backend')
+    if args_.pyramid and file_format == 'svg':
+        parser.error('pyramid of diagrams is available only for raster formats')
+    if any(dpi >= args_.dpi or dpi <= 0 for dpi in args_.pyramid):
+        parser.error(f'resolutions of pyramid have to be lower than diagram resolution {args_.dpi}')
+    return RenderSettings(args_.dpi, file_format, args_.backend, args_.output_dir,
+                          tuple(sorted(set(args_.pyramid), reverse=True)))
+
+
 def round_down(num: float, multiple: int) -> int:
     """Rounds down a number to the nearest multiple of given value such as 1, 5, 10 etc.
 
@@ -55,28 +233,32 @@ def round_up(num: float, multiple: int) -> int:
     return ceil(num / multiple) * multiple
 
 
-def get_temp_range(df: pd.DataFrame) -> TempRange:
+def get_temp_range(df: pd.DataFrame | ClimateDataset) -> TempRange:
     """Returns minimum and maximum monthly temperature for the whole dataset.
 
-    :param df: the whole dataset
+    :param df: the whole dataset, data frame or compact data set
     :return: min, max average monthly temperatures
     """
+    if isinstance(df, ClimateDataset):
+        return df.temp.min(), df.temp.max()
     temp_df = df[df.index.get_level_values('Element') == 'Temp']
     temp_arr = temp_df.to_numpy()
     return temp_arr.min(), temp_arr.max()
 
 
-def get_max_precip(df: pd.DataFrame) -> float:
+def get_max_precip(df: pd.DataFrame | ClimateDataset) -> float:
     """Returns maximum monthly precipitation for the whole dataset
 
-    :param df: the whole data set
+    :param df: the whole data set, data frame or compact data set
     :return: maximum monthly precipitation
     """
+    if isinstance(df, ClimateDataset):
+        return df.precip.max()
     precip_df = df[df.index.get_level_values('Element') == 'Precipitation']
     return precip_df.to_numpy().max()
 
 
-def get_yaxis_limits(df: pd.DataFrame) -> YAxisLimits:
+def get_yaxis_limits(df: pd.DataFrame | ClimateDataset) -> YAxisLimits:
     """Returns limits (min, max values) of precipitation, temperature y axes.
     Notes:
         precipitation:
@@ -89,11 +271,21 @@ def get_yaxis_limits(df: pd.DataFrame) -> YAxisLimits:
             max:
                 0 if max monthly temperature is < 0)
                 max monthly temperature round yp to 5th if max monthly temperature is > 0
-    :param df: whole data set
+    :param df: whole data set, data frame or compact data set
     :return: named tuple YAxisLimits (y axis values for temperature and precipitation)
     """
     tmin, tmax = get_temp_range(df)
+    return get_yaxis_limits_from_extremes(tmin, tmax, get_max_precip(df))
+
+
+def get_yaxis_limits_from_extremes(tmin: float, tmax: float, pmax: float) -> YAxisLimits:
+    """Returns limits (min, max values) of precipitation, temperature y axes, see get_yaxis_limits.
 
+    :param tmin: min monthly temperature of the whole data set
+    :param tmax: max monthly temperature of the whole data set
+    :param pmax: max monthly precipitation of the whole data set
+    :return: named tuple YAxisLimits (y axis values for temperature and precipitation)
+    """
     if tmin > 0:
         tmin = 0
     else:
@@ -104,74 +296,486 @@ def get_yaxis_limits(df: pd.DataFrame) -> YAxisLimits:
     else:
         tmax = round_up(tmax, 5)
 
-    pmax = get_max_precip(df)
     pmax = round_up(pmax, 100)
 
     return YAxisLimits(tmin=tmin, tmax=tmax, pmax=pmax)
 
 
+class DiagramTemplate:
+    """Climate diagram figure built once and reused for many stations.
+    Only bar heights, temperature line and title are updated for a station, axes, labels, ticks are created once.
+    Figure is not registered in pyplot, it has to be released with close() or by using template as context manager.
+    """
+
+    def __init__(self, y_axis_limits: YAxisLimits, settings: RenderSettings = RenderSettings()) -> None:
+        """
+        :param y_axis_limits: limits (min and max temperature, max precipitation) for Y axis
+        :param settings: diagram resolution, file format
+        """
+        self.settings = settings
+        self.figure = Figure(dpi=settings.dpi)
+
+        self.precip_ax = self.figure.add_axes((0.1, 0.1, 0.4, 0.8))
+        self.precip_ax.yaxis.tick_left()
+        self.precip_ax.yaxis.set_label_position('left')
+        self.precip_ax.set_ylabel('mm')
+
+        self.temp_ax = self.precip_ax.twinx()
+        self.temp_ax.yaxis.tick_right()
+        self.temp_ax.yaxis.set_label_position('right')
+        self.temp_ax.set_ylabel('°C')
+
+        self.y_axis_limits = y_axis_limits
+        self.set_limits(y_axis_limits)
+
+        self.precip_bars = self.precip_ax.bar(MONTHS, np.zeros(12), color='b', zorder=1)
+        self.temp_line, = self.temp_ax.plot(MONTHS, np.zeros(12), color='r', zorder=2)
+        self.title = self.precip_ax.set_title('')
+
+    def __enter__(self) -> 'DiagramTemplate':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def set_limits(self, y_axis_limits: YAxisLimits) -> None:
+        """Set Y axes limits.
+
+        :param y_axis_limits: limits (min and max temperature, max precipitation) for Y axis
+        """
+        self.precip_ax.set_ylim(0, y_axis_limits.pmax)
+        self.temp_ax.set_ylim(y_axis_limits.tmin, y_axis_limits.tmax)
+        self.y_axis_limits = y_axis_limits
+
+    def render(
+            self,
+            station_data: pd.DataFrame,
+            output_path: str,
+            statistics: StationStatistics | None = None,
+            timer: PhaseTimer | NullPhaseTimer = NULL_PHASE_TIMER
+    ) -> None:
+        """Update diagram with single station data and save it.
+
+        :param station_data: data (temperature, precipitation) for single station
+        :param output_path: path of diagram file
+        :param statistics: precomputed statistics of station used in title, None - computed from station data
+        :param timer: timer of phases draw (update of figure) and save (savefig - drawing of canvas and encoding)
+        """
+        with timer.phase('draw'):
+            self.update(station_data, statistics)
+        with timer.phase('save'):
+            self.figure.savefig(output_path, bbox_inches='tight')
+
+    def render_image(self, station_data: pd.DataFrame, statistics: StationStatistics | None = None) -> Image.Image:
+        """Return image of diagram with single station data, resolution as in settings.
+        Figure is drawn into uncompressed TIFF in memory - raw pixels of cropped (tight) image,
+        much faster to write and read than PNG.
+
+        :param station_data: data (temperature, precipitation) for single station
+        :param statistics: precomputed statistics of station used in title, None - computed from station data
+        :return: PIL image
+        """
+        self.update(station_data, statistics)
+        buffer = BytesIO()
+        self.figure.savefig(buffer, format='tiff', bbox_inches='tight')
+        buffer.seek(0)
+        image = Image.open(buffer)
+        image.load()
+        return image
+
+    def render_pyramid(
+            self,
+            station_data: pd.DataFrame,
+            output_paths: list[str],
+            dpis: list[int],
+            statistics: StationStatistics | None = None,
+            timer: PhaseTimer | NullPhaseTimer = NULL_PHASE_TIMER
+    ) -> None:
+        """Update diagram with single station data, save it and its downscaled copies.
+        Figure is drawn once, lower resolutions are downscaled from its image.
+
+        :param station_data: data (temperature, precipitation) for single station
+        :param output_paths: paths of diagram files, one for every resolution
+        :param dpis: resolutions of diagram files in descending order, the first one is resolution of figure
+        :param statistics: precomputed statistics of station used in title, None - computed from station data
+        :param timer: timer of phases draw (image of figure) and save (downscaling and encoding)
+        """
+        with timer.phase('draw'):
+            image = self.render_image(station_data, statistics)
+        with timer.phase('save'):
+            save_pyramid(image, output_paths, self.settings.file_format, dpis)
+
+    def update(self, station_data: pd.DataFrame, statistics: StationStatistics | None = None) -> None:
+        """Update diagram with single station data.
+
+        :param station_data: data (temperature, precipitation) for single station
+        :param statistics: precomputed statistics of station used in title, None - computed from station data
+        """
+        temp_data = station_data.loc['Temp']
+        precip_data = station_data.loc['Precipitation']
+        for bar, height in zip(self.precip_bars, precip_data, strict=True):
+            bar.set_height(height)
+        self.temp_line.set_ydata(temp_data)
+
+        if statistics is None:
+            mean_temp, sum_precip = get_annual_values(station_data)
+        else:
+            mean_temp, sum_precip = statistics.mean_temp, statistics.sum_precip
+        self.title.set_text(f'Mean {mean_temp} °C, Sum  {sum_precip} mm')
+
+    def close(self) -> None:
+        """Release figure and all its artists."""
+        self.figure.clear()
+
+
+def diagram_path(station: str, settings: RenderSettings, dpi: int | None = None) -> str:
+    """Return path of diagram file of the station.
+
+    :param station: station name
+    :param settings: render settings
+    :param dpi: resolution of downscaled copy of diagram (see RenderSettings.pyramid), None - diagram itself
+    :return: path of diagram file
+    """
+    suffix = '' if dpi is None else f'_{dpi}dpi'
+    return os.path.join(settings.output_dir, f'{station}{suffix}.{settings.file_format}')
+
+
+def diagram_paths(station: str, settings: RenderSettings) -> list[str]:
+    """Return paths of diagram file and its downscaled copies.
+
+    :param station: station name
+    :param settings: render settings
+    :return: paths of diagram files, in order of resolutions from the highest
+    """
+    return [diagram_path(station, settings), *(diagram_path(station, settings, dpi) for dpi in settings.pyramid)]
+
+
+def render_diagram(
+        template: 'DiagramTemplate | SvgDiagramTemplate',
+        station_data: pd.DataFrame | ClimateDataset,
+        station: str,
+        statistics: StationStatistics | None = None,
+        timer: PhaseTimer | NullPhaseTimer = NULL_PHASE_TIMER
+) -> None:
+    """Create diagram of single station with template, downscaled copies are saved if settings have pyramid.
+
+    :param template: diagram template
+    :param station_data: data (temperature, precipitation) for single station or data set with the station
+    :param station: station name
+    :param statistics: precomputed statistics of station, None - computed from station data
+    :param timer: timer of phases of rendering (draw, save)
+    """
+    if isinstance(station_data, ClimateDataset):
+        station_data = station_data.station_data(station)
+    settings = template.settings
+    if settings.pyramid:
+        template.render_pyramid(station_data, diagram_paths(station, settings), [settings.dpi, *settings.pyramid],
+                                statistics, timer)
+    else:
+        template.render(station_data, diagram_path(station, settings), statistics, timer)
+
+
 def create_diagram(
         y_axis_limits: YAxisLimits,
-        station_data: pd.DataFrame,
-        station: str
+        station_data: pd.DataFrame | ClimateDataset,
+        station: str,
+        settings: RenderSettings = RenderSettings(),
+        statistics: StationStatistics | None = None
 ) -> None:
     """Create climate diagram for single station.
 
     :param y_axis_limits: limits (min and max temperature, max precipitation) for Y axis
-    :param station_data: data (temperature, precipitation) for single station
+    :param station_data: data (temperature, precipitation) for single station or data set with the station
     :param station: station name
+    :param settings: render settings, default 600 dpi JPEG file in the current directory
+    :param statistics: precomputed statistics of station, None - computed from station data
     """
-    climate_diagram = plt.figure(dpi=600)
-
-    precip_ax = climate_diagram.add_axes((0.1, 0.1, 0.4, 0.8))
-    precip_ax.yaxis.tick_left()
-    precip_ax.set_ylim(0, y_axis_limits.pmax)
-    precip_ax.yaxis.set_label_position('left')
-    precip_ax.set_ylabel('mm')
-
-    temp_ax = precip_ax.twinx()
-    temp_ax.set_ylim(y_axis_limits.tmin, y_axis_limits.tmax)
-    temp_ax.yaxis.tick_right()
-    temp_ax.yaxis.set_label_position('right')
-    temp_ax.set_ylabel('°C')
+    template_class = SvgDiagramTemplate if settings.backend == 'fast' else DiagramTemplate
+    with template_class(y_axis_limits, settings) as template:
+        render_diagram(template, station_data, station, statistics)
 
-    temp_data = station_data.loc['Temp']
-    precip_data = station_data.loc['Precipitation']
-    precip_ax.bar(np.arange(1, 13).astype(str), precip_data, color='b', zorder=1)
-    temp_ax.plot(np.arange(1, 13).astype(str), temp_data, color='r', zorder=2)
 
-    mean_temp = round(temp_data.mean(), 1)
-    sum_precip = round(precip_data.sum(), 1)
-    precip_ax.set_title(f'Mean {mean_temp} °C, Sum  {sum_precip} mm')
-
-    plt.savefig(f'{station}.jpg', bbox_inches='tight')
+def get_template(
+        y_axis_limits: YAxisLimits,
+        settings: RenderSettings = RenderSettings()
+) -> DiagramTemplate | SvgDiagramTemplate:
+    """Return diagram template of the current process (thread), template is created on first use.
+    Process pool workers (and threads of climate_service) keep their own template for all stations they render.
 
+    :param y_axis_limits: limits (min and max temperature, max precipitation) for Y axis
+    :param settings: render settings
+    :return: diagram template with given Y axis limits
+    """
+    template = getattr(_local, 'template', None)
+    if template is not None and template.settings != settings:
+        close_template()
+        template = None
+    if template is None:
+        template_class = SvgDiagramTemplate if settings.backend == 'fast' else DiagramTemplate
+        template = _local.template = template_class(y_axis_limits, settings)
+    elif template.y_axis_limits != y_axis_limits:
+        template.set_limits(y_axis_limits)
+    return template
+
+
+def close_template() -> None:
+    """Release diagram template of the current process (thread)."""
+    template = getattr(_local, 'template', None)
+    if template is not None:
+        template.close()
+        _local.template = None
+
+
+def render_station(
+        y_axis_limits: YAxisLimits,
+        station_data: pd.DataFrame,
+        station: str,
+        settings: RenderSettings = RenderSettings(),
+        profile: bool = False,
+        statistics: StationStatistics | None = None
+) -> StationResult:
+    """Create climate diagram for single station, report error instead of raising it.
+    Used as the unit of work both for serial run and for process pool workers.
 
-def main(data_path: str) -> None:
+    :param y_axis_limits: limits (min and max temperature, max precipitation) for Y axis
+    :param station_data: data (temperature, precipitation) for single station
+    :param station: station name
+    :param settings: render settings
+    :param profile: measure time and memory used to create diagram
+    :param statistics: precomputed statistics of station, None - computed from station data
+    :return: station name, error description (None if diagram created) and timing (if profiled)
+    """
+    try:
+        if not profile:
+            render_diagram(get_template(y_axis_limits, settings), station_data, station, statistics)
+            return StationResult(station)
+        timer = PhaseTimer()
+        with Stopwatch() as stopwatch:
+            with timer.phase('setup'):
+                template = get_template(y_axis_limits, settings)
+            render_diagram(template, station_data, station, statistics, timer)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return StationResult(station, f'{type(e).__name__}: {e}')
+    return StationResult(station, timing=stopwatch.timing, phases=timer.walls)
+
+
+def render_ordered(
+        stations: Iterable[tuple[str, pd.DataFrame, StationStatistics | None]],
+        y_axis_limits: YAxisLimits,
+        settings: RenderSettings,
+        workers: int,
+        profile: bool = False,
+        keep_template: bool = False
+) -> Iterator[StationResult]:
+    """Create diagrams for stations, yield results in the order of stations.
+    In process pool at most 2 stations per worker are submitted at once, so stations can be read lazily.
+
+    :param stations: tuples (station name, station data, precomputed statistics of station or None)
+    :param y_axis_limits: limits (min and max temperature, max precipitation) for Y axis
+    :param settings: render settings
+    :param workers: number of processes used to create diagrams, 1 - create diagrams in current process
+    :param profile: measure time and memory used to create diagram of every station
+    :param keep_template: keep template of the current process after diagrams are created, for next calls
+    :return: results of creating diagrams
+    """
+    if workers <= 1:
+        for station, station_data, statistics in stations:
+            yield render_station(y_axis_limits, station_data, station, settings, profile, statistics)
+        if not keep_template:
+            close_template()
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for station, station_data, statistics in stations:
+            pending.append(executor.submit(render_station, y_axis_limits, station_data, station, settings,
+                                           profile, statistics))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def render_stations(
+        stations: Iterable[tuple[str, pd.DataFrame]],
+        y_axis_limits: YAxisLimits,
+        settings: RenderSettings = RenderSettings(),
+        workers: int = 1,
+        use_cache: bool = True,
+        num_stations: int | None = None,
+        profiler: Profiler | NullProfiler = NULL_PROFILER,
+        statistics: dict[str, StationStatistics] | None = None,
+        keep_template: bool = False
+) -> list[StationResult]:
+    """Create diagrams for stations, print progress.
+
+    :param stations: tuples (station name, station data)
+    :param y_axis_limits: limits (min and max temperature, max precipitation) for Y axis
+    :param settings: render settings
+    :param workers: number of processes used to create diagrams, 1 - create diagrams in current process
+    :param use_cache: skip stations which data has not changed since diagrams were created in previous run
+    :param num_stations: number of stations if known, used to print progress
+    :param profiler: profiler collecting timing of every rendered station
+    :param statistics: precomputed statistics of stations, key - station name, None - computed from station data
+    :param keep_template: keep template of the current process after diagrams are created (workers 1)
+    :return: results of stations which diagrams were created or failed, stations skipped by cache are not included
+    """
+    os.makedirs(settings.output_dir, exist_ok=True)
+    cache = RenderCache(settings.output_dir, y_axis_limits, settings)
+    keys = {}
+    positions = {}
+
+    def to_render() -> Iterator[tuple[str, pd.DataFrame, StationStatistics | None]]:
+        for i, (station, station_data) in enumerate(stations, start=1):
+            key = cache.key(station_data)
+            if use_cache and cache.is_fresh(station, key, *diagram_paths(station, settings)):
+                continue
+            keys[station] = key
+            positions[station] = f'{i}/{num_stations}' if num_stations else f'{i}'
+            yield station, station_data, statistics.get(station) if statistics else None
+
+    created = failed = 0
+    results = []
+    try:
+        for result in render_ordered(to_render(), y_axis_limits, settings, workers, profiler.enabled,
+                                     keep_template):
+            results.append(result)
+            position = positions.pop(result.station)
+            key = keys.pop(result.station)
+            if result.error:
+                failed += 1
+                print(f'Failed to create diagram for {result.station} [{position}]: {result.error}')
+            else:
+                created += 1
+                cache.update(result.station, key)
+                if result.timing:
+                    profiler.add_item(result.station, result.timing, result.phases)
+                print(f'Diagram for {result.station} created [{position}]')
+    finally:
+        cache.save()
+
+    if use_cache:
+        print(f'Cache: {cache.hits} hit(s), {cache.misses} miss(es)')
+    print(f'{created} diagram(s) created, {failed} failed')
+    return results
+
+
+def create_diagrams(
+        climate_data: pd.DataFrame | ClimateDataset,
+        settings: RenderSettings = RenderSettings(),
+        workers: int = 1,
+        use_cache: bool = True,
+        profiler: Profiler | NullProfiler = NULL_PROFILER,
+        keep_template: bool = False
+) -> list[StationResult]:
+    """Create diagrams for all stations of data set loaded into memory, in the order of stations in data set.
+
+    :param climate_data: data (temperature, precipitation) indexed by station and element or compact data set
+    :param settings: render settings
+    :param workers: number of processes used to create diagrams, 1 - create diagrams in current process
+    :param use_cache: skip stations which data has not changed since diagrams were created in previous run
+    :param profiler: profiler collecting timing of stages and stations
+    :param keep_template: keep template of the current process after diagrams are created (workers 1)
+    :return: results of stations which diagrams were created or failed, stations skipped by cache are not included
+    """
+    with profiler.stage('limits'):
+        y_axis_limits = get_yaxis_limits(climate_data)
+    with profiler.stage('statistics'):
+        statistics = dict(iter_statistics(compute_statistics(climate_data)))
+    stations, num_stations = iter_data_stations(climate_data)
+    with profiler.stage('render'):
+        return render_stations(stations, y_axis_limits, settings, workers, use_cache, num_stations, profiler,
+                               statistics, keep_template)
+
+
+def iter_data_stations(
+        climate_data: pd.DataFrame | ClimateDataset
+) -> tuple[Iterator[tuple[str, pd.DataFrame]], int]:
+    """Return iterator over stations of data set loaded into memory, in the order of stations in data set.
+
+    :param climate_data: data (temperature, precipitation) indexed by station and element or compact data set
+    :return: iterator of tuples (station name, station data), number of stations
+    """
+    if isinstance(climate_data, ClimateDataset):
+        return climate_data.iter_stations(), climate_data.size
+    stations = climate_data.index.unique(level='Station')
+    return ((station, climate_data.loc[station]) for station in stations), len(stations)
+
+
+def main(
+        data_path: str,
+        workers: int = 1,
+        use_cache: bool = True,
+        chunk_size: int | None = None,
+        settings: RenderSettings = RenderSettings(),
+        use_snapshot: bool = True,
+        profile_path: str | None = None,
+        atlas_path: str | None = None,
+        atlas_grid: tuple[int, int] = (4, 4),
+        statistics_path: str | None = None,
+        skip_invalid: bool = False
+) -> None:
     """ Create chart diagrams for data in CSV file
     :param data_path: path to data file
     :type data_path: str
+    :param workers: number of processes used to create diagrams, 1 - create diagrams in current process
+    :param use_cache: skip stations which data has not changed since diagrams were created in previous run
+    :param chunk_size: if set, read data file in chunks of that many rows instead of loading it at once
+    :param settings: render settings
+    :param use_snapshot: load data from binary snapshot of data file, create it if needed
+    :param profile_path: if set, save time and memory used by stages and stations into this report file
+    :param atlas_path: if set, create atlas (PDF file or contact sheets) instead of diagram files
+    :param atlas_grid: number of columns, rows of contact sheets
+    :param statistics_path: if set, save climate statistics of stations into this CSV file
+    :param skip_invalid: skip invalid stations, by default InvalidDataError is raised before diagrams are created
     """
-    climate_data = pd.read_csv(data_path, sep=';', index_col=['Station', 'Element'])
-    stations = set(climate_data.index.get_level_values(0))
-    y_axis_limits = get_yaxis_limits(climate_data)
-
-    num_stations = len(stations)
-    print(f'{num_stations} station(s) found in {data_path}')
-    for i, station in enumerate(stations, start=1):
-        print(f'Creating diagram for {station} [{i}/{num_stations}] ...')
-        station_data = climate_data.loc[station]
-        create_diagram(y_axis_limits, station_data, station)
-
-
-def usage() -> None:
-    """Print help how to use script."""
-    print('Usage:\nclimate_diagram_generator.py <climate_data.csv>')
+    profiler = Profiler() if profile_path else NULL_PROFILER
+    if chunk_size:
+        with profiler.stage('validate'):  # the first pass over data file, extremes of stations are found in it too
+            extremes = StationExtremes()
+            invalid = check_report(validate_chunks(extremes.track(read_chunks(data_path, chunk_size))), skip_invalid)
+        with profiler.stage('limits'):
+            y_axis_limits = get_yaxis_limits_from_extremes(*map(DATA_DTYPE, extremes.get(invalid)))
+        print(f'Reading stations from {data_path} in chunks of {chunk_size} rows')
+        stations = iter_stations(data_path, chunk_size, DATA_DTYPE, invalid)
+        num_stations = None
+        statistics = None  # computed for every station from its data
+    else:
+        with profiler.stage('load'):
+            climate_data = load_unchecked_data(data_path, DATA_DTYPE, use_snapshot)
+        print(f'{climate_data.index.unique(level="Station").size} station(s) found in {data_path}')
+        with profiler.stage('validate'):
+            # valid data is kept as compact data set, data frame is released
+            climate_data = ClimateDataset.from_frame(get_valid_data(climate_data, DATA_DTYPE,
+                                                                    skip_invalid=skip_invalid))
+        with profiler.stage('limits'):
+            y_axis_limits = get_yaxis_limits(climate_data)
+        with profiler.stage('statistics'):
+            station_statistics = compute_statistics(climate_data)
+            statistics = dict(iter_statistics(station_statistics))
+        if statistics_path:
+            save_statistics(station_statistics, statistics_path)
+            print(f'Statistics of {len(station_statistics)} station(s) saved to {statistics_path}')
+        stations, num_stations = iter_data_stations(climate_data)
+
+    with profiler.stage('render'):  # with chunk size reading chunks is included
+        if atlas_path:
+            create_atlas(stations, get_template(y_axis_limits, settings), atlas_path, atlas_grid, num_stations,
+                         statistics)
+            close_template()
+        else:
+            render_stations(stations, y_axis_limits, settings, workers, use_cache, num_stations, profiler,
+                            statistics)
+
+    if profile_path:
+        profiler.save(profile_path)
+        print(f'Profile report saved to {profile_path}')
 
 
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        usage()
-        sys.exit(0)
-
-    main(sys.argv[1])
+    args = parse_args()
+    try:
+        main(args.data_path, args.workers, not args.no_cache, args.chunk_size, args.settings, not args.no_snapshot,
+             args.profile, args.atlas, args.atlas_grid, args.statistics, args.skip_invalid)
+    except InvalidDataError as e:
+        sys.exit(f'{e}')
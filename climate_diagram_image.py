@@ -0,0 +1,51 @@
+"""
+Saving raster climate diagrams with Pillow (installed with matplotlib): JPEG, PNG and WebP (if Pillow supports it).
+Diagram pyramid - diagram is rendered once at the highest resolution, lower resolutions (e.g. thumbnails)
+are downscaled from the rendered image instead of rendering the diagram again.
+"""
+from PIL import (
+    Image,
+    features
+)
+
+RASTER_FORMATS = {'jpg': 'JPEG', 'png': 'PNG', 'webp': 'WEBP'}  # file format: Pillow format
+
+
+def get_raster_formats() -> tuple[str, ...]:
+    """Return raster file formats supported by installed Pillow.
+
+    :return: file formats (file extensions)
+    """
+    return tuple(file_format for file_format in RASTER_FORMATS
+                 if file_format != 'webp' or features.check('webp'))
+
+
+def save_image(image: Image.Image, output_path: str, file_format: str, dpi: int) -> None:
+    """Save diagram image.
+
+    :param image: diagram image
+    :param output_path: path of diagram file
+    :param file_format: file format (jpg, png, webp)
+    :param dpi: resolution saved in file metadata
+    """
+    if file_format == 'jpg' and image.mode != 'RGB':
+        image = image.convert('RGB')  # JPEG has no alpha channel nor palette
+    image.save(output_path, RASTER_FORMATS[file_format], dpi=(dpi, dpi))
+
+
+def save_pyramid(image: Image.Image, output_paths: list[str], file_format: str, dpis: list[int]) -> None:
+    """Save diagram image and its downscaled copies.
+
+    :param image: diagram image rendered at the first resolution of dpis
+    :param output_paths: paths of diagram files, one for every resolution
+    :param file_format: file format (jpg, png, webp)
+    :param dpis: resolutions of diagram files in descending order, the first one is resolution of image
+    """
+    width, height = image.size
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGB')  # palette image can not be resampled
+    for output_path, dpi in zip(output_paths, dpis, strict=True):
+        size = (max(1, round(width * dpi / dpis[0])), max(1, round(height * dpi / dpis[0])))
+        if size != image.size:  # every level is downscaled from the previous (larger) one, not from the full image
+            image = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        save_image(image, output_path, file_format, dpi)
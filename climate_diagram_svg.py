@@ -0,0 +1,346 @@
+"""
+Fast renderer of climate diagrams - writes SVG directly, without building matplotlib figure.
+Layout of the diagram is fixed (12 bars, temperature line, two Y axes, title), so static part of SVG document
+(axes, ticks, labels) is prepared once for Y axis limits, only bars, line and title are formatted for a station.
+Optionally diagram is rasterized to PNG, JPEG or WebP with Pillow (installed with matplotlib) using the same geometry.
+
+Geometry follows the matplotlib diagram created by climate_diagram_generator.DiagramTemplate:
+    - default matplotlib figure size 6.4 x 4.8 inches, axes at (0.1, 0.1, 0.4, 0.8) of the figure
+    - bars 0.8 wide at categories 0..11, 5% margins of X axis
+"""
+from math import (
+    ceil,
+    floor,
+    log10
+)
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import pandas as pd
+
+from climate_diagram_image import (
+    get_raster_formats,
+    save_image
+)
+from climate_profiler import (
+    NULL_PHASE_TIMER,
+    NullPhaseTimer,
+    PhaseTimer
+)
+from climate_statistics import (
+    StationStatistics,
+    get_annual_values
+)
+
+FIGURE_WIDTH = 460.8  # points, 6.4 inches
+FIGURE_HEIGHT = 345.6  # points, 4.8 inches
+AXES_LEFT = FIGURE_WIDTH * 0.1
+AXES_RIGHT = FIGURE_WIDTH * 0.5
+AXES_TOP = FIGURE_HEIGHT * 0.1
+AXES_BOTTOM = FIGURE_HEIGHT * 0.9
+X_MIN, X_MAX = -0.99, 11.99
+BAR_WIDTH = 0.8
+TICK_LENGTH = 3.5
+FONT_SIZE = 10
+MARGIN = 44  # space around axes for tick labels, axis labels and title
+VIEW_BOX = (AXES_LEFT - MARGIN, AXES_TOP - MARGIN / 2, AXES_RIGHT - AXES_LEFT + 2 * MARGIN,
+            AXES_BOTTOM - AXES_TOP + MARGIN)
+
+PRECIP_COLOR = '#0000ff'
+TEMP_COLOR = '#ff0000'
+TEXT_COLOR = '#000000'
+PALETTE = ('#ffffff', PRECIP_COLOR, TEMP_COLOR, TEXT_COLOR)
+
+
+def get_ticks(vmin: float, vmax: float, max_intervals: int = 9) -> list[float]:
+    """Return ticks of axis with 'nice' step (1, 2, 2.5, 5 multiplied by power of 10) as matplotlib does.
+
+    :param vmin: min value of axis
+    :param vmax: max value of axis
+    :param max_intervals: max number of intervals between ticks
+    :return: tick values
+    """
+    if vmax <= vmin:
+        return [vmin]
+    raw_step = (vmax - vmin) / max_intervals
+    magnitude = 10 ** floor(log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw_step)
+    first = ceil(vmin / step)
+    last = floor(vmax / step)
+    return [i * step for i in range(first, last + 1)]
+
+
+def format_tick(value: float) -> str:
+    """Return tick label, minus sign as in matplotlib.
+
+    :param value: tick value
+    :return: tick label
+    """
+    return f'{value:g}'.replace('-', '−')
+
+
+def x_position(category: float) -> float:
+    """Return X coordinate of category (month index 0..11)."""
+    return AXES_LEFT + (category - X_MIN) / (X_MAX - X_MIN) * (AXES_RIGHT - AXES_LEFT)
+
+
+def y_position(value: float, vmin: float, vmax: float) -> float:
+    """Return Y coordinate of value on axis with given limits."""
+    return AXES_BOTTOM - (value - vmin) / (vmax - vmin) * (AXES_BOTTOM - AXES_TOP)
+
+
+def to_px(x: float, y: float, scale: float) -> tuple[float, float]:
+    """Return pixel coordinates of raster image for diagram coordinates (points).
+
+    :param x: x coordinate
+    :param y: y coordinate
+    :param scale: pixels per point (resolution / 72)
+    :return: pixel coordinates
+    """
+    return (x - VIEW_BOX[0]) * scale, (y - VIEW_BOX[1]) * scale
+
+
+def svg_text(x: float, y: float, text: str, anchor: str, rotation: float) -> str:
+    """Return SVG text element.
+
+    :param x: x coordinate
+    :param y: y coordinate (baseline)
+    :param text: text
+    :param anchor: text anchor - start, middle or end
+    :param rotation: rotation in degrees around (x, y), negative - counterclockwise
+    :return: SVG text element
+    """
+    transform = f' transform="rotate({rotation} {x:.2f} {y:.2f})"' if rotation else ''
+    return f'<text x="{x:.2f}" y="{y:.2f}" text-anchor="{anchor}"{transform}>{escape(text)}</text>'
+
+
+class SvgDiagramTemplate:
+    """Climate diagram written directly to SVG (or rasterized to PNG), interface as DiagramTemplate"""
+
+    def __init__(self, y_axis_limits, settings) -> None:
+        """
+        :param y_axis_limits: YAxisLimits - limits (min and max temperature, max precipitation) for Y axis
+        :param settings: RenderSettings - resolution of raster diagram, file format (svg, png, jpg, webp)
+        """
+        if settings.file_format not in ('svg', *get_raster_formats()):
+            raise ValueError(f'Not supported format of fast renderer: {settings.file_format}')
+        self.settings = settings
+        self.raster_bases = {}  # resolution: rasterized static part of the diagram
+        self.y_axis_limits = y_axis_limits
+        self.set_limits(y_axis_limits)
+
+    def __enter__(self) -> 'SvgDiagramTemplate':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def set_limits(self, y_axis_limits) -> None:
+        """Prepare static part of the diagram - axes, ticks and labels.
+
+        :param y_axis_limits: YAxisLimits - limits (min and max temperature, max precipitation) for Y axis
+        """
+        self.y_axis_limits = y_axis_limits
+        self.raster_bases = {}
+        lines = [(AXES_LEFT, AXES_TOP, AXES_LEFT, AXES_BOTTOM), (AXES_RIGHT, AXES_TOP, AXES_RIGHT, AXES_BOTTOM),
+                 (AXES_LEFT, AXES_TOP, AXES_RIGHT, AXES_TOP), (AXES_LEFT, AXES_BOTTOM, AXES_RIGHT, AXES_BOTTOM)]
+        texts = []  # (x, y, text, anchor, rotation)
+
+        for month in range(12):
+            x = x_position(month)
+            lines.append((x, AXES_BOTTOM, x, AXES_BOTTOM + TICK_LENGTH))
+            texts.append((x, AXES_BOTTOM + TICK_LENGTH + FONT_SIZE, str(month + 1), 'middle', 0))
+        for tick in get_ticks(0, y_axis_limits.pmax):
+            y = y_position(tick, 0, y_axis_limits.pmax)
+            lines.append((AXES_LEFT - TICK_LENGTH, y, AXES_LEFT, y))
+            texts.append((AXES_LEFT - TICK_LENGTH - 2, y + FONT_SIZE / 3, format_tick(tick), 'end', 0))
+        for tick in get_ticks(y_axis_limits.tmin, y_axis_limits.tmax):
+            y = y_position(tick, y_axis_limits.tmin, y_axis_limits.tmax)
+            lines.append((AXES_RIGHT, y, AXES_RIGHT + TICK_LENGTH, y))
+            texts.append((AXES_RIGHT + TICK_LENGTH + 2, y + FONT_SIZE / 3, format_tick(tick), 'start', 0))
+        middle = (AXES_TOP + AXES_BOTTOM) / 2
+        texts.append((AXES_LEFT - MARGIN + FONT_SIZE, middle, 'mm', 'middle', -90))
+        texts.append((AXES_RIGHT + MARGIN - FONT_SIZE / 2, middle, '°C', 'middle', -90))
+
+        self.lines = lines
+        self.texts = texts
+        self.svg_static = ''.join(
+            [f'<line x1="{x1:.2f}" y1="{y1:.2f}" x2="{x2:.2f}" y2="{y2:.2f}"/>' for x1, y1, x2, y2 in lines]
+        ) + ''.join(svg_text(*text) for text in texts)
+
+    def get_geometry(
+            self,
+            station_data: pd.DataFrame,
+            statistics: StationStatistics | None = None
+    ) -> tuple[list[tuple[float, float, float, float]], list[tuple[float, float]], str]:
+        """Return geometry of station specific part of the diagram.
+
+        :param station_data: data (temperature, precipitation) for single station
+        :param statistics: precomputed statistics of station used in title, None - computed from station data
+        :return: bars (x, y, width, height), temperature line points, title
+        """
+        temp_data = station_data.loc['Temp']
+        precip_data = station_data.loc['Precipitation']
+        limits = self.y_axis_limits
+        bar_width = x_position(BAR_WIDTH) - x_position(0)
+        bars = []
+        for month, precip in enumerate(precip_data.to_numpy()):
+            top = y_position(precip, 0, limits.pmax)
+            bars.append((x_position(month - BAR_WIDTH / 2), top, bar_width, AXES_BOTTOM - top))
+        points = [(x_position(month), y_position(temp, limits.tmin, limits.tmax))
+                  for month, temp in enumerate(temp_data.to_numpy())]
+
+        if statistics is None:
+            mean_temp, sum_precip = get_annual_values(station_data)
+        else:
+            mean_temp, sum_precip = statistics.mean_temp, statistics.sum_precip
+        return bars, points, f'Mean {mean_temp} °C, Sum  {sum_precip} mm'
+
+    def render(
+            self,
+            station_data: pd.DataFrame,
+            output_path: str | Path,
+            statistics: StationStatistics | None = None,
+            timer: PhaseTimer | NullPhaseTimer = NULL_PHASE_TIMER
+    ) -> None:
+        """Create diagram with single station data and save it.
+
+        :param station_data: data (temperature, precipitation) for single station
+        :param output_path: path of diagram file
+        :param statistics: precomputed statistics of station used in title, None - computed from station data
+        :param timer: timer of phases draw (geometry, rasterization or SVG document) and save (encoding, writing)
+        """
+        if self.settings.file_format == 'svg':
+            with timer.phase('draw'):
+                svg = self.get_svg(station_data, statistics)
+            with timer.phase('save'):
+                Path(output_path).write_text(svg, encoding='utf-8')
+            return
+
+        with timer.phase('draw'):
+            image = self.render_image(station_data, statistics)
+        with timer.phase('save'):
+            save_image(image, output_path, self.settings.file_format, self.settings.dpi)
+
+    def get_svg(self, station_data: pd.DataFrame, statistics: StationStatistics | None = None) -> str:
+        """Return SVG document of diagram with single station data.
+
+        :param station_data: data (temperature, precipitation) for single station
+        :param statistics: precomputed statistics of station used in title, None - computed from station data
+        :return: SVG document
+        """
+        bars, points, title = self.get_geometry(station_data, statistics)
+        svg_bars = ''.join(f'<rect x="{x:.2f}" y="{y:.2f}" width="{w:.2f}" height="{h:.2f}"/>'
+                           for x, y, w, h in bars)
+        svg_line = ' '.join(f'{x:.2f},{y:.2f}' for x, y in points)
+        x, y, width, height = VIEW_BOX
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.2f}pt" height="{height:.2f}pt" '
+            f'viewBox="{x:.2f} {y:.2f} {width:.2f} {height:.2f}">'
+            f'<rect x="{x:.2f}" y="{y:.2f}" width="{width:.2f}" height="{height:.2f}" fill="#ffffff"/>'
+            f'<g fill="{PRECIP_COLOR}">{svg_bars}</g>'
+            f'<polyline points="{svg_line}" fill="none" stroke="{TEMP_COLOR}" stroke-width="1.5"/>'
+            f'<g stroke="{TEXT_COLOR}" stroke-width="0.8">{self.svg_static}</g>'
+            f'<g font-family="DejaVu Sans, sans-serif" font-size="{FONT_SIZE}" fill="{TEXT_COLOR}">'
+            f'<text x="{(AXES_LEFT + AXES_RIGHT) / 2:.2f}" y="{AXES_TOP - 6:.2f}" font-size="12" '
+            f'text-anchor="middle">{escape(title)}</text></g>'
+            '</svg>'
+        )
+
+    def render_image(self, station_data: pd.DataFrame, statistics: StationStatistics | None = None):
+        """Return image of diagram with single station data, resolution as in settings.
+
+        :param station_data: data (temperature, precipitation) for single station
+        :param statistics: precomputed statistics of station used in title, None - computed from station data
+        :return: PIL image
+        """
+        return self.rasterize(*self.get_geometry(station_data, statistics))
+
+    def render_pyramid(
+            self,
+            station_data: pd.DataFrame,
+            output_paths: list[str],
+            dpis: list[int],
+            statistics: StationStatistics | None = None,
+            timer: PhaseTimer | NullPhaseTimer = NULL_PHASE_TIMER
+    ) -> None:
+        """Create diagram with single station data at several resolutions and save it.
+        Geometry is computed once, diagram is rasterized at every resolution - it is faster than downscaling.
+
+        :param station_data: data (temperature, precipitation) for single station
+        :param output_paths: paths of diagram files, one for every resolution
+        :param dpis: resolutions of diagram files
+        :param statistics: precomputed statistics of station used in title, None - computed from station data
+        :param timer: timer of phases draw (geometry, rasterization) and save (encoding), summed over resolutions
+        """
+        with timer.phase('draw'):
+            bars, points, title = self.get_geometry(station_data, statistics)
+        for output_path, dpi in zip(output_paths, dpis, strict=True):
+            with timer.phase('draw'):
+                image = self.rasterize(bars, points, title, dpi)
+            with timer.phase('save'):
+                save_image(image, output_path, self.settings.file_format, dpi)
+
+    def rasterize(self, bars: list, points: list, title: str, dpi: int | None = None):
+        """Return image of the diagram drawn with Pillow.
+        Image uses 4 color palette (white, blue, red, black) - it is encoded to PNG much faster than RGB image.
+
+        :param bars: bars (x, y, width, height)
+        :param points: temperature line points
+        :param title: diagram title
+        :param dpi: resolution of image, default resolution from settings
+        :return: PIL image
+        """
+        from PIL import ImageDraw, ImageFont  # pylint: disable=import-outside-toplevel
+
+        dpi = dpi or self.settings.dpi
+        scale = dpi / 72
+        if dpi not in self.raster_bases:
+            self.raster_bases[dpi] = self.rasterize_static(dpi)
+        image = self.raster_bases[dpi].copy()
+        draw = ImageDraw.Draw(image)
+        for x, y, w, h in bars:
+            draw.rectangle((*to_px(x, y, scale), *to_px(x + w, y + h, scale)), fill=PALETTE.index(PRECIP_COLOR))
+        draw.line([to_px(x, y, scale) for x, y in points], fill=PALETTE.index(TEMP_COLOR),
+                  width=max(1, round(1.5 * scale)), joint='curve')
+        for x1, y1, x2, y2 in self.lines[:4]:  # axes frame is drawn over bars
+            draw.line((*to_px(x1, y1, scale), *to_px(x2, y2, scale)), fill=PALETTE.index(TEXT_COLOR),
+                      width=max(1, round(0.8 * scale)))
+        draw.text(to_px((AXES_LEFT + AXES_RIGHT) / 2, AXES_TOP - 6, scale), title,
+                  font=ImageFont.load_default(12 * scale), fill=PALETTE.index(TEXT_COLOR), anchor='ms')
+        return image
+
+    def rasterize_static(self, dpi: int):
+        """Return image with static part of the diagram - axes, ticks and labels.
+
+        :param dpi: resolution of image
+        :return: PIL image
+        """
+        from PIL import Image, ImageDraw, ImageFont  # pylint: disable=import-outside-toplevel
+
+        scale = dpi / 72
+        _, _, width, height = VIEW_BOX
+        image = Image.new('P', (round(width * scale), round(height * scale)), PALETTE.index('#ffffff'))
+        image.putpalette([int(color[i:i + 2], 16) for color in PALETTE for i in (1, 3, 5)])
+        draw = ImageDraw.Draw(image)
+        font = ImageFont.load_default(FONT_SIZE * scale)
+        black = PALETTE.index(TEXT_COLOR)
+        for x1, y1, x2, y2 in self.lines:
+            draw.line((*to_px(x1, y1, scale), *to_px(x2, y2, scale)), fill=black, width=max(1, round(0.8 * scale)))
+        anchors = {'start': 'ls', 'middle': 'ms', 'end': 'rs'}
+        for x, y, text, anchor, rotation in self.texts:
+            if rotation:
+                x, y = to_px(x, y, scale)
+                label = Image.new('1', (round(FONT_SIZE * scale * 3), round(FONT_SIZE * scale * 1.5)), 0)
+                ImageDraw.Draw(label).text((label.width / 2, label.height / 2), text, font=font, fill=1,
+                                           anchor='mm')
+                label = label.rotate(-rotation, expand=True)
+                image.paste(black, (round(x - label.width / 2), round(y - label.height / 2)), label)
+            else:
+                # default Pillow font has no unicode minus sign
+                draw.text(to_px(x, y, scale), text.replace('−', '-'), font=font, fill=black, anchor=anchors[anchor])
+        return image
+
+    def close(self) -> None:
+        """Release rasterized static part of the diagram."""
+        self.raster_bases = {}
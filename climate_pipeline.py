@@ -0,0 +1,125 @@
+"""
+Script to convert climate data in Fahrenheit degrees, inches into Celsius degrees, millimetres and create
+climate diagrams of converted data in one run.
+Converted data is passed to the diagram renderer in memory - it is not written into CSV file and parsed back,
+as when climate_data_unit_converter and climate_diagram_generator are run one after another.
+Converted data can be still saved (--output), CSV file is written in background thread while diagrams are created
+in the current process (with more workers it is written after diagrams, render processes are not forked
+while another thread is running).
+
+Example input file - Fahrenheit degrees, inches
+Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Sydney;Temp;74.3;74.1;71.8;67.1;61.9;57.6;56.1;58.1;62.6;66.0;68.7;71.8
+Sydney;Precipitation;3.59;5.18;4.63;4.49;3.97;5.59;3.16;2.96;2.5;2.67;3.57;2.87
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import sys
+
+import numpy as np
+
+from climate_data_unit_converter import (
+    SOURCE_UNITS,
+    convert_data
+)
+from climate_dataset import ClimateDataset
+from climate_diagram_generator import (
+    DATA_DTYPE,
+    RenderSettings,
+    add_render_arguments,
+    create_diagrams,
+    get_render_settings
+)
+from climate_profiler import (
+    NULL_PROFILER,
+    Profiler
+)
+from climate_validation import (
+    InvalidDataError,
+    get_valid_data,
+    load_unchecked_data
+)
+
+TARGET_UNIT = 'C_mm'  # diagrams are labelled in Celsius degrees and millimetres
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(
+        description='Convert climate data in Fahrenheit degrees, inches into Celsius degrees, mm and create '
+                    'climate diagrams of converted data'
+    )
+    parser.add_argument('-i', '--input', type=str, required=True,
+                        help='Path to input data file (Fahrenheit degrees, inches)')
+    parser.add_argument('-o', '--output', type=str,
+                        help='Path to output data file (Celsius degrees, mm), if not set converted data is not saved')
+    add_render_arguments(parser)
+    parser.add_argument('--skip-invalid', action='store_true',
+                        help='Skip invalid stations (missing element, duplicated row, invalid value) instead of '
+                             'stopping before conversion')
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help='Parse input file, do not use (and do not create) its binary snapshot')
+    parser.add_argument('--profile', type=str, metavar='REPORT_PATH',
+                        help='Save time and memory used by stages and stations into REPORT_PATH (.json or .csv)')
+
+    args_ = parser.parse_args()
+    args_.settings = get_render_settings(parser, args_)
+    return args_
+
+
+def main(
+        input_path: str,
+        output_path: str | None = None,
+        workers: int = 1,
+        use_cache: bool = True,
+        settings: RenderSettings = RenderSettings(),
+        use_snapshot: bool = True,
+        profile_path: str | None = None,
+        skip_invalid: bool = False
+) -> None:
+    """Convert climate data into Celsius degrees, mm and create diagrams of converted data.
+
+    :param input_path: path to the input data file
+    :param output_path: path to the output data file, if None converted data is not saved
+    :param workers: number of processes used to create diagrams, 1 - create diagrams in current process
+    :param use_cache: skip stations which data has not changed since diagrams were created in previous run
+    :param settings: render settings
+    :param use_snapshot: load input data from its binary snapshot, create it if needed
+    :param profile_path: if set, save time and memory used by stages and stations into this report file
+    :param skip_invalid: skip invalid stations, by default InvalidDataError is raised before conversion
+    """
+    profiler = Profiler() if profile_path else NULL_PROFILER
+    with profiler.stage('load'):
+        src_data = load_unchecked_data(input_path, np.float64, use_snapshot)
+    with profiler.stage('validate'):
+        src_data = get_valid_data(src_data, np.float64, SOURCE_UNITS[TARGET_UNIT], skip_invalid)
+    with profiler.stage('convert'):
+        converted_data = convert_data(src_data, TARGET_UNIT)
+    print(f'{converted_data.index.unique(level="Station").size} station(s) converted from {input_path}')
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # with more workers render processes are forked - file is written after rendering, a thread writing it
+        # while processes are forked could leave them with a lock held forever
+        writing = executor.submit(converted_data.to_csv, output_path) if output_path and workers == 1 else None
+        # diagrams are created from the same values as by climate_diagram_generator reading the output file
+        create_diagrams(ClimateDataset.from_frame(converted_data, DATA_DTYPE), settings, workers, use_cache, profiler)
+        if output_path:
+            with profiler.stage('write'):  # with one worker only time of waiting for writing finished after rendering
+                if writing:
+                    writing.result()
+                else:
+                    converted_data.to_csv(output_path)
+            print(f'Converted data saved to {output_path}')
+
+    if profile_path:
+        profiler.save(profile_path)
+        print(f'Profile report saved to {profile_path}')
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    try:
+        main(args.input, args.output, args.workers, not args.no_cache, args.settings, not args.no_snapshot,
+             args.profile, args.skip_invalid)
+    except InvalidDataError as e:
+        sys.exit(f'{e}')
@@ -0,0 +1,302 @@
+"""
+Profiling of climate scripts (--profile option): wall time, CPU time, increase and peak of resident set size
+(RSS) of every stage of a script (loading data, finding Y axis limits, rendering etc.) and of every item
+(station diagram, converted file). Wall time of phases of an item (e.g. drawing and saving diagram)
+is measured with PhaseTimer.
+Peak RSS of a block is the high-water mark of the process reset when the block starts (Linux, /proc/self/clear_refs),
+so transient peaks freed before the block ends are included. Peak of enclosing blocks is kept when a nested block
+resets it.
+Report is saved as JSON or CSV file (chosen by file extension), it contains:
+    - timing of stages
+    - percentiles p50, p95, p99 of item wall times, total wall times of item phases
+    - slowest items
+    - peak RSS of the profiling process
+When profiling is off, NullProfiler is used - its hooks do nothing and items are not timed at all.
+"""
+from contextlib import (
+    contextmanager,
+    nullcontext
+)
+from time import (
+    perf_counter,
+    process_time
+)
+from typing import (
+    Iterator,
+    NamedTuple
+)
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # not available on Windows, peak RSS is not reported there
+    resource = None
+
+PERCENTILES = (50, 95, 99)
+NUM_SLOWEST = 10
+
+
+class Timing(NamedTuple):
+    """Keep time and memory used by a stage or an item"""
+    wall: float  # seconds
+    cpu: float  # seconds of CPU time of the process
+    rss_delta: int | None  # increase of resident set size of the process (bytes), None if not available
+    rss_peak: int | None = None  # peak resident set size of the process while measured (bytes), None if not available
+
+
+class Stopwatch:
+    """Measure wall time, CPU time, RSS increase and peak RSS of a block of code, use as context manager"""
+    running: list['Stopwatch'] = []  # stopwatches of the current process, the innermost last
+
+    def __init__(self) -> None:
+        self.timing: Timing | None = None
+        self._wall = 0.0
+        self._cpu = 0.0
+        self._rss: int | None = None
+        self._rss_peak: int | None = None
+
+    def __enter__(self) -> 'Stopwatch':
+        self._rss = get_rss()
+        hwm = get_hwm()
+        for stopwatch in self.running:  # their peak so far is lost by reset
+            stopwatch.add_peak(hwm)
+        self._rss_peak = self._rss if hwm is not None and reset_hwm(hwm) else None
+        self.running.append(self)
+        self._wall = perf_counter()
+        self._cpu = process_time()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        wall, cpu = perf_counter() - self._wall, process_time() - self._cpu
+        self.running.remove(self)
+        rss = get_rss()
+        hwm = get_hwm()
+        for stopwatch in (self, *self.running):
+            stopwatch.add_peak(hwm)
+        self.timing = Timing(wall, cpu, None if rss is None or self._rss is None else rss - self._rss, self._rss_peak)
+
+    def add_peak(self, hwm: int | None) -> None:
+        """Update peak RSS of block with high-water mark of the process.
+
+        :param hwm: RSS high-water mark in bytes, None if it is not available
+        """
+        if hwm is not None and self._rss_peak is not None:
+            self._rss_peak = max(self._rss_peak, hwm)
+
+
+class PhaseTimer:
+    """Accumulate wall time of phases of an item, e.g. drawing and saving diagram"""
+    enabled = True
+
+    def __init__(self) -> None:
+        self.walls: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure phase, use as context manager. Time of repeated phase is added up.
+
+        :param name: phase name
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.walls[name] = self.walls.get(name, 0.0) + perf_counter() - start
+
+
+class NullPhaseTimer:
+    """Phase timer used when profiling is off, phases are not measured"""
+    enabled = False
+    _phase = nullcontext()
+
+    def phase(self, name: str) -> nullcontext:  # pylint: disable=unused-argument
+        """Return context manager which does nothing."""
+        return self._phase
+
+
+NULL_PHASE_TIMER = NullPhaseTimer()
+
+
+def get_rss() -> int | None:
+    """Return current resident set size of the current process in bytes, None if it is not available (not Linux).
+
+    :return: RSS in bytes
+    """
+    try:
+        with open('/proc/self/statm', encoding='ascii') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def get_hwm() -> int | None:
+    """Return high-water mark of resident set size of the current process in bytes (peak since process start
+    or since the last reset_peak_rss), None if it is not available (not Linux).
+
+    :return: RSS high-water mark in bytes
+    """
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024  # kilobytes
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+_peak_before_reset = 0  # peak RSS of the process lost by resets of high-water mark (bytes)
+
+
+def reset_hwm(hwm: int) -> bool:
+    """Reset high-water mark of RSS of the current process to its current RSS (Linux 4.0+),
+    peak so far is kept for get_peak_rss.
+
+    :param hwm: high-water mark before reset (bytes)
+    :return: True if high-water mark was reset
+    """
+    global _peak_before_reset  # pylint: disable=global-statement
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+            f.write('5')
+    except OSError:
+        return False
+    _peak_before_reset = max(_peak_before_reset, hwm)
+    return True
+
+
+def get_peak_rss() -> int | None:
+    """Return peak resident set size of the current process in bytes (the whole run so far),
+    None if it is not available.
+
+    :return: peak RSS in bytes
+    """
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss = peak_rss if sys.platform == 'darwin' else peak_rss * 1024  # kilobytes on Linux
+    return max(peak_rss, _peak_before_reset)
+
+
+class Profiler:
+    """Collect timing of stages and items of a script run"""
+    enabled = True
+
+    def __init__(self, item_kind: str = 'station') -> None:
+        """
+        :param item_kind: kind of profiled items, e.g. station, file
+        """
+        self.item_kind = item_kind
+        self.stages: dict[str, Timing] = {}
+        self.items: dict[str, Timing] = {}
+        self.phases: dict[str, dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure stage of a script, use as context manager.
+
+        :param name: stage name
+        """
+        with Stopwatch() as stopwatch:
+            yield
+        self.stages[name] = stopwatch.timing
+
+    def add_item(self, name: str, timing: Timing, phases: dict[str, float] | None = None) -> None:
+        """Add timing of an item measured (possibly in other process) with Stopwatch.
+
+        :param name: item name
+        :param timing: timing of the item
+        :param phases: parts of wall time spent in phases of item (see PhaseTimer), e.g. setup, draw, save
+        """
+        self.items[name] = timing
+        self.phases[name] = phases or {}
+
+    def phase_names(self) -> list[str]:
+        """Return names of phases of all items, in order of their first occurrence.
+
+        :return: phase names
+        """
+        return list(dict.fromkeys(phase for phases in self.phases.values() for phase in phases))
+
+    def item_record(self, name: str) -> dict:
+        """Return timing of item as dictionary.
+
+        :param name: item name
+        :return: dictionary with item name, its timing and wall times of its phases
+        """
+        phases = {f'{phase}_wall': self.phases[name].get(phase, 0.0) for phase in self.phase_names()}
+        return {self.item_kind: name, **self.items[name]._asdict(), **phases}
+
+    def report(self, num_slowest: int = NUM_SLOWEST) -> dict:
+        """Return profiling report.
+
+        :param num_slowest: number of slowest items listed in report
+        :return: dictionary with timing of stages, percentiles of item wall times, slowest items and peak RSS
+        """
+        walls = np.array([timing.wall for timing in self.items.values()])
+        percentiles = {}
+        if walls.size:
+            percentiles = {f'p{q}': float(value) for q, value in zip(PERCENTILES, np.percentile(walls, PERCENTILES))}
+        slowest = sorted(self.items, key=lambda name: self.items[name].wall, reverse=True)[:num_slowest]
+        return {
+            'stages': {name: timing._asdict() for name, timing in self.stages.items()},
+            'items': {
+                'kind': self.item_kind,
+                'count': int(walls.size),
+                'wall_total': float(walls.sum()),
+                'phase_wall_totals': {phase: float(sum(phases.get(phase, 0.0) for phases in self.phases.values()))
+                                      for phase in self.phase_names()},
+                'wall_percentiles': percentiles
+            },
+            'slowest': [self.item_record(name) for name in slowest],
+            'peak_rss': get_peak_rss()  # items profiled in worker processes are not included
+        }
+
+    def save(self, path: str) -> None:
+        """Save report, CSV file if path ends with .csv, JSON file otherwise.
+        CSV file has a row for every stage, percentile and item, items have column with wall time of every phase.
+
+        :param path: path of the report file
+        """
+        report = self.report()
+        if not path.lower().endswith('.csv'):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=1)
+            return
+
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter=';')
+            phase_names = self.phase_names()
+            writer.writerow(['record', 'name', 'wall', 'cpu', 'rss_delta', 'rss_peak',
+                             *(f'{phase}_wall' for phase in phase_names)])
+            for name, timing in self.stages.items():
+                writer.writerow(['stage', name, *timing, *([''] * len(phase_names))])
+            for name, wall in report['items']['wall_percentiles'].items():
+                writer.writerow(['percentile', name, wall, '', '', '', *([''] * len(phase_names))])
+            for name, timing in self.items.items():
+                writer.writerow([self.item_kind, name, *timing,
+                                 *(self.phases[name].get(phase, 0.0) for phase in phase_names)])
+
+
+class NullProfiler:
+    """Profiler used when profiling is off, all hooks do nothing"""
+    enabled = False
+    _stage = nullcontext()
+
+    def stage(self, name: str) -> nullcontext:  # pylint: disable=unused-argument
+        """Return context manager which does nothing."""
+        return self._stage
+
+    def add_item(self, name: str, timing: Timing, phases: dict[str, float] | None = None) -> None:
+        """Do nothing."""
+
+    def save(self, path: str) -> None:
+        """Do nothing."""
+
+
+NULL_PROFILER = NullProfiler()
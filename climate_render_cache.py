@@ -0,0 +1,96 @@
+"""
+Persistent cache of rendered climate diagrams.
+Cache is kept in the manifest file in the output directory, for every station manifest keeps hash of:
+    - station data (12 temperature, 12 precipitation values)
+    - Y axis limits
+    - render settings
+Diagram of a station is up to date if hash of current data is equal to the hash saved in manifest
+and diagram file exists.
+Y axis limits are shared by all diagrams - if they change, all manifest entries are dropped.
+"""
+from hashlib import sha256
+from pathlib import Path
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_NAME = '.climate_diagrams.json'
+
+
+class RenderCache:
+    """Keep hashes of station data of diagrams rendered in previous runs"""
+
+    def __init__(
+            self,
+            directory: str | Path,
+            y_axis_limits: tuple,
+            settings: tuple
+    ) -> None:
+        """
+        :param directory: output directory, manifest is stored in this directory
+        :param y_axis_limits: limits of Y axes shared by all diagrams
+        :param settings: render settings (resolution, format etc.)
+        """
+        self.path = Path(directory) / MANIFEST_NAME
+        self.y_axis_limits = [float(limit) for limit in y_axis_limits]
+        self.settings = json.loads(json.dumps(list(settings)))  # as read from manifest, e.g. tuples as lists
+        self.entries: dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        """Load manifest entries, skip them if manifest was created for other Y axis limits or settings."""
+        try:
+            manifest = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if manifest.get('y_axis_limits') == self.y_axis_limits and manifest.get('settings') == self.settings:
+            self.entries = manifest.get('stations', {})
+
+    def key(self, station_data: pd.DataFrame) -> str:
+        """Return hash of station data, Y axis limits and render settings.
+
+        :param station_data: data (temperature, precipitation) for single station
+        :return: hash of values used to render station diagram
+        """
+        values = station_data.reindex(['Temp', 'Precipitation']).to_numpy(dtype=np.float64)
+        digest = sha256(np.ascontiguousarray(values).tobytes())
+        digest.update(repr((self.y_axis_limits, self.settings)).encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_fresh(self, station: str, key: str, *output_paths: str | Path) -> bool:
+        """Return True if diagram of station is up to date, count cache hits and misses.
+
+        :param station: station name
+        :param key: hash of current station data
+        :param output_paths: paths of diagram files (diagram and its downscaled copies)
+        :return: True if diagram does not have to be rendered again, False otherwise
+        """
+        fresh = self.entries.get(station) == key and all(os.path.exists(path) for path in output_paths)
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return fresh
+
+    def update(self, station: str, key: str) -> None:
+        """Mark diagram of station as rendered for given data.
+
+        :param station: station name
+        :param key: hash of station data
+        """
+        self.entries[station] = key
+
+    def save(self) -> None:
+        """Write manifest file, replace the previous one atomically."""
+        manifest = {
+            'y_axis_limits': self.y_axis_limits,
+            'settings': self.settings,
+            'stations': self.entries
+        }
+        tmp_path = self.path.with_name(f'{self.path.name}.tmp')
+        tmp_path.write_text(json.dumps(manifest, indent=1), encoding='utf-8')
+        os.replace(tmp_path, self.path)
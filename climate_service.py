@@ -0,0 +1,404 @@
+"""
+Long-running local service converting climate data and creating climate diagrams on request.
+Starting a script imports pandas, matplotlib and builds the font cache - for many small requests it takes most
+of the time. The service pays it once: modules stay imported and every worker thread keeps its warm diagram
+template (figure) between jobs.
+
+Service listens on localhost HTTP (127.0.0.1 only), jobs are JSON requests (Content-Type: application/json)
+with the token of the service run in X-Climate-Token header:
+    POST /convert {"input_path": ..., "output_path": ..., "target_unit": "C_mm", "skip_invalid": false}
+    POST /render {"data_path": ..., "settings": {"dpi": 600, "file_format": "jpg", "backend": "matplotlib",
+                  "output_dir": ..., "pyramid": []}, "use_cache": true, "skip_invalid": false}
+    GET /status
+Response is JSON with paths of output files: {"outputs": [...], "errors": {station: error}},
+or {"error": ...} with HTTP status 400 (bad request), 403 (wrong token), 404 (unknown job), 415 (not JSON request),
+422 (invalid data), 500 (job failed).
+Token is generated for every run of the service and saved into ~/.climate_service/PORT.token, readable only
+by the user - clients of the user read it, other local users and web pages (simple cross-site POST requests
+are not JSON and have no token) can not submit jobs writing files.
+Jobs are run by a pool of worker threads, at most WORKERS jobs at once, next jobs wait in queue.
+Paths are used as given - client sends absolute paths.
+
+Usage:
+    python climate_service.py serve [-p PORT] [-w WORKERS]
+    python climate_service.py convert -i INPUT -o OUTPUT -t TARGET_UNIT [-p PORT] [--skip-invalid]
+    python climate_service.py render DATA_PATH [-p PORT] [-b BACKEND] [-f FORMAT] [-d DPI] [--output-dir OUTPUT_DIR]
+                                     [--pyramid DPI [DPI ...]] [--no-cache] [--skip-invalid]
+"""
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer
+)
+from pathlib import Path
+from typing import Callable
+from urllib.error import (
+    HTTPError,
+    URLError
+)
+from urllib.request import (
+    Request,
+    urlopen
+)
+import argparse
+import hmac
+import inspect
+import json
+import os
+import secrets
+import sys
+import threading
+
+from climate_data_unit_converter import convert_file
+from climate_dataset import ClimateDataset
+from climate_diagram_generator import (
+    BACKEND_FORMATS,
+    DATA_DTYPE,
+    RenderSettings,
+    YAxisLimits,
+    add_render_arguments,
+    create_diagrams,
+    diagram_paths,
+    get_render_settings,
+    get_template
+)
+from climate_validation import (
+    InvalidDataError,
+    get_valid_data,
+    load_unchecked_data
+)
+
+HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+TOKEN_DIR = Path.home() / '.climate_service'
+TOKEN_HEADER = 'X-Climate-Token'
+
+_path_locks: defaultdict[str, threading.Lock] = defaultdict(threading.Lock)
+_path_locks_guard = threading.Lock()
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(description='Local service converting climate data and creating diagrams')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Run service')
+    serve_parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT,
+                              help=f'Port of service, default {DEFAULT_PORT}')
+    serve_parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                              help='Max number of jobs run at once, default number of CPUs')
+
+    convert_parser = subparsers.add_parser('convert', help='Convert data file by running service')
+    convert_parser.add_argument('-i', '--input', type=str, required=True, help='Path to input data file')
+    convert_parser.add_argument('-o', '--output', type=str, required=True, help='Path to output data file')
+    convert_parser.add_argument('-t', '--target-unit', type=str, required=True, choices=['C_mm', 'F_inch'],
+                                help='Target unit, C_mm for Celsius, millimeters, F_inch - Fahrenheit, inches')
+
+    render_parser = subparsers.add_parser('render', help='Create diagrams of data file by running service')
+    render_parser.add_argument('data_path', type=str, help='Path to climate data file')
+    add_render_arguments(render_parser, workers=False)
+
+    for client_parser in (convert_parser, render_parser):
+        client_parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT,
+                                   help=f'Port of service, default {DEFAULT_PORT}')
+        client_parser.add_argument('--skip-invalid', action='store_true',
+                                   help='Skip invalid stations instead of failing the job')
+
+    args_ = parser.parse_args()
+    if args_.command == 'render':
+        args_.settings = get_render_settings(render_parser, args_)
+    return args_
+
+
+class path_locks:  # pylint: disable=invalid-name
+    """Context manager holding locks of paths, jobs using the same files (snapshot, cache manifest) are run one
+    after another. Locks are acquired in sorted order of paths, so jobs can not deadlock."""
+
+    def __init__(self, *paths: str) -> None:
+        """
+        :param paths: paths of files or directories used by job
+        """
+        with _path_locks_guard:
+            self.locks = [_path_locks[path] for path in sorted({os.path.abspath(path) for path in paths})]
+        self.stack = ExitStack()
+
+    def __enter__(self) -> 'path_locks':
+        for lock in self.locks:
+            self.stack.enter_context(lock)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stack.close()
+
+
+def convert_job(input_path: str, output_path: str, target_unit: str, skip_invalid: bool = False) -> dict:
+    """Convert data file.
+
+    :param input_path: path to the input data file
+    :param output_path: path to the output data file
+    :param target_unit: unit to which input data will be converted
+    :param skip_invalid: skip invalid stations, by default InvalidDataError is raised
+    :return: result of job - output paths
+    """
+    with path_locks(input_path, output_path):
+        convert_file(input_path, output_path, target_unit, skip_invalid=skip_invalid)
+    return {'outputs': [output_path], 'errors': {}}
+
+
+def get_settings(settings: dict) -> RenderSettings:
+    """Return render settings of job request.
+
+    :param settings: fields of RenderSettings
+    :return: render settings
+    :raise TypeError: if settings are not an object, field is unknown or its value is of wrong type
+    :raise ValueError: if format is not supported by backend or pyramid resolutions are not lower than dpi
+    """
+    if not isinstance(settings, dict):
+        raise TypeError('settings have to be an object')
+    if not isinstance(settings.get('pyramid', ()), (list, tuple)):
+        raise TypeError('pyramid has to be a list')
+    settings = RenderSettings(**{**settings, 'pyramid': tuple(settings.get('pyramid', ()))})
+    for field, value in settings._asdict().items():
+        default = RenderSettings._field_defaults[field]  # pylint: disable=no-member
+        if not isinstance(value, type(default)) or isinstance(value, bool):
+            raise TypeError(f'{field} has to be {type(default).__name__}, not {type(value).__name__}')
+    if not all(isinstance(dpi, int) and not isinstance(dpi, bool) for dpi in settings.pyramid):
+        raise TypeError('pyramid has to be a list of int')
+    if settings.file_format not in BACKEND_FORMATS.get(settings.backend, ()):
+        raise ValueError(f'format {settings.file_format} not supported by backend {settings.backend}')
+    if settings.pyramid and settings.file_format == 'svg':
+        raise ValueError('pyramid of diagrams is available only for raster formats')
+    if any(dpi >= settings.dpi or dpi <= 0 for dpi in settings.pyramid):
+        raise ValueError(f'resolutions of pyramid have to be lower than diagram resolution {settings.dpi}')
+    return settings
+
+
+def render_job(data_path: str, settings: dict, use_cache: bool = True, skip_invalid: bool = False) -> dict:
+    """Create diagrams of all stations of data file with the template of the current worker thread.
+
+    :param data_path: path to data file
+    :param settings: render settings, fields of RenderSettings
+    :param use_cache: skip stations which data has not changed since diagrams were created in previous job
+    :param skip_invalid: skip invalid stations, by default InvalidDataError is raised
+    :return: result of job - paths of diagrams (created now or up to date), errors of failed stations
+    """
+    settings = get_settings(settings)
+    with path_locks(data_path, settings.output_dir):
+        climate_data = ClimateDataset.from_frame(get_valid_data(load_unchecked_data(data_path, DATA_DTYPE),
+                                                                DATA_DTYPE, skip_invalid=skip_invalid))
+        results = create_diagrams(climate_data, settings, use_cache=use_cache, keep_template=True)
+    errors = {result.station: result.error for result in results if result.error}
+    outputs = [path for station in climate_data.stations if station not in errors
+               for path in diagram_paths(station, settings)]
+    return {'outputs': outputs, 'errors': errors}
+
+
+JOBS: dict[str, Callable[..., dict]] = {'/convert': convert_job, '/render': render_job}
+
+
+def check_params(job: Callable[..., dict], params: dict) -> None:
+    """Check parameters of job before it is run, so wrong request is bad request, not error of job.
+
+    :param job: job function
+    :param params: parameters of job
+    :raise TypeError: if parameters do not match job or settings are of wrong type
+    :raise ValueError: if settings are not valid
+    """
+    arguments = inspect.signature(job).bind(**params).arguments
+    if 'settings' in arguments:
+        get_settings(arguments['settings'])
+
+
+def get_token_path(port: int) -> Path:
+    """Return path of file with token of service.
+
+    :param port: port of service
+    :return: path of token file
+    """
+    return TOKEN_DIR / f'{port}.token'
+
+
+def save_token(port: int, token: str) -> None:
+    """Save token of service into file readable only by the user.
+
+    :param port: port of service
+    :param token: token of service run
+    """
+    TOKEN_DIR.mkdir(mode=0o700, exist_ok=True)
+    token_path = get_token_path(port)
+    token_path.unlink(missing_ok=True)  # file of previous run could have other permissions
+    fd = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with open(fd, 'w', encoding='ascii') as f:
+        f.write(token)
+
+
+def read_token(port: int) -> str | None:
+    """Return token of service running on port.
+
+    :param port: port of service
+    :return: token, None if token file does not exist (service is not running)
+    """
+    try:
+        return get_token_path(port).read_text(encoding='ascii').strip()
+    except OSError:
+        return None
+
+
+def warm_up() -> None:
+    """Create diagram template of worker thread, so the first job does not wait for figure and font cache."""
+    get_template(YAxisLimits(tmin=-10, tmax=30, pmax=100))
+
+
+class JobHandler(BaseHTTPRequestHandler):
+    """Handle job requests: run job in worker pool of the server and wait for its result"""
+    server: 'ClimateService'
+
+    def send_json(self, status: int, body: dict) -> None:
+        """Send JSON response.
+
+        :param status: HTTP status code
+        :param body: response body
+        """
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Return status of service."""
+        if self.path != '/status':
+            self.send_json(404, {'error': f'Unknown path: {self.path}'})
+            return
+        self.send_json(200, {'workers': self.server.workers, 'jobs': self.server.jobs})
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Run job."""
+        job = JOBS.get(self.path)
+        if job is None:
+            self.send_json(404, {'error': f'Unknown job: {self.path}'})
+            return
+        if self.headers.get_content_type() != 'application/json':
+            self.send_json(415, {'error': 'Content-Type has to be application/json'})
+            return
+        if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, '').encode('utf-8'),
+                                   self.server.token.encode('utf-8')):
+            self.send_json(403, {'error': f'Missing or wrong token, see {TOKEN_HEADER} header'})
+            return
+        try:
+            params = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            check_params(job, params)
+        except (ValueError, TypeError) as e:
+            self.send_json(400, {'error': f'Invalid request: {e}'})
+            return
+        try:
+            result = self.server.executor.submit(job, **params).result()
+        except InvalidDataError as e:
+            self.send_json(422, {'error': str(e)})
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.send_json(500, {'error': f'{type(e).__name__}: {e}'})
+        else:
+            with self.server.jobs_lock:  # requests are handled in parallel threads
+                self.server.jobs += 1
+            self.send_json(200, result)
+
+
+class ClimateService(ThreadingHTTPServer):
+    """HTTP server running jobs in pool of worker threads"""
+    daemon_threads = True
+
+    def __init__(self, port: int = DEFAULT_PORT, workers: int = 1) -> None:
+        """
+        :param port: port on localhost, 0 - any free port
+        :param workers: max number of jobs run at once
+        """
+        super().__init__((HOST, port), JobHandler)
+        self.workers = workers
+        self.token = secrets.token_urlsafe(32)  # required in job requests, see save_token
+        self.jobs = 0  # number of finished jobs
+        self.jobs_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='climate-job',
+                                           initializer=warm_up)
+
+    def server_close(self) -> None:
+        """Stop worker pool and close server socket."""
+        self.executor.shutdown()
+        super().server_close()
+
+
+def submit_job(job: str, params: dict, port: int = DEFAULT_PORT, timeout: float | None = None,
+               token: str | None = None) -> dict:
+    """Send job to service and wait for its result.
+
+    :param job: job name, convert or render
+    :param params: parameters of job
+    :param port: port of service
+    :param timeout: max time (seconds) of waiting for result, None - no limit
+    :param token: token of service run, if not set - read from token file saved by service
+    :return: result of job
+    :raise RuntimeError: if service is not running or job failed
+    """
+    token = token or read_token(port) or ''
+    request = Request(f'http://{HOST}:{port}/{job}', data=json.dumps(params).encode('utf-8'),
+                      headers={'Content-Type': 'application/json', TOKEN_HEADER: token}, method='POST')
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except HTTPError as e:
+        raise RuntimeError(json.loads(e.read()).get('error', e.reason)) from e
+    except URLError as e:
+        raise RuntimeError(f'Service not available on port {port}: {e.reason}') from e
+
+
+def serve(port: int = DEFAULT_PORT, workers: int = 1) -> None:
+    """Run service until interrupted.
+
+    :param port: port on localhost
+    :param workers: max number of jobs run at once
+    """
+    with ClimateService(port, workers) as service:
+        port = service.server_address[1]
+        save_token(port, service.token)
+        print(f'Climate service listening on http://{HOST}:{port}, {workers} worker(s), '
+              f'token saved to {get_token_path(port)}')
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            print('Climate service stopped')
+        finally:
+            get_token_path(port).unlink(missing_ok=True)
+
+
+def main(args_: argparse.Namespace) -> None:
+    """Run service or send job to it and print paths of output files.
+
+    :param args_: parsed arguments
+    """
+    if args_.command == 'serve':
+        serve(args_.port, args_.workers)
+        return
+
+    if args_.command == 'convert':
+        params = {'input_path': os.path.abspath(args_.input), 'output_path': os.path.abspath(args_.output),
+                  'target_unit': args_.target_unit, 'skip_invalid': args_.skip_invalid}
+    else:
+        settings = args_.settings._replace(output_dir=os.path.abspath(args_.settings.output_dir))
+        params = {'data_path': os.path.abspath(args_.data_path), 'settings': settings._asdict(),
+                  'use_cache': not args_.no_cache, 'skip_invalid': args_.skip_invalid}
+    try:
+        result = submit_job(args_.command, params, args_.port)
+    except RuntimeError as e:
+        sys.exit(f'{e}')
+    for path in result['outputs']:
+        print(path)
+    for station, error in result['errors'].items():
+        print(f'Failed to create diagram for {station}: {error}', file=sys.stderr)
+    if result['errors']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main(parse_args())
@@ -0,0 +1,214 @@
+"""
+Script to compute climate statistics of stations: annual mean temperature, minimum, maximum monthly temperature,
+amplitude of temperature, annual precipitation, driest and wettest month and Köppen-Geiger climate class.
+Statistics of all stations are computed at once on stations x 12 matrices of temperature and precipitation.
+
+Köppen-Geiger classification follows Peel et al. (2007), with 0 °C threshold between C and D climates.
+Data has no latitude, summer is the warmer half-year: April - September or October - March.
+
+Input data format is the same as for climate_diagram_generator (temperature in Celsius degrees,
+precipitation in mm):
+Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
+Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73
+
+Output file (CSV, separator semicolon):
+Station;MeanTemp;MinTemp;MaxTemp;TempAmplitude;SumPrecip;DriestMonth;WettestMonth;Koppen
+Sydney;18.8;13.4;23.5;10.1;1147.1;Sep;Jun;Cfa
+"""
+from typing import NamedTuple
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from climate_data_loader import load_climate_data
+from climate_dataset import ClimateDataset
+
+STATISTICS_COLUMNS = ['MeanTemp', 'MinTemp', 'MaxTemp', 'TempAmplitude', 'SumPrecip', 'DriestMonth',
+                      'WettestMonth', 'Koppen']
+APR_SEP = np.arange(3, 9)  # months of summer half-year in the northern hemisphere
+OCT_MAR = np.array([9, 10, 11, 0, 1, 2])
+
+
+class StationStatistics(NamedTuple):
+    """Keep climate statistics of single station, fields in the order of STATISTICS_COLUMNS"""
+    mean_temp: float
+    min_temp: float
+    max_temp: float
+    temp_amplitude: float
+    sum_precip: float
+    driest_month: str
+    wettest_month: str
+    koppen: str
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(
+        description='Compute climate statistics and Köppen-Geiger climate class of stations'
+    )
+    parser.add_argument('data_path', type=str, help='Path to climate data file')
+    parser.add_argument('-o', '--output', type=str, required=True, help='Path to output statistics file')
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help='Parse data file, do not use (and do not create) its binary snapshot')
+    return parser.parse_args()
+
+
+def to_float64(values: np.ndarray) -> np.ndarray:
+    """Return values as float64 array. Float32 values are converted through their shortest decimal representation
+    (float32 -21.2 is -21.200000762...), so statistics are the same as of float64 values parsed from data file.
+
+    :param values: values of float32, float64 or other numeric type
+    :return: C-contiguous float64 array
+    """
+    values = np.asarray(values)
+    if values.dtype == np.float32:
+        values = values.astype(str)
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def get_matrices(climate_data: pd.DataFrame | ClimateDataset) -> tuple[pd.Index, np.ndarray, np.ndarray]:
+    """Return temperature and precipitation as stations x 12 matrices, rows in the same order of stations.
+    Stations without temperature or precipitation are skipped.
+
+    :param climate_data: data (temperature, precipitation) indexed by station and element or compact data set
+    :return: stations, temperature matrix, precipitation matrix
+    """
+    if not isinstance(climate_data, ClimateDataset):
+        climate_data = ClimateDataset.from_frame(climate_data, np.result_type(*climate_data.dtypes))
+    # rows are contiguous, so row reductions give the same results as for single station (get_annual_values)
+    return climate_data.stations, to_float64(climate_data.temp), to_float64(climate_data.precip)
+
+
+def classify_koppen(temp: np.ndarray, precip: np.ndarray) -> np.ndarray:
+    """Return Köppen-Geiger climate classes.
+
+    :param temp: stations x 12 matrix of monthly temperature (Celsius degrees)
+    :param precip: stations x 12 matrix of monthly precipitation (mm)
+    :return: array of climate classes, e.g. Cfb
+    """
+    mean_temp = temp.mean(axis=1)
+    sum_precip = precip.sum(axis=1)
+    t_hot = temp.max(axis=1)
+    t_cold = temp.min(axis=1)
+    warm_months = (temp > 10).sum(axis=1)
+
+    summer_apr_sep = temp[:, APR_SEP].mean(axis=1) >= temp[:, OCT_MAR].mean(axis=1)
+    p_summer = np.where(summer_apr_sep[:, None], precip[:, APR_SEP], precip[:, OCT_MAR])
+    p_winter = np.where(summer_apr_sep[:, None], precip[:, OCT_MAR], precip[:, APR_SEP])
+    sum_summer = p_summer.sum(axis=1)
+    sum_winter = p_winter.sum(axis=1)
+    p_threshold = np.select([sum_winter >= 0.7 * sum_precip, sum_summer >= 0.7 * sum_precip],
+                            [2 * mean_temp, 2 * mean_temp + 28], 2 * mean_temp + 14)
+
+    arid = np.where(sum_precip < 5 * p_threshold, 'BW', 'BS')
+    arid = np.char.add(arid, np.where(mean_temp >= 18, 'h', 'k'))
+    polar = np.where(t_hot > 0, 'ET', 'EF')
+    p_dry = precip.min(axis=1)
+    tropical = np.select([p_dry >= 60, p_dry >= 100 - sum_precip / 25], ['Af', 'Am'], 'Aw')
+
+    p_summer_dry = p_summer.min(axis=1)
+    precip_type = np.select(
+        [(p_summer_dry < 40) & (p_summer_dry < p_winter.max(axis=1) / 3),
+         p_winter.min(axis=1) < p_summer.max(axis=1) / 10],
+        ['s', 'w'], 'f'
+    )
+    temp_type = np.select([t_hot >= 22, warm_months >= 4, t_cold < -38], ['a', 'b', 'd'], 'c')
+    temperate = np.char.add(np.char.add(np.where(t_cold > 0, 'C', 'D'), precip_type), temp_type)
+
+    return np.select([t_hot < 10, sum_precip < 10 * p_threshold, t_cold >= 18],
+                     [polar, arid, tropical], temperate)
+
+
+def compute_columns(temp: np.ndarray, precip: np.ndarray, months: np.ndarray) -> dict[str, np.ndarray]:
+    """Return climate statistics computed on matrices, temperature and precipitation are rounded to 0.1.
+
+    :param temp: stations x 12 matrix of monthly temperature (Celsius degrees)
+    :param precip: stations x 12 matrix of monthly precipitation (mm)
+    :param months: names of months (columns of matrices)
+    :return: statistics, key - column name as in STATISTICS_COLUMNS, value - array with value for every station
+    """
+    min_temp = temp.min(axis=1)
+    max_temp = temp.max(axis=1)
+    return {
+        'MeanTemp': np.round(temp.mean(axis=1), 1),
+        'MinTemp': np.round(min_temp, 1),
+        'MaxTemp': np.round(max_temp, 1),
+        'TempAmplitude': np.round(max_temp - min_temp, 1),
+        'SumPrecip': np.round(precip.sum(axis=1), 1),
+        'DriestMonth': months[precip.argmin(axis=1)],
+        'WettestMonth': months[precip.argmax(axis=1)],
+        'Koppen': classify_koppen(temp, precip)
+    }
+
+
+def compute_statistics(climate_data: pd.DataFrame | ClimateDataset) -> pd.DataFrame:
+    """Return climate statistics of all stations.
+
+    :param climate_data: data (temperature, precipitation) indexed by station and element or compact data set
+    :return: data frame indexed by station, columns as in STATISTICS_COLUMNS
+    """
+    stations, temp, precip = get_matrices(climate_data)
+    months = climate_data.months if isinstance(climate_data, ClimateDataset) else climate_data.columns
+    return pd.DataFrame(compute_columns(temp, precip, np.asarray(months)), index=stations)
+
+
+def get_station_statistics(station_data: pd.DataFrame) -> StationStatistics:
+    """Return climate statistics of single station, computed as for the whole data set.
+
+    :param station_data: data (temperature, precipitation) for single station
+    :return: statistics of station
+    """
+    temp = to_float64(station_data.loc['Temp'].to_numpy())[np.newaxis]
+    precip = to_float64(station_data.loc['Precipitation'].to_numpy())[np.newaxis]
+    columns = compute_columns(temp, precip, np.asarray(station_data.columns))
+    return StationStatistics(*(columns[column].tolist()[0] for column in STATISTICS_COLUMNS))
+
+
+def get_annual_values(station_data: pd.DataFrame) -> tuple[float, float]:
+    """Return annual mean temperature and sum of precipitation of single station, as in compute_statistics.
+    Used to title diagrams of stations without precomputed statistics.
+
+    :param station_data: data (temperature, precipitation) for single station
+    :return: mean temperature, sum of precipitation, rounded to 0.1
+    """
+    temp = to_float64(station_data.loc['Temp'].to_numpy())
+    precip = to_float64(station_data.loc['Precipitation'].to_numpy())
+    return np.round(temp.mean(), 1), np.round(precip.sum(), 1)
+
+
+def iter_statistics(statistics: pd.DataFrame):
+    """Yield statistics of stations one by one.
+
+    :param statistics: statistics of stations, see compute_statistics
+    :return: tuples (station name, statistics of station)
+    """
+    for station, *values in statistics.itertuples(name=None):
+        yield station, StationStatistics(*values)
+
+
+def save_statistics(statistics: pd.DataFrame, output_path: str) -> None:
+    """Save statistics into CSV file with separator semicolon.
+
+    :param statistics: statistics of stations, see compute_statistics
+    :param output_path: path to output file
+    """
+    statistics.to_csv(output_path, sep=';', index_label='Station')
+
+
+def main(data_path: str, output_path: str, use_snapshot: bool = True) -> None:
+    """Compute statistics of stations and save them.
+
+    :param data_path: path to data file
+    :param output_path: path to output statistics file
+    :param use_snapshot: load data from binary snapshot of data file, create it if needed
+    """
+    statistics = compute_statistics(load_climate_data(data_path, np.float64, use_snapshot))
+    save_statistics(statistics, output_path)
+    print(f'Statistics of {len(statistics)} station(s) saved to {output_path}')
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    main(args.data_path, args.output, not args.no_snapshot)
@@ -0,0 +1,332 @@
+"""
+Script to validate climate data file - all rows are checked at once, instead of failing on the first invalid station
+in the middle of conversion or creating diagrams. Checks:
+    - missing_element - station without temperature or precipitation row
+    - duplicate - station with more than one row of the same element
+    - non_numeric - value which is not a number
+    - missing_value - empty value
+    - out_of_range - physically impossible value: temperature outside -100..100 °C (-148..212 °F),
+      precipitation below zero
+Stations with issues are invalid. climate_data_unit_converter and climate_diagram_generator stop if data is invalid,
+with --skip-invalid they skip invalid stations.
+
+Input data format is the same as for climate_diagram_generator and climate_data_unit_converter:
+Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
+Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73
+
+Output report file (CSV, separator semicolon), Months - months with invalid values:
+Station;Element;Check;Months
+Warsaw;Precipitation;missing_element;
+Sydney;Temp;non_numeric;Mar
+"""
+from pathlib import Path
+from typing import (
+    Iterable,
+    NamedTuple
+)
+import argparse
+import csv
+import sys
+
+import numpy as np
+import pandas as pd
+
+from climate_data_loader import (
+    load_climate_data,
+    read_climate_csv
+)
+from climate_data_stream import (
+    ELEMENTS,
+    read_chunks
+)
+
+VALUE_RANGES = {  # unit: {element: (min, max)}
+    'C_mm': {'Temp': (-100, 100), 'Precipitation': (0, np.inf)},
+    'F_inch': {'Temp': (-148, 212), 'Precipitation': (0, np.inf)}
+}
+
+
+class ValidationIssue(NamedTuple):
+    """Keep single issue of station data"""
+    station: str
+    element: str
+    check: str  # missing_element, duplicate, non_numeric, missing_value, out_of_range
+    months: str = ''  # months with invalid values, separated by space
+
+
+class ValidationReport(NamedTuple):
+    """Keep result of data validation"""
+    rows: int
+    stations: int
+    issues: list[ValidationIssue]
+
+    @property
+    def invalid_stations(self) -> list[str]:
+        """Return stations with issues, in the order of issues."""
+        return list(dict.fromkeys(issue.station for issue in self.issues))
+
+
+class InvalidDataError(ValueError):
+    """Raised if data has invalid stations and they are not skipped"""
+
+    def __init__(self, report: ValidationReport) -> None:
+        self.report = report
+        stations = report.invalid_stations
+        listed = ', '.join(stations[:5]) + (', ...' if len(stations) > 5 else '')
+        super().__init__(f'{len(stations)} invalid station(s): {listed}, use --skip-invalid to skip them')
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(description='Validate climate data file')
+    parser.add_argument('data_path', type=str, help='Path to climate data file')
+    parser.add_argument('-u', '--unit', type=str, default='C_mm', choices=list(VALUE_RANGES),
+                        help='Unit of data, C_mm for Celsius, millimeters (default), F_inch - Fahrenheit, inches')
+    parser.add_argument('-c', '--chunk-size', type=int,
+                        help='Read data file in chunks of CHUNK_SIZE rows, for data files larger than memory')
+    parser.add_argument('-o', '--output', type=str, help='Path to report file with all issues (CSV)')
+    return parser.parse_args()
+
+
+def get_row_issues(
+        index: pd.MultiIndex,
+        columns: pd.Index,
+        mask: np.ndarray,
+        check: str
+) -> list[ValidationIssue]:
+    """Return issues of rows with invalid values.
+
+    :param index: station, element of rows
+    :param columns: names of months
+    :param mask: rows x months matrix, True - invalid value
+    :param check: name of check
+    :return: issue for every row with at least one invalid value
+    """
+    return [ValidationIssue(*index[row], check, ' '.join(columns[mask[row]]))
+            for row in np.flatnonzero(mask.any(axis=1))]
+
+
+def check_values(climate_data: pd.DataFrame, unit: str = 'C_mm') -> list[ValidationIssue]:
+    """Return issues of values: non-numeric, missing and out of range values.
+
+    :param climate_data: data indexed by station and element, values as parsed from data file
+    :param unit: unit of data, C_mm or F_inch
+    :return: issues of values
+    """
+    missing = climate_data.isna().to_numpy()
+    if all(pd.api.types.is_numeric_dtype(dtype) for dtype in climate_data.dtypes):
+        values = climate_data.to_numpy(dtype=np.float64)
+        non_numeric = np.zeros_like(missing)
+    else:
+        values = climate_data.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+        non_numeric = np.isnan(values) & ~missing
+
+    elements = climate_data.index.get_level_values('Element')
+    out_of_range = np.zeros_like(missing)
+    with np.errstate(invalid='ignore'):
+        for element, (vmin, vmax) in VALUE_RANGES[unit].items():
+            rows = elements == element
+            out_of_range[rows] = (values[rows] < vmin) | (values[rows] > vmax)
+
+    return [issue for mask, check in ((non_numeric, 'non_numeric'), (missing, 'missing_value'),
+                                      (out_of_range, 'out_of_range'))
+            for issue in get_row_issues(climate_data.index, climate_data.columns, mask, check)]
+
+
+class ElementPresence:
+    """Track elements present at every station while rows are added (e.g. chunk by chunk).
+    Only bitmask of elements per station is kept - memory depends on number of stations, not on number of rows."""
+
+    def __init__(self) -> None:
+        self.present: dict[str, int] = {}  # station: bitmask of elements with a row
+        self.duplicated: dict[str, int] = {}  # station: bitmask of elements with more than one row
+
+    def add(self, index: pd.MultiIndex) -> None:
+        """Add rows.
+
+        :param index: station, element of rows
+        """
+        element_codes = pd.Index(ELEMENTS).get_indexer(index.get_level_values('Element'))
+        known = element_codes >= 0
+        bits = np.where(known, np.left_shift(1, np.maximum(element_codes, 0)), 0)
+        codes, stations = pd.factorize(index.get_level_values('Station'), sort=False)
+        added = np.zeros(len(stations), dtype=np.int64)
+        np.bitwise_or.at(added, codes, bits)
+        repeated = np.zeros(len(stations), dtype=np.int64)
+        rows = index.duplicated() & known
+        np.bitwise_or.at(repeated, codes[rows], bits[rows])
+
+        for station, station_added, station_repeated in zip(stations, added.tolist(), repeated.tolist()):
+            present = self.present.get(station, 0)
+            self.present[station] = present | station_added
+            if station_repeated or present & station_added:
+                self.duplicated[station] = self.duplicated.get(station, 0) | station_repeated | present & station_added
+
+    def issues(self) -> list[ValidationIssue]:
+        """Return issues of stations: duplicated rows and missing elements.
+
+        :return: issues of stations
+        """
+        issues = [ValidationIssue(station, element, 'duplicate') for station, mask in self.duplicated.items()
+                  for bit, element in enumerate(ELEMENTS) if mask >> bit & 1]
+        for bit, element in enumerate(ELEMENTS):
+            issues += [ValidationIssue(station, element, 'missing_element') for station, mask in self.present.items()
+                       if not mask >> bit & 1]
+        return issues
+
+
+def check_structure(index: pd.MultiIndex) -> list[ValidationIssue]:
+    """Return issues of stations: missing elements and duplicated rows.
+
+    :param index: station, element of all rows of data
+    :return: issues of stations
+    """
+    presence = ElementPresence()
+    presence.add(index)
+    return presence.issues()
+
+
+def validate_climate_data(climate_data: pd.DataFrame, unit: str = 'C_mm') -> ValidationReport:
+    """Return report of validation of data.
+
+    :param climate_data: data indexed by station and element, values as parsed from data file
+    :param unit: unit of data, C_mm or F_inch
+    :return: validation report
+    """
+    issues = check_structure(climate_data.index) + check_values(climate_data, unit)
+    return ValidationReport(len(climate_data), climate_data.index.unique(level='Station').size, issues)
+
+
+def validate_chunks(chunks: Iterable[pd.DataFrame], unit: str = 'C_mm') -> ValidationReport:
+    """Return report of validation of data read in chunks.
+    Values are checked chunk by chunk, stations are checked with elements present at them (see ElementPresence),
+    rows of chunks are not kept.
+
+    :param chunks: data frames indexed by station and element, values as parsed from data file
+    :param unit: unit of data, C_mm or F_inch
+    :return: validation report
+    """
+    issues = []
+    presence = ElementPresence()
+    rows = 0
+    for chunk in chunks:
+        issues += check_values(chunk, unit)
+        presence.add(chunk.index)
+        rows += len(chunk)
+    return ValidationReport(rows, len(presence.present), presence.issues() + issues)
+
+
+def validate_file(data_path: str, unit: str = 'C_mm', chunk_size: int | None = None) -> ValidationReport:
+    """Return report of validation of data file.
+
+    :param data_path: path to data file
+    :param unit: unit of data, C_mm or F_inch
+    :param chunk_size: if set, read data file in chunks of that many rows instead of loading it at once
+    :return: validation report
+    """
+    if chunk_size:
+        return validate_chunks(read_chunks(data_path, chunk_size), unit)
+    return validate_climate_data(read_climate_csv(data_path), unit)
+
+
+def format_report(report: ValidationReport, max_issues: int = 10) -> str:
+    """Return summary of validation report.
+
+    :param report: validation report
+    :param max_issues: max number of listed issues
+    :return: text with number of invalid stations and the first issues
+    """
+    lines = [f'{len(report.invalid_stations)} of {report.stations} station(s) invalid, '
+             f'{len(report.issues)} issue(s) found']
+    for issue in report.issues[:max_issues]:
+        months = f' ({issue.months})' if issue.months else ''
+        lines.append(f'  {issue.station}, {issue.element}: {issue.check}{months}')
+    if len(report.issues) > max_issues:
+        lines.append(f'  ... {len(report.issues) - max_issues} more issue(s)')
+    return '\n'.join(lines)
+
+
+def save_report(report: ValidationReport, output_path: str | Path) -> None:
+    """Save all issues of validation report into CSV file with separator semicolon.
+
+    :param report: validation report
+    :param output_path: path to report file
+    """
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['Station', 'Element', 'Check', 'Months'])
+        writer.writerows(report.issues)
+
+
+def check_report(report: ValidationReport, skip_invalid: bool = False) -> list[str]:
+    """Print summary of report if data is invalid, raise InvalidDataError if invalid stations are not skipped.
+
+    :param report: validation report
+    :param skip_invalid: skip invalid stations instead of raising error
+    :return: stations to skip
+    """
+    if not report.issues:
+        return []
+    print(format_report(report))
+    if not skip_invalid:
+        raise InvalidDataError(report)
+    print(f'{len(report.invalid_stations)} invalid station(s) skipped')
+    return report.invalid_stations
+
+
+def load_unchecked_data(data_path: str | Path, dtype: np.dtype, use_snapshot: bool = True) -> pd.DataFrame:
+    """Return climate data to validate: values of dtype or, if some of values are not numbers, values as parsed.
+
+    :param data_path: path to data file
+    :param dtype: type of values
+    :param use_snapshot: load data from snapshot (create it if it does not exist or is stale)
+    :return: data frame indexed by station and element
+    """
+    try:
+        return load_climate_data(data_path, dtype, use_snapshot)
+    except ValueError:  # values which are not numbers are reported by validation
+        return read_climate_csv(data_path)
+
+
+def get_valid_data(
+        climate_data: pd.DataFrame,
+        dtype: np.dtype,
+        unit: str = 'C_mm',
+        skip_invalid: bool = False
+) -> pd.DataFrame:
+    """Return validated data, see check_report.
+
+    :param climate_data: data indexed by station and element, see load_unchecked_data
+    :param dtype: type of values of returned data
+    :param unit: unit of data, C_mm or F_inch
+    :param skip_invalid: skip invalid stations instead of raising InvalidDataError
+    :return: data of valid stations
+    """
+    invalid = check_report(validate_climate_data(climate_data, unit), skip_invalid)
+    if invalid:
+        climate_data = climate_data[~climate_data.index.get_level_values('Station').isin(invalid)]
+    return climate_data.astype(dtype)
+
+
+def main(data_path: str, unit: str = 'C_mm', chunk_size: int | None = None, output_path: str | None = None) -> bool:
+    """Validate data file, print summary and save report.
+
+    :param data_path: path to data file
+    :param unit: unit of data, C_mm or F_inch
+    :param chunk_size: if set, read data file in chunks of that many rows instead of loading it at once
+    :param output_path: if set, save all issues into this report file
+    :return: True if data is valid
+    """
+    report = validate_file(data_path, unit, chunk_size)
+    print(format_report(report))
+    if output_path:
+        save_report(report, output_path)
+        print(f'Report saved to {output_path}')
+    return not report.issues
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if not main(args.data_path, args.unit, args.chunk_size, args.output):
+        sys.exit(1)
@@ -0,0 +1,175 @@
+"""Synthesize Morse code audio and save it as PCM WAV file - works on any system, faster than real time.
+Timing is the same as of morse_encoder.play_morse_code (MORSE_TIMING): dit 70 ms, dah 210 ms, pause 70 ms after
+every dit/dah, 240 ms between letters and 490 ms between words. With --wpm all durations are scaled,
+so that dit lasts 1200 / WPM ms (PARIS standard).
+
+Tone and pause buffers of every character of Morse code are built once, message audio is concatenation
+of character buffers. Tones are shaped with raised-cosine envelope (rise and fall), so keying does not click.
+"""
+from typing import NamedTuple
+import argparse
+import sys
+import wave
+
+import numpy as np
+
+from morse_encoder import (
+    ALLOWED_CHARS_INFO,
+    DIT_MS,
+    MORSE_TIMING,
+    TONE_FREQUENCY,
+    check_message,
+    encode_text
+)
+
+SAMPLE_WIDTH = 2  # bytes, 16-bit PCM
+MAX_AMPLITUDE = np.iinfo(np.int16).max
+
+
+class AudioSettings(NamedTuple):
+    """Keep settings of Morse code audio"""
+    frequency: float = TONE_FREQUENCY  # Hz
+    sample_rate: int = 8000  # Hz
+    wpm: float | None = None  # words per minute, None - timing of play_morse_code (dit 70 ms)
+    ramp_ms: float = 5.0  # raised-cosine rise and fall time of tone, 0 - hard keying
+    volume: float = 0.5  # amplitude as fraction of full scale
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(description="Encode text to Morse code and save it as WAV file")
+    parser.add_argument("-m", "--message", type=str, required=True, help="Message to encode")
+    parser.add_argument("-o", "--output", type=str, required=True, help="Path to output WAV file")
+    parser.add_argument("--wpm", type=float,
+                        help=f"Speed in words per minute, default {1200 / DIT_MS:.1f} (dit {DIT_MS} ms)")
+    parser.add_argument("--frequency", type=float, default=TONE_FREQUENCY,
+                        help=f"Tone frequency (Hz), default {TONE_FREQUENCY}")
+    parser.add_argument("--sample-rate", type=int, default=AudioSettings().sample_rate,
+                        help=f"Sample rate (Hz), default {AudioSettings().sample_rate}")
+    parser.add_argument("--ramp", type=float, default=AudioSettings().ramp_ms,
+                        help=f"Rise and fall time of tone (ms), 0 - hard keying, default {AudioSettings().ramp_ms}")
+    args_ = parser.parse_args()
+    if args_.wpm is not None and args_.wpm <= 0:
+        parser.error("WPM has to be positive")
+    if not 0 < args_.frequency < args_.sample_rate / 2:
+        parser.error("tone frequency has to be lower than half of sample rate")
+    return args_
+
+
+def get_time_scale(settings: AudioSettings) -> float:
+    """Return multiplier of MORSE_TIMING durations.
+
+    :param settings: audio settings
+    :return: multiplier, 1 if WPM is not set
+    """
+    return 1.0 if settings.wpm is None else 1200 / settings.wpm / DIT_MS
+
+
+def to_samples(duration_ms: float, settings: AudioSettings) -> int:
+    """Return number of samples of duration, scaled to WPM of settings.
+
+    :param duration_ms: duration as in MORSE_TIMING (ms)
+    :param settings: audio settings
+    :return: number of samples
+    """
+    return round(duration_ms * get_time_scale(settings) * settings.sample_rate / 1000)
+
+
+def get_envelope(num_samples: int, settings: AudioSettings) -> np.ndarray:
+    """Return raised-cosine envelope of tone: rise, flat top, fall.
+
+    :param num_samples: length of tone (samples)
+    :param settings: audio settings
+    :return: envelope values 0..1
+    """
+    envelope = np.ones(num_samples)
+    ramp = min(round(settings.ramp_ms * settings.sample_rate / 1000), num_samples // 2)
+    if ramp:
+        rise = 0.5 * (1 - np.cos(np.pi * np.arange(ramp) / ramp))
+        envelope[:ramp] = rise
+        envelope[-ramp:] = rise[::-1]
+    return envelope
+
+
+def get_tone(num_samples: int, settings: AudioSettings) -> np.ndarray:
+    """Return tone samples.
+
+    :param num_samples: length of tone (samples)
+    :param settings: audio settings
+    :return: 16-bit PCM samples
+    """
+    t = np.arange(num_samples) / settings.sample_rate
+    tone = np.sin(2 * np.pi * settings.frequency * t) * get_envelope(num_samples, settings)
+    return np.round(tone * settings.volume * MAX_AMPLITUDE).astype(np.int16)
+
+
+def get_char_buffers(settings: AudioSettings) -> dict[str, np.ndarray]:
+    """Return audio of every character of Morse code: tone (dit, dah) followed by pause.
+
+    :param settings: audio settings
+    :return: dictionary, key - character of Morse code, value - 16-bit PCM samples
+    """
+    return {char: np.concatenate((get_tone(to_samples(tone_ms, settings), settings),
+                                  np.zeros(to_samples(pause_ms, settings), dtype=np.int16)))
+            for char, (tone_ms, pause_ms) in MORSE_TIMING.items()}
+
+
+def synthesize(code: str, settings: AudioSettings = AudioSettings()) -> np.ndarray:
+    """Return audio of Morse code.
+
+    :param code: Morse code as returned by encode_text
+    :param settings: audio settings
+    :return: 16-bit PCM samples, mono
+    :raise ValueError: if code has characters other than dits, dahs, spaces and slashes
+    """
+    buffers = get_char_buffers(settings)
+    try:
+        return np.concatenate([buffers[char] for char in code] or [np.zeros(0, dtype=np.int16)])
+    except KeyError as e:
+        raise ValueError(f"Not a Morse code character: {e}") from e
+
+
+def write_wav(path: str, samples: np.ndarray, sample_rate: int) -> None:
+    """Save audio into WAV file.
+
+    :param path: path to WAV file
+    :param samples: 16-bit PCM samples, mono
+    :param sample_rate: sample rate (Hz)
+    """
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(SAMPLE_WIDTH)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.astype("<i2", copy=False).tobytes())
+
+
+def save_morse_audio(code: str, path: str, settings: AudioSettings = AudioSettings()) -> float:
+    """Synthesize Morse code and save it as WAV file.
+
+    :param code: Morse code as returned by encode_text
+    :param path: path to WAV file
+    :param settings: audio settings
+    :return: duration of audio (seconds)
+    """
+    samples = synthesize(code, settings)
+    write_wav(path, samples, settings.sample_rate)
+    return samples.size / settings.sample_rate
+
+
+def main(args_: argparse.Namespace) -> None:
+    """Encode message and save its Morse code audio.
+
+    :param args_: parsed arguments passed to the script
+    """
+    if not check_message(args_.message):
+        sys.exit(ALLOWED_CHARS_INFO)
+    code = encode_text(args_.message)
+    print(code)
+    settings = AudioSettings(args_.frequency, args_.sample_rate, args_.wpm, args_.ramp)
+    duration = save_morse_audio(code, args_.output, settings)
+    print(f"{duration:.1f} s of audio saved to {args_.output}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args)
@@ -0,0 +1,291 @@
+"""Decode Morse code from PCM WAV recording - the reverse of morse_audio, much faster than real time.
+Steps:
+    - tone level of every 5 ms frame: magnitude of DFT bin at carrier frequency (single-bin Goertzel) computed
+      for all frames at once, WAV file is read in blocks
+    - carrier frequency, unless given, is the peak of averaged spectrum of the first block
+    - levels are split into tone on/off by threshold between levels of tone and of silence (2-means)
+    - on/off signal is run-length encoded, runs are measured in dit lengths: dit length is estimated
+      locally (rolling median over neighbouring tones and pauses), so change of speed (WPM drift) is followed
+    - tones are dits or dahs, pauses are gaps between signals, letters or words, with ratios of
+      morse_encoder timing (dit 70 ms, dah 210 ms, pauses 70 ms + 240 ms between letters, + 490 ms between words)
+    - Morse code is decoded to text by morse_decoder
+"""
+from itertools import chain
+from typing import (
+    Iterable,
+    Iterator,
+    NamedTuple
+)
+import argparse
+import sys
+import wave
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from morse_decoder import (
+    INVALID_POLICIES,
+    InvalidSymbolError,
+    SymbolDecoder
+)
+from morse_encoder import (
+    DAH_MS,
+    DIT_MS,
+    MORSE_TIMING
+)
+
+FRAME_MS = 5  # time resolution of tone detection
+BLOCK_FRAMES = 1 << 14  # number of frames read from WAV file at once
+DIT_WINDOW = 15  # number of tones around run of which dit length is estimated
+# durations in dits, pause between letters and between words include pauses after signal and letters around '/'
+DAH_DITS = DAH_MS / DIT_MS
+SIGNAL_GAP_DITS = MORSE_TIMING["."][1] / DIT_MS
+LETTER_GAP_DITS = SIGNAL_GAP_DITS + MORSE_TIMING[" "][1] / DIT_MS
+WORD_GAP_DITS = LETTER_GAP_DITS + (MORSE_TIMING["/"][1] + MORSE_TIMING[" "][1]) / DIT_MS
+# thresholds between durations - geometric means, errors of timing are proportional to duration
+DAH_THRESHOLD = np.sqrt(DAH_DITS)
+LETTER_THRESHOLD = np.sqrt(SIGNAL_GAP_DITS * LETTER_GAP_DITS)
+WORD_THRESHOLD = np.sqrt(LETTER_GAP_DITS * WORD_GAP_DITS)
+
+
+class AudioDecoding(NamedTuple):
+    """Keep result of decoding Morse code audio"""
+    code: str  # Morse code as produced by encode_text
+    text: str
+    frequency: float  # carrier frequency (Hz)
+    wpm: float  # median speed in words per minute (PARIS), 0 if there are no tones
+    duration: float  # duration of audio (seconds)
+    invalid: int = 0  # number of invalid Morse symbols (skipped or replaced)
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(description="Decode Morse code from WAV file")
+    parser.add_argument("wav_path", type=str, help="Path to WAV file (PCM 8, 16 or 32-bit, mono or stereo)")
+    parser.add_argument("--frequency", type=float,
+                        help="Carrier frequency (Hz), by default the strongest frequency of recording")
+    parser.add_argument("-o", "--output", type=str, help="Output file to save decoded text, default standard output")
+    parser.add_argument("--code", action="store_true", help="Print Morse code before decoded text")
+    parser.add_argument("--invalid", type=str, choices=INVALID_POLICIES, default="replace",
+                        help="Handling of invalid symbols: error, skip, replace with U+FFFD (default)")
+    return parser.parse_args()
+
+
+def iter_wav_blocks(wav: wave.Wave_read, block_size: int) -> Iterator[np.ndarray]:
+    """Yield samples of WAV file in blocks, channels are mixed into mono.
+
+    :param wav: opened WAV file
+    :param block_size: number of samples (per channel) in block
+    :return: float32 samples in range -1..1
+    """
+    width = wav.getsampwidth()
+    if width not in (1, 2, 4):
+        raise ValueError(f"Not supported sample width: {8 * width} bits")
+    dtype = {1: np.uint8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}[width]
+    scale = 2.0 ** (8 * width - 1)
+    channels = wav.getnchannels()
+    while data := wav.readframes(block_size):
+        samples = np.frombuffer(data, dtype=dtype).astype(np.float32)
+        if width == 1:  # 8-bit samples are unsigned
+            samples -= 128
+        samples = samples.reshape(-1, channels).mean(axis=1) if channels > 1 else samples
+        yield samples / scale
+
+
+def estimate_frequency(samples: np.ndarray, sample_rate: int, segment_size: int = 2048) -> float:
+    """Return the strongest frequency of audio - peak of spectrum averaged over segments.
+
+    :param samples: audio samples
+    :param sample_rate: sample rate (Hz)
+    :param segment_size: number of samples of segment, resolution of spectrum is sample_rate / segment_size
+    :return: frequency (Hz)
+    """
+    segment_size = min(segment_size, samples.size)
+    segments = samples[:samples.size // segment_size * segment_size].reshape(-1, segment_size)
+    spectrum = np.abs(np.fft.rfft(segments * np.hanning(segment_size), axis=1)).mean(axis=0)
+    spectrum[0] = 0  # DC offset
+    return np.fft.rfftfreq(segment_size, 1 / sample_rate)[spectrum.argmax()]
+
+
+def get_tone_levels(
+        blocks: Iterable[np.ndarray],
+        sample_rate: int,
+        frequency: float,
+        frame_size: int
+) -> np.ndarray:
+    """Return tone level of every frame - magnitude of DFT at carrier frequency (the same as Goertzel algorithm).
+    Frames of block are processed at once as matrix product with cosine and sine of carrier.
+
+    :param blocks: audio samples in blocks, size of block (except the last one) is multiple of frame size
+    :param sample_rate: sample rate (Hz)
+    :param frequency: carrier frequency (Hz)
+    :param frame_size: number of samples of frame
+    :return: tone level of frames, incomplete frame at the end is skipped
+    """
+    phase = 2 * np.pi * frequency / sample_rate * np.arange(frame_size)
+    kernel = np.stack((np.cos(phase), np.sin(phase)), axis=1).astype(np.float32)
+    levels = []
+    for block in blocks:
+        frames = block[:block.size // frame_size * frame_size].reshape(-1, frame_size)
+        levels.append(np.hypot(*(frames @ kernel).T))
+    return np.concatenate(levels) if levels else np.zeros(0, dtype=np.float32)
+
+
+def get_keying(levels: np.ndarray) -> np.ndarray:
+    """Return tone on/off of frames: threshold in the middle between mean level of tone and of silence,
+    single frames different from both neighbours (noise) are flipped.
+
+    :param levels: tone level of frames
+    :return: True - tone on
+    """
+    low, high = np.percentile(levels, [1, 99]) if levels.size else (0, 0)
+    if high - low <= 1e-3 * max(high, 1e-9):  # constant level, no keying
+        return np.zeros(levels.size, dtype=bool)
+    threshold = (low + high) / 2
+    for _ in range(10):  # 2-means of levels
+        on = levels > threshold
+        if on.all() or not on.any():
+            break
+        threshold = (levels[on].mean() + levels[~on].mean()) / 2
+    on = levels > threshold
+    if on.size >= 3:
+        on[1:-1] = sliding_window_view(on, 3).sum(axis=1) >= 2  # majority of 3 frames
+    return on
+
+
+def get_runs(on: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return run-length encoding of on/off signal.
+
+    :param on: tone on/off of frames
+    :return: state (True - tone) and length (frames) of every run
+    """
+    if not on.size:
+        return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(on[1:] != on[:-1]) + 1))
+    return on[starts], np.diff(np.append(starts, on.size))
+
+
+def rolling(values: np.ndarray, window: int, function, **kwargs) -> np.ndarray:
+    """Return function of values in window centered at every value, edges are padded by reflection.
+
+    :param values: 1-D array
+    :param window: odd window size
+    :param function: numpy reduction with axis argument (np.median, np.nanpercentile, ...)
+    :return: result for every value
+    """
+    half = window // 2
+    padded = np.pad(values, half, mode="reflect" if values.size > half else "edge")
+    return function(sliding_window_view(padded, window), axis=1, **kwargs)
+
+
+def get_dit_lengths(states: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Return dit length at every run, estimated from neighbouring runs, so change of speed is followed.
+    Rough estimate is low percentile of tone and pause lengths - dits and pauses between signals are
+    the most common, it is refined by median of dit lengths: dits, dahs / 3, pauses between signals.
+
+    :param states: state (True - tone) of runs, from tone to tone
+    :param lengths: lengths (frames) of runs
+    :return: dit length (frames) at every run
+    """
+    window = 2 * DIT_WINDOW - 1  # tones and pauses between them
+    dits = rolling(lengths.astype(np.float64), window, np.percentile, q=25)
+    for _ in range(2):
+        ratios = lengths / dits
+        units = np.where(states, np.where(ratios >= DAH_THRESHOLD, lengths / DAH_DITS, lengths),
+                         np.where(ratios < LETTER_THRESHOLD, lengths / SIGNAL_GAP_DITS, np.nan))
+        dits = rolling(units, window, np.nanmedian)
+    return dits
+
+
+def runs_to_code(states: np.ndarray, lengths: np.ndarray) -> tuple[str, float]:
+    """Return Morse code of on/off runs.
+
+    :param states: state (True - tone) of runs
+    :param lengths: lengths (frames) of runs
+    :return: Morse code, median dit length (frames), 0 if there are no tones
+    """
+    tones = np.flatnonzero(states)
+    if not tones.size:
+        return "", 0.0
+    states, lengths = states[tones[0]:tones[-1] + 1], lengths[tones[0]:tones[-1] + 1]  # skip silence around
+    ratios = lengths / get_dit_lengths(states, lengths)
+    signals = np.where(ratios[states] >= DAH_THRESHOLD, "_", ".")
+    gaps = ratios[~states]  # pause after every tone but the last one
+    separators = np.select([gaps >= WORD_THRESHOLD, gaps >= LETTER_THRESHOLD], [" / ", " "], "")
+    code = np.char.add(signals, np.append(separators, ""))
+    # threshold shortens tones as much as it lengthens pauses, dit length is mean of both
+    tone_dits = np.where(ratios[states] >= DAH_THRESHOLD, lengths[states] / DAH_DITS, lengths[states])
+    gap_dits = lengths[~states][gaps < LETTER_THRESHOLD] / SIGNAL_GAP_DITS
+    dit = np.median(tone_dits) if not gap_dits.size else (np.median(tone_dits) + np.median(gap_dits)) / 2
+    return "".join(code.tolist()), float(dit)
+
+
+def decode_audio(
+        blocks: Iterable[np.ndarray],
+        sample_rate: int,
+        frequency: float | None = None,
+        policy: str = "replace"
+) -> AudioDecoding:
+    """Decode Morse code audio.
+
+    :param blocks: audio samples in blocks, size of block (except the last one) is multiple of FRAME_MS frame
+    :param sample_rate: sample rate (Hz)
+    :param frequency: carrier frequency (Hz), None - estimated from the first block
+    :param policy: handling of invalid Morse symbols: error, skip, replace
+    :return: decoded Morse code and text
+    :raise InvalidSymbolError: on the first invalid symbol if policy is error
+    """
+    blocks = iter(blocks)
+    first = next(blocks, np.zeros(0, dtype=np.float32))
+    if frequency is None:
+        frequency = estimate_frequency(first, sample_rate) if first.size else 0.0
+    frame_size = max(1, round(sample_rate * FRAME_MS / 1000))
+    levels = get_tone_levels(chain((first,), blocks), sample_rate, frequency, frame_size)
+
+    code, dit = runs_to_code(*get_runs(get_keying(levels)))
+    decoder = SymbolDecoder(policy)
+    text = decoder.decode(code)
+    wpm = 1200 / (dit * frame_size / sample_rate * 1000) if dit else 0.0
+    return AudioDecoding(code, text, frequency, wpm, levels.size * frame_size / sample_rate, decoder.invalid)
+
+
+def decode_wav(path: str, frequency: float | None = None, policy: str = "replace") -> AudioDecoding:
+    """Decode Morse code WAV file, see decode_audio.
+
+    :param path: path to WAV file
+    :param frequency: carrier frequency (Hz), None - estimated from the beginning of recording
+    :param policy: handling of invalid Morse symbols: error, skip, replace
+    :return: decoded Morse code and text
+    """
+    with wave.open(path, "rb") as wav:
+        sample_rate = wav.getframerate()
+        frame_size = max(1, round(sample_rate * FRAME_MS / 1000))
+        return decode_audio(iter_wav_blocks(wav, BLOCK_FRAMES * frame_size), sample_rate, frequency, policy)
+
+
+def main(args_: argparse.Namespace) -> None:
+    """Decode WAV file, print or save decoded text.
+
+    :param args_: parsed arguments passed to the script
+    """
+    try:
+        decoding = decode_wav(args_.wav_path, args_.frequency, args_.invalid)
+    except InvalidSymbolError as e:
+        sys.exit(f"{e}, use --invalid skip or replace to decode recording with it")
+    print(f"{decoding.duration:.1f} s of audio decoded, tone {decoding.frequency:.0f} Hz, {decoding.wpm:.1f} WPM",
+          file=sys.stderr)
+    if decoding.invalid:
+        action = "skipped" if args_.invalid == "skip" else "replaced"
+        print(f"{decoding.invalid} invalid symbol(s) {action}", file=sys.stderr)
+    if args_.code:
+        print(decoding.code)
+    if args_.output:
+        with open(args_.output, "w", encoding="utf-8") as f:
+            f.write(decoding.text)
+    else:
+        print(decoding.text)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args)
@@ -0,0 +1,168 @@
+"""Encode many messages to Morse code at once - library API for bulk jobs, result (or error) for every message.
+Messages of batch are joined with NUL separators and encoded in one pass with lookup array of Morse symbols
+indexed by character code (0-255), characters above 255 are unsupported. Symbols of all characters are gathered
+at once and the output is split at separators. Output of every message is the same as of encode_text: only
+characters of MORSE_SYMBOLS (letters in any case) are supported - line breaks too are unsupported characters,
+and empty or blank (only spaces) message fails as in check_message. Unsupported characters are handled by policy
+as in encode_stream, but with error policy only the message with them fails (no sys.exit).
+
+Huge batches (or iterables of messages) are encoded in shards of BATCH_SIZE messages, optionally in a process pool.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    Iterable,
+    Iterator,
+    NamedTuple
+)
+
+import numpy as np
+
+from morse_encoder import (
+    ERROR_SIGNAL,
+    INVALID_POLICIES,
+    MORSE_SYMBOLS
+)
+
+BATCH_SIZE = 1 << 16  # number of messages encoded at once
+EMPTY_MESSAGE_ERROR = "Empty message"
+
+
+class EncodingResult(NamedTuple):
+    """Keep result of encoding single message of batch"""
+    code: str | None  # Morse code, None if message has unsupported characters and policy is error
+    invalid: int = 0  # number of unsupported characters
+    error: str | None = None
+
+
+class LookupTable(NamedTuple):
+    """Keep Morse symbols of character codes 0-255, every symbol with space before it"""
+    symbols: np.ndarray  # 256 symbols (object array of str), empty for skipped characters, NUL for separator
+    supported: np.ndarray  # 256, True for supported characters
+
+
+def get_lookup_table(policy: str = "error") -> LookupTable:
+    """Return lookup table of encoding, characters of MORSE_SYMBOLS (letters in any case) as in encode_text.
+
+    :param policy: handling of unsupported characters: error, skip, replace (with ERROR_SIGNAL)
+    :return: lookup table
+    """
+    if policy not in INVALID_POLICIES:
+        raise ValueError(f"Not supported policy: {policy}")
+    table = {}
+    for char, symbol in MORSE_SYMBOLS.items():
+        table[ord(char)] = table[ord(char.lower())] = f" {symbol}"
+    replacement = f" {ERROR_SIGNAL}" if policy == "replace" else ""
+    symbols = [table.get(code, replacement) for code in range(256)]
+    symbols[0] = "\0"  # separator of messages
+    return LookupTable(
+        symbols=np.array(symbols, dtype=object),
+        supported=np.array([code in table for code in range(256)])
+    )
+
+
+def get_char_codes(messages: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Return character codes of messages joined with NUL separators, codes above 255 are clipped to 255.
+    NUL characters of messages are replaced by 255 (unsupported), NUL code is only separator of messages.
+    Lone surrogates (e.g. undecodable bytes of file read with surrogateescape) are unsupported characters too.
+
+    :param messages: messages
+    :return: uint8 codes, positions of the first character of every message and of the end of the last one
+    """
+    codes = np.frombuffer("\0".join(messages).encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32)
+    codes = np.minimum(codes, 255).astype(np.uint8)
+    codes[codes == 0] = 255
+    bounds = np.zeros(len(messages) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, messages), dtype=np.int64, count=len(messages)) + 1, out=bounds[1:])
+    codes[bounds[1:-1] - 1] = 0
+    bounds[-1] -= 1  # no separator after the last message
+    return codes, bounds
+
+
+def encode_columns(messages: list[str], policy: str = "error") -> tuple[list, list[int], list]:
+    """Encode batch of messages in one pass, return results as columns (cheap to pass between processes).
+
+    :param messages: messages to encode
+    :param policy: handling of unsupported characters: error (message fails), skip, replace (with ERROR_SIGNAL)
+    :return: Morse code (None for failed message), number of unsupported characters and error of every message
+    """
+    if not messages:
+        return [], [], []
+    table = get_lookup_table(policy)
+    codes, bounds = get_char_codes(messages)
+    # the first character of message output is space before its first symbol
+    results = [code[1:] for code in "".join(table.symbols[codes].tolist()).split("\0")]
+    invalid = [0] * len(messages)
+    errors = [None] * len(messages)
+
+    spaces = np.add.reduceat(np.append(codes == ord(" "), False), bounds[:-1], dtype=np.int64)  # last may be empty
+    lengths = np.fromiter(map(len, messages), dtype=np.int64, count=len(messages))
+    for i in np.flatnonzero(spaces == lengths).tolist():  # empty or blank message
+        results[i] = None
+        errors[i] = EMPTY_MESSAGE_ERROR
+
+    unsupported = ~table.supported[codes]
+    if unsupported.any():
+        unsupported[codes == 0] = False
+        counts = np.add.reduceat(np.append(unsupported, False), bounds[:-1], dtype=np.int64)  # last may be empty
+        for i in np.flatnonzero(counts).tolist():
+            invalid[i] = int(counts[i])
+            if policy == "error":
+                position = int(np.flatnonzero(unsupported[bounds[i]:bounds[i + 1]])[0])
+                results[i] = None
+                errors[i] = f"Unsupported character {messages[i][position]!r} at position {position}"
+    return results, invalid, errors
+
+
+def encode_messages(messages: list[str], policy: str = "error") -> list[EncodingResult]:
+    """Encode batch of messages in one pass.
+
+    :param messages: messages to encode
+    :param policy: handling of unsupported characters: error (message fails), skip, replace (with ERROR_SIGNAL)
+    :return: result of every message, code is the same as of encode_text for messages of supported characters
+    """
+    return list(map(EncodingResult._make, zip(*encode_columns(messages, policy))))
+
+
+def iter_shards(messages: Iterable[str], size: int) -> Iterator[list[str]]:
+    """Yield lists of messages.
+
+    :param messages: messages
+    :param size: max number of messages in list
+    :return: lists of messages
+    """
+    messages = iter(messages)
+    while shard := list(islice(messages, size)):
+        yield shard
+
+
+def encode_batch(
+        messages: Iterable[str],
+        policy: str = "error",
+        workers: int = 1,
+        batch_size: int = BATCH_SIZE
+) -> Iterator[EncodingResult]:
+    """Encode messages in shards, optionally in process pool, results are yielded in the order of messages.
+
+    :param messages: messages to encode, list or any iterable (e.g. lines of file)
+    :param policy: handling of unsupported characters: error (message fails), skip, replace (with ERROR_SIGNAL)
+    :param workers: number of processes, 1 - encode in current process
+    :param batch_size: number of messages of shard
+    :return: result of every message
+    """
+    get_lookup_table(policy)  # fail on not supported policy before encoding
+    shards = iter_shards(messages, batch_size)
+    if workers == 1:
+        for shard in shards:
+            yield from encode_messages(shard, policy)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()  # at most 2 shards per process are submitted, memory does not depend on input size
+        for shard in shards:
+            pending.append(executor.submit(encode_columns, shard, policy))
+            if len(pending) >= 2 * workers:
+                yield from map(EncodingResult._make, zip(*pending.popleft().result()))
+        while pending:
+            yield from map(EncodingResult._make, zip(*pending.popleft().result()))
@@ -0,0 +1,239 @@
+"""Decode Morse code to text - the reverse of morse_encoder.
+Morse code format is the same as produced by morse_encoder: dits '.' and dahs '_', symbols (letters) separated
+by single space, words separated by '/'. Other whitespace (line breaks, any Unicode whitespace as for str.split)
+also separates symbols, the same in every chunk.
+
+Symbols are decoded with inverse index of MORSE_SYMBOLS (Morse symbol: character). Morse code file or
+standard input is decoded in chunks, symbol split between chunks is carried over to the next chunk.
+Run of signals longer than the longest symbol is invalid symbol as soon as it exceeds MAX_SYMBOL_LENGTH,
+the rest of it is skipped - memory used does not depend on the input, even without separators.
+Invalid symbols are handled by policy (--invalid): error (stop at the first one), skip or replace with
+replacement character U+FFFD, offsets (0-based) of invalid symbols in Morse code are reported.
+"""
+from contextlib import ExitStack
+from typing import (
+    NamedTuple,
+    TextIO
+)
+import argparse
+import re
+import sys
+
+from morse_encoder import (
+    CHUNK_SIZE,
+    INVALID_POLICIES,
+    MAX_POSITIONS,
+    MORSE_SYMBOLS
+)
+
+DECODE_TABLE = {symbol: char for char, symbol in MORSE_SYMBOLS.items()}
+REPLACEMENT_CHAR = "\ufffd"
+SYMBOL_PATTERN = re.compile(r"\S+")
+SEPARATOR_PATTERN = re.compile(r"\s")  # whitespace, as for str.split (both use str.isspace)
+MAX_SYMBOL_LENGTH = max(map(len, DECODE_TABLE))  # longer runs of signals are invalid symbols
+
+
+class DecodingReport(NamedTuple):
+    """Keep result of decoding stream"""
+    symbols: int  # number of symbols (including word separators) read
+    invalid: int  # number of invalid symbols
+    offsets: list[int]  # offsets (0-based) of the first MAX_POSITIONS invalid symbols
+
+
+class InvalidSymbolError(ValueError):
+    """Raised if Morse code has symbol which can not be decoded and policy is error"""
+
+    def __init__(self, symbol: str, offset: int) -> None:
+        self.symbol = symbol
+        self.offset = offset
+        super().__init__(f"Invalid Morse symbol {symbol!r} at offset {offset}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Return parsed arguments"""
+    parser = argparse.ArgumentParser(description="Decode Morse code to text")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("-c", "--code", type=str, help="Morse code to decode")
+    source.add_argument("-f", "--file", type=str,
+                        help="File with Morse code to decode, - for standard input")
+    parser.add_argument("-o", "--output", type=str, help="Output file to save decoded text, default standard output")
+    parser.add_argument("--invalid", type=str, choices=INVALID_POLICIES, default="error",
+                        help="Handling of invalid symbols: error (default), skip, replace with U+FFFD")
+    return parser.parse_args()
+
+
+class SymbolDecoder:
+    """Decode Morse symbols chunk by chunk, collect invalid symbols"""
+
+    def __init__(self, policy: str = "error") -> None:
+        """
+        :param policy: handling of invalid symbols: error, skip, replace (with REPLACEMENT_CHAR)
+        """
+        if policy not in INVALID_POLICIES:
+            raise ValueError(f"Not supported policy: {policy}")
+        self.policy = policy
+        self.symbols = 0
+        self.invalid = 0
+        self.offsets = []
+
+    @property
+    def report(self) -> DecodingReport:
+        """Return decoding report of symbols decoded so far."""
+        return DecodingReport(self.symbols, self.invalid, self.offsets)
+
+    def decode(self, code: str, offset: int = 0) -> str:
+        """Return text of complete symbols.
+
+        :param code: Morse code, it has to end with complete symbol
+        :param offset: offset of code in the whole Morse code
+        :return: decoded text
+        :raise InvalidSymbolError: on the first invalid symbol if policy is error
+        """
+        symbols = code.split()
+        self.symbols += len(symbols)
+        try:
+            return "".join(map(DECODE_TABLE.__getitem__, symbols))
+        except KeyError:  # find offsets of invalid symbols only if there are any
+            return self.decode_invalid(code, offset)
+
+    def decode_invalid(self, code: str, offset: int) -> str:
+        """Return text of complete symbols, some of them invalid.
+
+        :param code: Morse code, it has to end with complete symbol
+        :param offset: offset of code in the whole Morse code
+        :return: decoded text
+        """
+        chars = []
+        for match in SYMBOL_PATTERN.finditer(code):
+            char = DECODE_TABLE.get(match.group())
+            chars.append(self.decode_invalid_symbol(match.group(), offset + match.start()) if char is None else char)
+        return "".join(chars)
+
+    def decode_invalid_symbol(self, symbol: str, offset: int) -> str:
+        """Return replacement of invalid symbol, collect its offset.
+
+        :param symbol: invalid symbol
+        :param offset: offset of symbol in the whole Morse code
+        :return: replacement character or empty string if policy is skip
+        :raise InvalidSymbolError: if policy is error
+        """
+        if self.policy == "error":
+            raise InvalidSymbolError(symbol, offset)
+        self.invalid += 1
+        if len(self.offsets) < MAX_POSITIONS:
+            self.offsets.append(offset)
+        return REPLACEMENT_CHAR if self.policy == "replace" else ""
+
+
+def decode_text(code: str, policy: str = "error") -> str:
+    """Decode Morse code to text.
+
+    :param code: Morse code as returned by encode_text
+    :param policy: handling of invalid symbols: error, skip, replace
+    :return: decoded text, letters in upper case
+    :raise InvalidSymbolError: on the first invalid symbol if policy is error
+    """
+    return SymbolDecoder(policy).decode(code)
+
+
+def get_complete_end(code: str) -> int:
+    """Return end of complete symbols of code - index after its last separator.
+
+    :param code: Morse code
+    :return: index after the last whitespace, 0 if there is none
+    """
+    if not code or code[-1].isspace():
+        return len(code)
+    return len(code) - len(code.rsplit(maxsplit=1)[-1])
+
+
+def decode_stream(
+        source: TextIO,
+        target: TextIO,
+        policy: str = "error",
+        chunk_size: int = CHUNK_SIZE
+) -> DecodingReport:
+    """Decode Morse code from source and write text into target, chunk by chunk.
+    Symbol longer than MAX_SYMBOL_LENGTH is reported (InvalidSymbolError) with only its first
+    MAX_SYMBOL_LENGTH + 1 signals.
+
+    :param source: stream of Morse code
+    :param target: text stream to write decoded text to
+    :param policy: handling of invalid symbols: error, skip, replace
+    :param chunk_size: number of characters read at once
+    :return: decoding report
+    :raise InvalidSymbolError: on the first invalid symbol if policy is error
+    """
+    decoder = SymbolDecoder(policy)
+    carry = ""  # incomplete symbol at the end of previous chunk, at most MAX_SYMBOL_LENGTH signals
+    offset = 0  # offset of carry in the whole Morse code
+    overlong = False  # overlong symbol is being skipped until the next separator
+    while chunk := source.read(chunk_size):
+        code = carry + chunk
+        if overlong:
+            separator = SEPARATOR_PATTERN.search(code)
+            skipped = separator.start() if separator else len(code)
+            code = code[skipped:]
+            offset += skipped
+            overlong = separator is None
+        end = get_complete_end(code)
+        target.write(decoder.decode(code[:end], offset))
+        carry = code[end:]
+        offset += end
+        if len(carry) > MAX_SYMBOL_LENGTH:
+            decoder.symbols += 1
+            target.write(decoder.decode_invalid_symbol(carry[:MAX_SYMBOL_LENGTH + 1], offset))
+            offset += len(carry)
+            carry = ""
+            overlong = True
+    target.write(decoder.decode(carry, offset))
+    return decoder.report
+
+
+def decode_file(input_path: str, output_path: str | None = None, policy: str = "error") -> DecodingReport:
+    """Decode file with Morse code, see decode_stream.
+
+    :param input_path: path to Morse code file, - for standard input
+    :param output_path: path to output file, None - standard output
+    :param policy: handling of invalid symbols: error, skip, replace
+    :return: decoding report
+    """
+    with ExitStack() as stack:
+        source = sys.stdin if input_path == "-" else stack.enter_context(open(input_path, encoding="utf-8"))
+        target = sys.stdout if output_path is None else stack.enter_context(
+            open(output_path, "w", encoding="utf-8"))
+        return decode_stream(source, target, policy)
+
+
+def main(args_: argparse.Namespace) -> None:
+    """Decode Morse code and print or save decoded text.
+
+    :param args_: parsed arguments passed to the script
+    """
+    try:
+        if args_.code is not None:
+            decoder = SymbolDecoder(args_.invalid)
+            text = decoder.decode(args_.code)
+            report = decoder.report
+            if args_.output:
+                with open(args_.output, "w", encoding="utf-8") as f:
+                    f.write(text)
+            else:
+                print(text)
+        else:
+            report = decode_file(args_.file, args_.output, args_.invalid)
+            if not args_.output:
+                print()  # end line of text written to standard output
+    except InvalidSymbolError as e:
+        sys.exit(f"{e}, use --invalid skip or replace to decode code with it")
+
+    if report.invalid:
+        action = "skipped" if args_.invalid == "skip" else "replaced"
+        more = ", ..." if report.invalid > len(report.offsets) else ""
+        print(f"{report.invalid} invalid symbol(s) {action} at offsets: {', '.join(map(str, report.offsets))}{more}",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args)
@@ -1,21 +1,80 @@
 """Encode text to Morse code, display and play encoded text.
 Note:  Space between words in encoded text will be represented by '/'
+Sound is played only on Windows (winsound), see morse_audio to save Morse code as WAV file on any system.
+
+Text file or standard input (--file) is encoded in chunks and written to output as it is encoded,
+so memory used does not depend on the input size. Line breaks are encoded as spaces (except the final one), other
+unsupported characters are handled by policy (--invalid): error (stop at the first one), skip or replace with error
+signal. Output file is replaced only if the whole text is encoded.
 """
+from contextlib import ExitStack
+from typing import (
+    Awaitable,
+    Callable,
+    NamedTuple,
+    TextIO
+)
 import argparse
-from winsound import Beep
+import asyncio
+import os
+import re
 from time import sleep
 import sys
 
+try:
+    from winsound import Beep
+except ImportError:  # winsound is available only on Windows
+    Beep = None
+
 WORDS_SEP = " "
+TONE_FREQUENCY = 400  # Hz
+DIT_MS = 70
+DAH_MS = 210
+SIGNAL_GAP_MS = 70  # pause after every dit/dah
+SYMBOL_GAP_MS = 240  # pause between Morse symbols (single encoded letters)
+WORD_GAP_MS = 490  # pause between words
 MORSE_SYMBOLS = {
     "A": "._",   "B": "_...", "C": "_._.", "D": "_..", "E": ".",
     "F": ".._.", "G": "__.",  "H": "....", "I": "..",  "J": ".___",
     "K": "_._",  "L": "._..", "M": "__",   "N": "_.",  "O": "___",
     "P": ".__.", "Q": "__._", "R": "._.",  "S": "...", "T": "_",
     "U": ".._",  "V": "..._", "W": ".__", "X": "_.._", "Y": "_.__",
-    "Z": "___..",
+    "Z": "__..",
+    "0": "_____", "1": ".____", "2": "..___", "3": "...__", "4": "...._",
+    "5": ".....", "6": "_....", "7": "__...", "8": "___..", "9": "____.",
+    ".": "._._._", ",": "__..__", ":": "___...", "?": "..__..", "'": ".____.",
+    "-": "_...._", "/": "_.._.",  "(": "_.__.",  ")": "_.__._", '"': "._.._.",
+    "=": "_..._",  "+": "._._.",  "@": ".__._.",
     " ": "/"
 }
+SUPPORTED_CHARS = frozenset(MORSE_SYMBOLS) | frozenset(char.lower() for char in MORSE_SYMBOLS)
+ALLOWED_CHARS_INFO = "Allowed characters: A-Z, 0-9, punctuation .,:?'-/()\"=+@, space"
+ERROR_SIGNAL = "........"  # replacement of unsupported characters
+INVALID_POLICIES = ("error", "skip", "replace")
+CHUNK_SIZE = 1 << 20  # number of characters read from input at once
+MAX_POSITIONS = 100  # max number of reported positions of unsupported characters
+MORSE_TIMING = {  # character of Morse code: (tone duration, pause after it) in ms
+    ".": (DIT_MS, SIGNAL_GAP_MS),
+    "_": (DAH_MS, SIGNAL_GAP_MS),
+    " ": (0, SYMBOL_GAP_MS),
+    "/": (0, WORD_GAP_MS)
+}
+
+
+class EncodingReport(NamedTuple):
+    """Keep result of encoding stream"""
+    chars: int  # number of characters read
+    invalid: int  # number of unsupported characters
+    positions: list[int]  # positions (0-based) of the first MAX_POSITIONS unsupported characters
+
+
+class UnsupportedCharacterError(ValueError):
+    """Raised if text has character which can not be encoded and policy is error"""
+
+    def __init__(self, char: str, position: int) -> None:
+        self.char = char
+        self.position = position
+        super().__init__(f"Unsupported character {char!r} at position {position}")
 
 
 def parse_args() -> argparse.Namespace:
@@ -23,30 +82,43 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="""Encode text to Morse code, display encoded text and play it."""
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "-m",
         "--message",
         type=str,
-        required=True,
         help="Message to encode"
     )
+    source.add_argument(
+        "-f",
+        "--file",
+        type=str,
+        help="Text file to encode, - for standard input, Morse code is written to output file or standard output"
+    )
     parser.add_argument(
         "-o",
         "--output",
         type=str,
         required=False,
-        help="Output file to save input text and its encoded version")
+        help="Output file to save input text and its encoded version (Morse code only for --file)")
+    parser.add_argument(
+        "--invalid",
+        type=str,
+        choices=INVALID_POLICIES,
+        default="error",
+        help="Handling of unsupported characters of --file: error (default), skip, replace with error signal"
+    )
 
     return parser.parse_args()
 
 
 def check_message(message: str) -> bool:
-    """Return True if message consists of alphanumeric characters and space, False otherwise
+    """Return True if message consists of characters of MORSE_SYMBOLS (letters in any case), False otherwise
 
     :param message: message to be encoded
     :return: message check result
     """
-    return message.replace(" ", "").isalpha()
+    return bool(message.replace(" ", "")) and SUPPORTED_CHARS.issuperset(message)
 
 
 def encode_text(message: str) -> str:
@@ -56,7 +128,7 @@ def encode_text(message: str) -> str:
     :return: Morse code 'character' (dot or dahs)
     """
     if not check_message(message):
-        print("Allowed characters: A-Z, space")
+        print(ALLOWED_CHARS_INFO)
         sys.exit()
 
     encoded_chars = [MORSE_SYMBOLS[char] for char in message.upper()]
@@ -64,14 +136,85 @@ def encode_text(message: str) -> str:
     return " ".join(encoded_chars)
 
 
+def get_translation_table(replacement: str = ERROR_SIGNAL) -> dict[int, str]:
+    """Return table of str.translate encoding text to Morse code.
+    Every character is encoded with space before its Morse symbol - the first space of output has to be removed.
+
+    :param replacement: Morse code of unsupported characters, replaced by NUL character before translation
+    :return: translation table, key - code point of character, value - Morse symbol with space before it
+    """
+    table = {}
+    for char, symbol in MORSE_SYMBOLS.items():
+        table[ord(char)] = table[ord(char.lower())] = f" {symbol}"
+    table[ord("\n")] = table[ord(" ")]  # line breaks separate words
+    table[ord("\r")] = None
+    table[0] = f" {replacement}"
+    return table
+
+
+def get_unsupported_pattern(table: dict[int, str]) -> re.Pattern:
+    """Return regular expression matching characters not in translation table.
+
+    :param table: translation table
+    :return: compiled regular expression
+    """
+    return re.compile(f"[^{re.escape(''.join(chr(code) for code in table if code))}]")
+
+
+def encode_stream(
+        source: TextIO,
+        target: TextIO,
+        policy: str = "error",
+        chunk_size: int = CHUNK_SIZE
+) -> EncodingReport:
+    """Encode text from source to Morse code and write it into target, chunk by chunk.
+    Output is the same as of encode_text for text of supported characters.
+    Line break at the end of text (end of the last line of file) is not encoded.
+
+    :param source: text stream to encode
+    :param target: text stream to write Morse code to
+    :param policy: handling of unsupported characters: error, skip, replace (with ERROR_SIGNAL)
+    :param chunk_size: number of characters read at once
+    :return: encoding report
+    :raise UnsupportedCharacterError: on the first unsupported character if policy is error
+    """
+    if policy not in INVALID_POLICIES:
+        raise ValueError(f"Not supported policy: {policy}")
+    table = get_translation_table()
+    unsupported = get_unsupported_pattern(table)
+    replacement = "" if policy == "skip" else "\0"
+    chars = invalid = 0
+    positions = []
+    first = True
+    line_break = ""  # line break at the end of the previous chunk, encoded only if it is not the end of text
+    while chunk := source.read(chunk_size):
+        matches = [match.start() for match in unsupported.finditer(chunk)]
+        if matches:
+            if policy == "error":
+                raise UnsupportedCharacterError(chunk[matches[0]], chars + matches[0])
+            invalid += len(matches)
+            positions += [chars + position for position in matches[:MAX_POSITIONS - len(positions)]]
+        chars += len(chunk)
+        if matches:
+            chunk = unsupported.sub(replacement, chunk)
+        chunk = line_break + chunk
+        line_break = "\n" if chunk.endswith("\n") else ""
+        encoded = chunk[:-1 if line_break else None].translate(table)
+        if first and encoded:
+            encoded = encoded[1:]
+            first = False
+        target.write(encoded)
+    return EncodingReport(chars, invalid, positions)
+
+
 def beep_dit() -> None:
     """Make dit sound"""
-    Beep(400, 70)
+    Beep(TONE_FREQUENCY, DIT_MS)
 
 
 def beep_dah() -> None:
     """Make dah sound"""
-    Beep(400, 210)
+    Beep(TONE_FREQUENCY, DAH_MS)
 
 
 def play_morse_symbol(symbol: str) -> None:
@@ -84,20 +227,21 @@ def play_morse_symbol(symbol: str) -> None:
             beep_dit()
         elif signal == "_":
             beep_dah()
-        sleep(0.07)  # pause between dits/dahs
+        sleep(SIGNAL_GAP_MS / 1000)  # pause between dits/dahs
 
 
 def play_morse_code(code: str) -> None:
-    """Make Morse sound - dots, dashes beeps and pauses for encoded text.
+    """Make Morse sound - dots, dashes beeps and pauses for encoded text, timing as in MORSE_TIMING.
+    Blocks until played, see morse_player to play without blocking and without accumulated timing errors.
 
     :param code: Morse code
     :type code: str
     """
-    for word in code.split("  "):  # Two spaces separate Morse codes for single words
+    for word in code.split(" / "):  # Slash separates Morse codes for single words
         for symbol in word.split():  # One space separates Morse symbols for letters
             play_morse_symbol(symbol)
-            sleep(0.24)  # pause between Morse symbols (single encoded letters)
-        sleep(0.49)  # pause between words
+            sleep(SYMBOL_GAP_MS / 1000)  # pause between Morse symbols (single encoded letters)
+        sleep((WORD_GAP_MS + SYMBOL_GAP_MS) / 1000)  # pause between words, slash is surrounded by spaces
 
 
 def save_encoding(
@@ -116,15 +260,67 @@ def save_encoding(
         f.write(f"Morse code: {morse_code}")
 
 
-def main(args_: argparse.Namespace) -> None:
+def encode_file(input_path: str, output_path: str | None = None, policy: str = "error") -> EncodingReport:
+    """Encode text file to Morse code, see encode_stream.
+    Output file is written into temporary file, which replaces output file only if whole text is encoded
+    (e.g. not on unsupported character with error policy).
+
+    :param input_path: path to text file, - for standard input
+    :param output_path: path to output file, None - standard output
+    :param policy: handling of unsupported characters: error, skip, replace
+    :return: encoding report
+    """
+    # output which is not regular file (e.g. /dev/null, pipe) is written directly
+    replace = output_path is not None and (os.path.isfile(output_path) or not os.path.exists(output_path))
+    tmp_path = f"{output_path}.tmp" if replace else output_path
+    try:
+        with ExitStack() as stack:
+            source = sys.stdin if input_path == "-" else stack.enter_context(open(input_path, encoding="utf-8"))
+            target = sys.stdout if output_path is None else stack.enter_context(
+                open(tmp_path, "w", encoding="utf-8"))
+            report = encode_stream(source, target, policy)
+        if replace:
+            os.replace(tmp_path, output_path)
+        return report
+    finally:
+        if replace and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def main(
+        args_: argparse.Namespace,
+        play: Callable[[str, str, str | None], Awaitable[None]] | None = None
+) -> None:
     """Script loop execution.
 
     :param args_: parsed arguments passed to the script
+    :param play: coroutine function playing message and saving its encoding (message, Morse code, output path),
+        e.g. morse_player.play_and_save, None - play with blocking calls, then save
     :return:
     """
+    if args_.file:
+        try:
+            report = encode_file(args_.file, args_.output, args_.invalid)
+        except UnsupportedCharacterError as e:
+            sys.exit(f"{e}, use --invalid skip or replace to encode text with it")
+        if not args_.output:
+            print()  # end line of Morse code written to standard output
+        if report.invalid:
+            action = "skipped" if args_.invalid == "skip" else "replaced"
+            more = ", ..." if report.invalid > len(report.positions) else ""
+            print(f"{report.invalid} unsupported character(s) {action} at positions: "
+                  f"{', '.join(map(str, report.positions))}{more}", file=sys.stderr)
+        return
+
     encoded_text = encode_text(args_.message)
     print(encoded_text)
-    play_morse_code(encoded_text)
+    if Beep is not None and play is not None:
+        asyncio.run(play(args_.message, encoded_text, args_.output))
+        return
+    if Beep is not None:
+        play_morse_code(encoded_text)
+    else:
+        print("Sound is not played (winsound not available), use morse_audio.py to save it as WAV file")
 
     if args_.output:
         save_encoding(
@@ -135,5 +331,7 @@ def main(args_: argparse.Namespace) -> None:
 
 
 if __name__ == "__main__":
+    from morse_player import play_and_save  # morse_player depends on this module, not the other way round
+
     args = parse_args()
-    main(args)
+    main(args, play_and_save)
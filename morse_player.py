@@ -0,0 +1,220 @@
+"""Play Morse code without blocking - asyncio scheduler of tones with pluggable output (sink).
+Tones are started at absolute deadlines computed from the start of message and MORSE_TIMING, measured
+with monotonic clock of event loop: late wake-up delays single tone only, timing errors do not accumulate
+(as of chained sleep calls). Other tasks run while message is played, e.g. output file is written.
+
+Messages can be queued, the next one starts after pause between words following the end of the previous one.
+Playing can be cancelled - the current message is stopped (after tone being played) and queued ones are dropped.
+
+Sinks:
+    - BeepSink: Windows beeper (winsound.Beep), blocking calls run in thread
+    - BufferSink: in-memory 16-bit PCM buffer, tone samples of morse_audio placed at scheduled time
+    - RecorderSink: scheduled and actual start time of tones, to verify timing on any system
+
+play_and_save plays message of morse_encoder script and saves its encoding while it is played.
+"""
+from abc import (
+    ABC,
+    abstractmethod
+)
+from collections import deque
+from typing import NamedTuple
+import asyncio
+
+import numpy as np
+
+from morse_audio import (
+    AudioSettings,
+    get_time_scale,
+    get_tone
+)
+from morse_encoder import (
+    MORSE_TIMING,
+    TONE_FREQUENCY,
+    Beep,
+    save_encoding
+)
+
+
+class Tone(NamedTuple):
+    """Keep tone of Morse code timeline"""
+    start: float  # seconds since start of message
+    duration: float  # seconds
+
+
+class RecordedTone(NamedTuple):
+    """Keep tone captured by RecorderSink"""
+    deadline: float  # scheduled start, time of event loop clock (seconds)
+    started: float  # actual start, time of event loop clock (seconds)
+    duration: float  # seconds
+
+
+def get_timeline(code: str, time_scale: float = 1.0) -> tuple[list[Tone], float]:
+    """Return tones of Morse code and its duration.
+
+    :param code: Morse code as returned by encode_text
+    :param time_scale: multiplier of MORSE_TIMING durations
+    :return: tones, duration of message including pause after the last character (seconds)
+    :raise ValueError: if code has characters other than dits, dahs, spaces and slashes
+    """
+    tones = []
+    time_ms = 0
+    for char in code:
+        try:
+            tone_ms, pause_ms = MORSE_TIMING[char]
+        except KeyError as e:
+            raise ValueError(f"Not a Morse code character: {e}") from e
+        if tone_ms:
+            tones.append(Tone(time_ms * time_scale / 1000, tone_ms * time_scale / 1000))
+        time_ms += tone_ms + pause_ms
+    return tones, time_ms * time_scale / 1000
+
+
+class Sink(ABC):
+    """Output of MorsePlayer"""
+
+    @abstractmethod
+    async def tone(self, deadline: float, duration: float) -> None:
+        """Play tone, called at its scheduled start.
+
+        :param deadline: scheduled start, time of event loop clock (seconds)
+        :param duration: duration of tone (seconds)
+        """
+
+
+class BeepSink(Sink):
+    """Play tones with Windows beeper"""
+
+    def __init__(self, frequency: int = TONE_FREQUENCY) -> None:
+        """
+        :param frequency: tone frequency (Hz)
+        """
+        if Beep is None:
+            raise RuntimeError("winsound not available, sound can be played only on Windows")
+        self.frequency = frequency
+
+    async def tone(self, deadline: float, duration: float) -> None:
+        """Beep in thread, Beep blocks for tone duration."""
+        await asyncio.get_running_loop().run_in_executor(None, Beep, self.frequency, round(duration * 1000))
+
+
+class BufferSink(Sink):
+    """Collect audio of played tones - PCM samples, silence between tones"""
+
+    def __init__(self, settings: AudioSettings = AudioSettings()) -> None:
+        """
+        :param settings: audio settings, WPM of player is used instead of WPM of settings
+        """
+        self.settings = settings
+        self.origin = None  # deadline of the first tone, time 0 of audio
+        self.chunks = []
+        self.size = 0  # number of samples
+
+    @property
+    def samples(self) -> np.ndarray:
+        """Return audio collected so far, 16-bit PCM samples, mono."""
+        return np.concatenate(self.chunks) if self.chunks else np.zeros(0, dtype=np.int16)
+
+    async def tone(self, deadline: float, duration: float) -> None:
+        """Append silence up to the scheduled start of tone and the tone."""
+        if self.origin is None:
+            self.origin = deadline
+        start = round((deadline - self.origin) * self.settings.sample_rate)
+        tone = get_tone(round(duration * self.settings.sample_rate), self.settings)
+        self.chunks += [np.zeros(max(0, start - self.size), dtype=np.int16), tone]
+        self.size = max(start, self.size) + tone.size
+
+
+class RecorderSink(Sink):
+    """Record scheduled and actual start of tones, no sound"""
+
+    def __init__(self) -> None:
+        self.tones = []
+
+    async def tone(self, deadline: float, duration: float) -> None:
+        """Record tone."""
+        self.tones.append(RecordedTone(deadline, asyncio.get_running_loop().time(), duration))
+
+
+class MorsePlayer:
+    """Play queued Morse code messages through sink at absolute deadlines"""
+
+    def __init__(self, sink: Sink, wpm: float | None = None) -> None:
+        """
+        :param sink: output of tones
+        :param wpm: speed in words per minute, None - timing of MORSE_TIMING (dit 70 ms)
+        """
+        self.sink = sink
+        self.time_scale = get_time_scale(AudioSettings(wpm=wpm))
+        self.message_gap = get_timeline(" / ", self.time_scale)[1]
+        self.queue = deque()  # messages waiting for playing: (timeline, future)
+        self.worker = None
+        self.end = None  # end of the last played message, time of event loop clock
+
+    def submit(self, code: str) -> asyncio.Future:
+        """Queue message, it has to be called in running event loop.
+
+        :param code: Morse code as returned by encode_text
+        :return: future done when message is played, its result is the end of message (event loop time)
+        :raise ValueError: if code has characters other than dits, dahs, spaces and slashes
+        """
+        timeline = get_timeline(code, self.time_scale)
+        future = asyncio.get_running_loop().create_future()
+        self.queue.append((timeline, future))
+        if self.worker is None or self.worker.done():
+            self.worker = asyncio.create_task(self.run())
+        return future
+
+    async def play(self, code: str) -> float:
+        """Play message after queued ones.
+
+        :param code: Morse code as returned by encode_text
+        :return: end of message, event loop time
+        """
+        return await self.submit(code)
+
+    async def join(self) -> None:
+        """Wait until all queued messages are played."""
+        if self.worker is not None:
+            await asyncio.shield(self.worker)
+
+    def cancel(self) -> None:
+        """Stop playing message and drop queued ones, their futures are cancelled."""
+        for _, future in self.queue:
+            future.cancel()
+        self.queue.clear()
+        if self.worker is not None:
+            self.worker.cancel()
+
+    async def run(self) -> None:
+        """Play queued messages, one after another."""
+        loop = asyncio.get_running_loop()
+        while self.queue:
+            (tones, duration), future = self.queue.popleft()
+            start = loop.time() if self.end is None else max(loop.time(), self.end + self.message_gap)
+            try:
+                for tone in tones:
+                    deadline = start + tone.start
+                    await asyncio.sleep(max(0.0, deadline - loop.time()))
+                    await self.sink.tone(deadline, tone.duration)
+                self.end = start + duration
+                await asyncio.sleep(max(0.0, self.end - loop.time()))
+            except asyncio.CancelledError:
+                future.cancel()
+                self.end = None
+                raise
+            if not future.done():
+                future.set_result(self.end)
+
+
+async def play_and_save(message: str, morse_code: str, path: str | None) -> None:
+    """Play Morse code with beeper, save encoding into file while it is played.
+
+    :param message: text to be encoded
+    :param morse_code: encoded text
+    :param path: path to file where save text and its Morse code version, None - do not save
+    """
+    playing = MorsePlayer(BeepSink()).submit(morse_code)
+    if path:
+        await asyncio.to_thread(save_encoding, message, morse_code, path)
+    await playing
@@ -0,0 +1,56 @@
+import csv
+
+from PIL import Image
+from pytest import mark
+
+from climate_diagram_generator import (
+    main,
+    RenderSettings
+)
+
+DATA = '''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6
+Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
+Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73'''
+
+
+def read_index(path) -> list[list[str]]:
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f, delimiter=';'))
+
+
+def test_pdf_atlas(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'data.csv').write_text(DATA)
+
+    main('data.csv', settings=RenderSettings(dpi=72), atlas_path='atlas.pdf')
+
+    assert b'/Count 3' in (tmp_path / 'atlas.pdf').read_bytes()
+    assert read_index(tmp_path / 'atlas.index.csv') == [
+        ['Station', 'File', 'Page', 'Row', 'Column'],
+        ['Warsaw', 'atlas.pdf', '1', '1', '1'],
+        ['Vostok', 'atlas.pdf', '2', '1', '1'],
+        ['Sydney', 'atlas.pdf', '3', '1', '1']
+    ]
+    assert not list(tmp_path.glob('*.jpg'))
+
+
+@mark.parametrize("backend", ['matplotlib', 'fast'])
+def test_contact_sheet_atlas(tmp_path, monkeypatch, backend):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'data.csv').write_text(DATA)
+
+    main('data.csv', settings=RenderSettings(dpi=50, file_format='png', backend=backend),
+         atlas_path='atlas.png', atlas_grid=(2, 1))
+
+    assert read_index(tmp_path / 'atlas.index.csv')[1:] == [
+        ['Warsaw', 'atlas_001.png', '1', '1', '1'],
+        ['Vostok', 'atlas_001.png', '1', '1', '2'],
+        ['Sydney', 'atlas_002.png', '2', '1', '1']
+    ]
+    first, second = Image.open(tmp_path / 'atlas_001.png'), Image.open(tmp_path / 'atlas_002.png')
+    assert first.size == second.size
+    assert first.width > first.height  # two tiles in a row
@@ -0,0 +1,88 @@
+from io import StringIO
+import os
+
+import numpy as np
+import pandas as pd
+from pytest import raises
+
+from climate_data_loader import get_snapshot_dir, load_climate_data, write_snapshot
+
+DATA = '''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6
+'''
+
+
+def is_memory_mapped(arr) -> bool:
+    while arr is not None:
+        if isinstance(arr, np.memmap):
+            return True
+        arr = getattr(arr, 'base', None)
+    return False
+
+
+def test_load_climate_data_creates_and_uses_snapshot(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA)
+    expected = pd.read_csv(data_path, sep=';', index_col=['Station', 'Element'])
+
+    df = load_climate_data(data_path, np.float64)
+    assert (get_snapshot_dir(data_path, np.float64) / 'meta.json').exists()
+    assert df.equals(expected)
+
+    df = load_climate_data(data_path, np.float64)
+    assert df.equals(expected)
+    assert is_memory_mapped(df.to_numpy())
+    assert df.loc['Vostok'].loc['Temp', 'Aug'] == -67.4
+
+
+def test_load_climate_data_float32(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA)
+    df = load_climate_data(data_path)
+    assert df.dtypes.unique().tolist() == [np.float32]
+    assert load_climate_data(data_path).equals(df)
+
+
+def test_load_climate_data_stale_snapshot(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA)
+    load_climate_data(data_path, np.float64)
+
+    data_path.write_text(DATA.replace('-67.4', '-67.5'))
+    stat = os.stat(data_path)
+    os.utime(data_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_climate_data(data_path, np.float64).loc['Vostok'].loc['Temp', 'Aug'] == -67.5
+
+
+def test_load_climate_data_without_snapshot(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA)
+    load_climate_data(data_path, use_snapshot=False)
+    assert not get_snapshot_dir(data_path, np.float32).exists()
+
+
+def test_load_climate_data_damaged_snapshot(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA)
+    load_climate_data(data_path, np.float64)
+
+    (get_snapshot_dir(data_path, np.float64) / 'values.npy').write_bytes(b'truncated')
+    df = load_climate_data(data_path, np.float64)
+    assert df.equals(pd.read_csv(data_path, sep=';', index_col=['Station', 'Element']))
+    assert is_memory_mapped(load_climate_data(data_path, np.float64).to_numpy())  # snapshot is saved again
+
+
+def test_write_snapshot_not_numeric_values(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA)
+    load_climate_data(data_path, np.float64)
+    meta_path = get_snapshot_dir(data_path, np.float64) / 'meta.json'
+    meta = meta_path.read_text(encoding='utf-8')
+
+    df = pd.read_csv(StringIO(DATA.replace('-67.4', 'cold')), sep=';', index_col=['Station', 'Element'])
+    with raises(ValueError):
+        write_snapshot(data_path, df, np.float64)
+    assert meta_path.read_text(encoding='utf-8') == meta
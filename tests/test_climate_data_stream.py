@@ -0,0 +1,61 @@
+import pandas as pd
+
+from climate_data_stream import StationExtremes, get_extremes, iter_stations, read_chunks
+from climate_diagram_generator import get_max_precip, get_temp_range
+
+DATA = '''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
+Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6
+'''
+
+
+def test_get_extremes(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA)
+    df = pd.read_csv(data_path, sep=';', index_col=['Station', 'Element'])
+    for chunk_size in (1, 2, 100):
+        assert get_extremes(str(data_path), chunk_size) == (*get_temp_range(df), get_max_precip(df))
+
+
+def test_iter_stations_pairs_rows_from_different_chunks(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA)
+    df = pd.read_csv(data_path, sep=';', index_col=['Station', 'Element'])
+    for chunk_size in (1, 2, 4, 100):
+        stations = dict(iter_stations(str(data_path), chunk_size))
+        assert sorted(stations) == ['Sydney', 'Vostok', 'Warsaw']
+        for station, station_data in stations.items():
+            expected = df.loc[station].loc[['Temp', 'Precipitation']]
+            assert station_data.loc[['Temp', 'Precipitation']].equals(expected)
+
+
+def test_iter_stations_yields_incomplete_station(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA.replace('Vostok;Precipitation', 'Vostok;Temp'))
+    stations = dict(iter_stations(str(data_path), 2))
+    assert list(stations['Vostok'].index) == ['Temp']  # repeated temperature row skipped
+
+
+def test_iter_stations_skips_duplicated_rows_of_incomplete_station(tmp_path, capsys):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA.replace('Vostok;Precipitation', 'Vostok;Temp'))
+    stations = dict(iter_stations(str(data_path), 1))
+    assert list(stations['Vostok'].index) == ['Temp']
+    assert capsys.readouterr().err == 'Repeated rows of station Vostok skipped\n'
+
+
+def test_station_extremes_of_valid_stations(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA)
+    df = pd.read_csv(data_path, sep=';', index_col=['Station', 'Element'])
+    data_path.write_text(DATA + 'Invalid;Temp;99;x;;;;;;;;;;\n')
+    for chunk_size in (1, 2, 100):
+        extremes = StationExtremes()
+        chunks = list(extremes.track(read_chunks(str(data_path), chunk_size)))
+        assert len(chunks) == -(-(len(df) + 1) // chunk_size)
+        assert extremes.get(exclude={'Invalid'}) == (*get_temp_range(df), get_max_precip(df))
+        assert extremes.get()[1] == 99
@@ -1,15 +1,29 @@
 from io import StringIO
+from pathlib import Path
+import os
 
 from numpy import ndarray, isclose
+from pytest import raises
+import numpy as np
 import pandas as pd
 
 from climate_data_unit_converter import (
     celsius_to_fahrenheit,
     fahrenheit_to_celsius,
+    mm_to_inch,
+    inch_to_mm,
     get_conversion_function,
+    convert_array,
     convert_to_c_mm,
-    convert_to_f_inch
+    convert_to_f_inch,
+    main,
+    merge_spill_files,
+    C_TO_F,
+    F_TO_C,
+    MM_TO_INCH,
+    INCH_TO_MM
 )
+from climate_validation import InvalidDataError
 
 
 def test_celsius_to_fahrenheit():
@@ -87,3 +101,123 @@ def test_convert_to_c_mm():
     arr_p_mm = p_mm.to_numpy()
     arr_p_mm_calc = p_mm_calc.to_numpy()
     assert ndarray.all(isclose(arr_p_mm, arr_p_mm_calc, atol=0.1))
+
+
+def test_convert_array_matches_scalar_conversion_applied_to_columns():
+    values = pd.DataFrame(np.random.default_rng(0).uniform(-100, 300, (1000, 12)))
+    for conversion, scalar_func in ((C_TO_F, celsius_to_fahrenheit), (F_TO_C, fahrenheit_to_celsius),
+                                    (MM_TO_INCH, mm_to_inch), (INCH_TO_MM, inch_to_mm)):
+        expected = values.apply(scalar_func).to_numpy()
+        assert np.array_equal(convert_array(values.to_numpy(), conversion), expected)
+
+
+def test_convert_to_f_inch_inplace():
+    data = StringIO("""Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+    Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1""")
+    t_c = pd.read_table(data, delimiter=';', index_col=['Station', 'Element'])
+    expected, _ = convert_to_f_inch(t_c, t_c)
+
+    t_f, _ = convert_to_f_inch(t_c, t_c.copy(), inplace=True)
+    assert t_f is t_c
+    assert t_c.equals(expected)
+
+
+def test_main_chunked_output_identical_to_in_memory(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("""Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6
+Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73
+""")
+    for target_unit in ("C_mm", "F_inch"):
+        main(str(input_path), str(tmp_path / "in_memory.csv"), target_unit)
+        for chunk_size in (1, 2, 4, 100):
+            main(str(input_path), str(tmp_path / "chunked.csv"), target_unit, chunk_size)
+            assert (tmp_path / "chunked.csv").read_bytes() == (tmp_path / "in_memory.csv").read_bytes()
+    assert not list(tmp_path.glob(".spill-*"))
+
+
+def test_merge_spill_files_in_passes(tmp_path):
+    rows = [f"S{i:02};{element};{i}" for i in range(40) for element in ("Precipitation", "Temp")]
+    spill_paths = []
+    for i in range(9):
+        spill_dir = tmp_path / f"spill{i % 2}"
+        spill_dir.mkdir(exist_ok=True)
+        spill_paths.append(str(spill_dir / f"{i}.csv"))
+        part = sorted((row.split(";") for row in rows[i::9]), key=lambda row: (row[0], row[1]))
+        with open(spill_paths[-1], "w", encoding="utf-8") as f:
+            f.writelines(",".join(row) + os.linesep for row in part)
+    expected = sorted((row.split(";") for row in rows), key=lambda row: (row[0], row[1]))
+
+    merge_spill_files(spill_paths, str(tmp_path / "output.csv"), ["Station", "Element", "Jan"], fan_in=2)
+    lines = (tmp_path / "output.csv").read_text(encoding="utf-8").splitlines()
+    assert lines == ["Station,Element,Jan", *(",".join(row) for row in expected)]
+    assert sorted(tmp_path.glob("spill*/*")) == sorted(map(Path, spill_paths))  # intermediate files are removed
+
+
+def test_main_batch(tmp_path):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "pl.csv").write_text("""Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+""")
+    (input_dir / "aq.csv").write_text("""Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6
+""")
+    (input_dir / "bad.csv").write_text("Station;Element;Jan\nWarsaw;Temp;cold\n")
+    output_dir = tmp_path / "output"
+
+    results = main(str(input_dir), str(output_dir), "F_inch", workers=2)
+    assert [(os.path.basename(r.input_path), r.status) for r in results] == [
+        ("aq.csv", "converted"), ("bad.csv", "failed"), ("pl.csv", "converted")
+    ]
+    main(str(input_dir / "pl.csv"), str(tmp_path / "pl.csv"), "F_inch")
+    assert (output_dir / "pl.csv").read_bytes() == (tmp_path / "pl.csv").read_bytes()
+
+    results = main(str(input_dir / "*.csv"), str(output_dir), "F_inch", workers=2)
+    assert [r.status for r in results] == ["skipped", "failed", "skipped"]
+
+    results = main(str(input_dir / "*.csv"), str(output_dir), "C_mm", workers=2)
+    assert [r.status for r in results] == ["converted", "failed", "converted"]  # output of other unit is not fresh
+    results = main(str(input_dir / "*.csv"), str(output_dir), "C_mm", workers=2, force=True)
+    assert [r.status for r in results] == ["converted", "failed", "converted"]
+
+
+def test_main_batch_duplicated_output_names(tmp_path):
+    data = """Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+"""
+    for country in ("pl", "de"):
+        (tmp_path / "exports" / country).mkdir(parents=True)
+        (tmp_path / "exports" / country / "data.csv").write_text(data)
+    (tmp_path / "exports" / "pl" / "pl.csv").write_text(data)
+    output_dir = tmp_path / "output"
+
+    results = main(str(tmp_path / "exports" / "*" / "*.csv"), str(output_dir), "F_inch", workers=2)
+    assert [r.status for r in results] == ["failed", "failed", "converted"]
+    assert sorted(path.name for path in output_dir.iterdir()) == [".climate_conversions.json", "pl.csv"]
+
+
+def test_main_failed_conversion_keeps_previous_output(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("""Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+""")
+    output_path = tmp_path / "output.csv"
+    main(str(input_path), str(output_path), "F_inch", use_snapshot=False)
+    expected = output_path.read_bytes()
+
+    with open(input_path, "a", encoding="utf-8") as f:
+        f.write("Vostok;Temp;cold;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1\n")
+    for chunk_size in (None, 1):
+        with raises(InvalidDataError):
+            main(str(input_path), str(output_path), "F_inch", chunk_size, use_snapshot=False)
+        assert output_path.read_bytes() == expected
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["input.csv", "output.csv"]
@@ -0,0 +1,82 @@
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+from pytest import mark
+
+from climate_data_unit_converter import (
+    convert_to_c_mm,
+    convert_to_f_inch
+)
+from climate_dataset import ClimateDataset
+from climate_diagram_generator import (
+    RenderSettings,
+    create_diagram,
+    get_yaxis_limits
+)
+from climate_statistics import compute_statistics
+
+DATA = '''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
+Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73
+'''
+
+
+def get_data(dtype=np.float32) -> pd.DataFrame:
+    df = pd.read_csv(StringIO(DATA), sep=';', index_col=['Station', 'Element'])
+    return df.astype(dtype)
+
+
+def test_from_frame():
+    dataset = ClimateDataset.from_frame(get_data())
+    assert dataset.stations.tolist() == ['Warsaw', 'Vostok', 'Sydney']
+    assert dataset.temp.shape == dataset.precip.shape == (3, 12)
+    assert dataset.temp.dtype == np.float32 and dataset.temp.flags.c_contiguous
+    assert dataset.offset('Sydney') == 2
+    assert dataset.precip[dataset.offset('Vostok'), 0] == np.float32(1.7)
+
+
+@mark.parametrize("station", ['Warsaw', 'Vostok', 'Sydney'])
+def test_station_data_same_as_frame(station):
+    climate_data = get_data()
+    expected = climate_data.loc[station].reindex(['Temp', 'Precipitation'])
+    pd.testing.assert_frame_equal(ClimateDataset.from_frame(climate_data).station_data(station), expected)
+
+
+def test_to_frame():
+    climate_data = get_data(np.float64)
+    pd.testing.assert_frame_equal(ClimateDataset.from_frame(climate_data, np.float64).to_frame().sort_index(),
+                                  climate_data.sort_index())
+
+
+def test_limits_and_statistics_same_as_frame():
+    climate_data = get_data()
+    dataset = ClimateDataset.from_frame(climate_data)
+    assert get_yaxis_limits(dataset) == get_yaxis_limits(climate_data)
+    pd.testing.assert_frame_equal(compute_statistics(dataset), compute_statistics(climate_data))
+
+
+@mark.parametrize("convert_func", [convert_to_c_mm, convert_to_f_inch])
+def test_convert_dataset_same_as_frames(convert_func):
+    climate_data = get_data(np.float64)
+    t = climate_data.xs('Temp', level='Element', drop_level=False)
+    p = climate_data.xs('Precipitation', level='Element', drop_level=False)
+    t_expected, p_expected = convert_func(t, p)
+
+    dataset = convert_func(ClimateDataset.from_frame(climate_data, np.float64))
+    np.testing.assert_array_equal(dataset.temp, t_expected.to_numpy())
+    np.testing.assert_array_equal(dataset.precip, p_expected.reindex(dataset.stations, level='Station').to_numpy())
+
+
+def test_create_diagram_from_dataset(tmp_path):
+    climate_data = get_data()
+    y_axis_limits = get_yaxis_limits(climate_data)
+    settings = RenderSettings(file_format='svg', backend='fast', output_dir=str(tmp_path))
+    create_diagram(y_axis_limits, climate_data.loc['Vostok'], 'Vostok', settings)
+    (tmp_path / 'Vostok.svg').rename(tmp_path / 'frame.svg')
+    create_diagram(y_axis_limits, ClimateDataset.from_frame(climate_data), 'Vostok', settings)
+    assert (tmp_path / 'frame.svg').read_bytes() == (tmp_path / 'Vostok.svg').read_bytes()
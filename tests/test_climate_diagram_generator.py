@@ -1,6 +1,10 @@
 from io import StringIO
+import argparse
+import os
+
 import pandas as pd
-from pytest import mark
+from PIL import Image
+from pytest import mark, raises
 
 from climate_diagram_generator import (
     round_down,
@@ -8,6 +12,14 @@ from climate_diagram_generator import (
     get_temp_range,
     get_max_precip,
     get_yaxis_limits,
+    create_diagram,
+    main,
+    DiagramTemplate,
+    render_station,
+    add_render_arguments,
+    diagram_paths,
+    get_render_settings,
+    RenderSettings,
     YAxisLimits
 )
 
@@ -73,3 +85,124 @@ def test_get_yaxis_limits():
     Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73''')
     df = pd.read_table(data, delimiter=';', index_col=['Station', 'Element'])
     assert get_yaxis_limits(df) == YAxisLimits(tmin=0, tmax=25, pmax=200)
+
+
+def test_render_station_reports_error(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = StringIO('''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1''')
+    df = pd.read_table(data, delimiter=';', index_col=['Station', 'Element'])
+    result = render_station(YAxisLimits(tmin=-5, tmax=20, pmax=100), df.loc['Warsaw'], 'Warsaw')
+    assert result.station == 'Warsaw'
+    assert result.error.startswith('KeyError')
+
+
+def test_main_workers_output_identical_to_serial(tmp_path, monkeypatch):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text('''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6''')
+    serial_dir = tmp_path / 'serial'
+    parallel_dir = tmp_path / 'parallel'
+    serial_dir.mkdir()
+    parallel_dir.mkdir()
+
+    monkeypatch.chdir(serial_dir)
+    main(str(data_path))
+    monkeypatch.chdir(parallel_dir)
+    main(str(data_path), workers=2)
+
+    for station in ('Warsaw', 'Vostok'):
+        assert (serial_dir / f'{station}.jpg').read_bytes() == (parallel_dir / f'{station}.jpg').read_bytes()
+
+
+def test_diagram_template_output_identical_to_create_diagram(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = StringIO('''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6''')
+    df = pd.read_table(data, delimiter=';', index_col=['Station', 'Element'])
+    y_axis_limits = get_yaxis_limits(df)
+
+    create_diagram(y_axis_limits, df.loc['Vostok'], 'Vostok')
+    expected = (tmp_path / 'Vostok.jpg').read_bytes()
+
+    with DiagramTemplate(y_axis_limits) as template:
+        template.render(df.loc['Warsaw'], 'Warsaw.jpg')
+        template.render(df.loc['Vostok'], 'Vostok.jpg')
+    assert (tmp_path / 'Vostok.jpg').read_bytes() == expected
+
+
+def test_main_chunked_output_identical_to_in_memory(tmp_path, monkeypatch):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text('''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6''')
+    in_memory_dir = tmp_path / 'in_memory'
+    chunked_dir = tmp_path / 'chunked'
+    in_memory_dir.mkdir()
+    chunked_dir.mkdir()
+
+    monkeypatch.chdir(in_memory_dir)
+    main(str(data_path))
+    monkeypatch.chdir(chunked_dir)
+    main(str(data_path), chunk_size=1)
+
+    for station in ('Warsaw', 'Vostok'):
+        assert (in_memory_dir / f'{station}.jpg').read_bytes() == (chunked_dir / f'{station}.jpg').read_bytes()
+
+
+@mark.parametrize("settings",
+                  [
+                      RenderSettings(dpi=200),
+                      RenderSettings(dpi=200, file_format='png', backend='fast')
+                  ])
+def test_pyramid_full_resolution_identical_to_single_diagram(tmp_path, settings):
+    data = StringIO('''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1''')
+    df = pd.read_table(data, delimiter=';', index_col=['Station', 'Element'])
+    y_axis_limits = get_yaxis_limits(df)
+    single = settings._replace(output_dir=str(tmp_path / 'single'))
+    pyramid = settings._replace(output_dir=str(tmp_path / 'pyramid'), pyramid=(100, 50))
+    (tmp_path / 'single').mkdir()
+    (tmp_path / 'pyramid').mkdir()
+
+    create_diagram(y_axis_limits, df.loc['Warsaw'], 'Warsaw', single)
+    create_diagram(y_axis_limits, df.loc['Warsaw'], 'Warsaw', pyramid)
+
+    paths = diagram_paths('Warsaw', pyramid)
+    assert [os.path.basename(path) for path in paths] == [f'Warsaw{suffix}.{settings.file_format}'
+                                                          for suffix in ('', '_100dpi', '_50dpi')]
+    assert (tmp_path / 'pyramid' / f'Warsaw.{settings.file_format}').read_bytes() == \
+           (tmp_path / 'single' / f'Warsaw.{settings.file_format}').read_bytes()
+    widths = [Image.open(path).width for path in paths]
+    assert abs(widths[1] - widths[0] / 2) <= 2
+    assert abs(widths[2] - widths[0] / 4) <= 2
+
+
+@mark.parametrize("arguments, error",
+                  [
+                      (['-f', 'svg', '--pyramid', '150'], 'only for raster formats'),
+                      (['--dpi', '150', '--pyramid', '300'], 'lower than diagram resolution'),
+                      (['-b', 'fast', '-f', 'pdf'], 'not supported by fast backend')
+                  ])
+def test_get_render_settings_rejects_invalid_arguments(arguments, error, capsys):
+    parser = argparse.ArgumentParser()
+    add_render_arguments(parser)
+    with raises(SystemExit):
+        get_render_settings(parser, parser.parse_args(arguments))
+    assert error in capsys.readouterr().err
+
+
+def test_get_render_settings():
+    parser = argparse.ArgumentParser()
+    add_render_arguments(parser)
+    args = parser.parse_args(['-b', 'fast', '-f', 'png', '-d', '300', '--output-dir', 'atlas', '--pyramid', '48', '150'])
+    assert get_render_settings(parser, args) == RenderSettings(300, 'png', 'fast', 'atlas', (150, 48))
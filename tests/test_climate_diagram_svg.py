@@ -0,0 +1,69 @@
+from io import StringIO
+from xml.etree import ElementTree
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+from pytest import mark
+
+from climate_diagram_generator import DiagramTemplate, RenderSettings, get_yaxis_limits
+from climate_diagram_svg import SvgDiagramTemplate, get_ticks
+
+DATA = '''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
+Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6'''
+
+
+def get_bars(path) -> tuple[list[int], list[int], list[int]]:
+    """Return bar centers, heights (pixels) and Y of temperature line above bar centers"""
+    image = np.asarray(Image.open(path).convert('RGB')).astype(int)
+    r, g, b = image[..., 0], image[..., 1], image[..., 2]
+    blue = (b > 200) & (r < 80) & (g < 80)
+    red = (r > 200) & (b < 80) & (g < 80)
+    columns = np.flatnonzero(blue.any(axis=0))
+    runs = np.split(columns, np.flatnonzero(np.diff(columns) > 1) + 1)
+    bottom = np.flatnonzero(blue.any(axis=1)).max()
+    centers = [int(run.mean()) for run in runs]
+    heights = [int(bottom - np.flatnonzero(blue[:, c]).min()) for c in centers]
+    line = [int(bottom - np.flatnonzero(red[:, c]).mean()) for c in centers]
+    return [c - centers[0] for c in centers], heights, line
+
+
+@mark.parametrize("vmin, vmax, expected",
+                  [
+                      (0, 100, [0, 20, 40, 60, 80, 100]),
+                      (0, 200, [0, 25, 50, 75, 100, 125, 150, 175, 200]),
+                      (-70, 0, [-70, -60, -50, -40, -30, -20, -10, 0]),
+                      (-5, 20, [-5, 0, 5, 10, 15, 20])
+                  ])
+def test_get_ticks(vmin, vmax, expected):
+    assert get_ticks(vmin, vmax) == expected
+
+
+def test_svg_diagram(tmp_path):
+    df = pd.read_table(StringIO(DATA), delimiter=';', index_col=['Station', 'Element'])
+    with SvgDiagramTemplate(get_yaxis_limits(df), RenderSettings(file_format='svg', backend='fast')) as template:
+        template.render(df.loc['Sydney'], tmp_path / 'Sydney.svg')
+    svg = ElementTree.parse(tmp_path / 'Sydney.svg').getroot()
+    namespace = {'svg': 'http://www.w3.org/2000/svg'}
+    assert len(svg.findall('svg:g/svg:rect', namespace)) == 12
+    assert len(svg.find('svg:polyline', namespace).get('points').split()) == 12
+    assert 'Mean 18.8 °C, Sum  1147.1 mm' in [text.text for text in svg.iter('{http://www.w3.org/2000/svg}text')]
+
+
+@mark.parametrize("station", ['Sydney', 'Vostok'])
+def test_fast_png_matches_matplotlib(tmp_path, station):
+    df = pd.read_table(StringIO(DATA), delimiter=';', index_col=['Station', 'Element'])
+    y_axis_limits = get_yaxis_limits(df)
+    with DiagramTemplate(y_axis_limits, RenderSettings(dpi=100, file_format='png')) as template:
+        template.render(df.loc[station], tmp_path / 'matplotlib.png')
+    with SvgDiagramTemplate(y_axis_limits, RenderSettings(dpi=100, file_format='png', backend='fast')) as template:
+        template.render(df.loc[station], tmp_path / 'fast.png')
+
+    expected_centers, expected_heights, expected_line = get_bars(tmp_path / 'matplotlib.png')
+    centers, heights, line = get_bars(tmp_path / 'fast.png')
+    assert np.allclose(centers, expected_centers, atol=2)
+    assert np.allclose(heights, expected_heights, atol=2)
+    assert np.allclose(line, expected_line, atol=5)
@@ -0,0 +1,63 @@
+import threading
+
+import pandas as pd
+
+import climate_pipeline
+from climate_data_unit_converter import main as convert_main
+from climate_diagram_generator import main as diagram_main
+from climate_pipeline import main
+
+
+def test_main_output_identical_to_converter_and_generator(tmp_path, monkeypatch):
+    input_path = tmp_path / 'data_f_inch.csv'
+    input_path.write_text('''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;29.3;31.3;37.8;48.6;57.7;63.9;67.5;66.4;57.2;47.7;38.8;31.8
+Warsaw;Precipitation;1.22;1.17;1.14;1.38;2.19;2.06;1.58;1.81;1.98;1.58;1.42;1.42
+Vostok;Temp;-25.1;-47.6;-72.8;-84.1;-86.3;-86.8;-86.6;-89.3;-87.0;-69.7;-42.9;-24.0
+Vostok;Precipitation;0.07;0.04;0.07;0.11;0.11;0.09;0.07;0.07;0.07;0.1;0.06;0.06''')
+    two_step_dir = tmp_path / 'two_step'
+    pipeline_dir = tmp_path / 'pipeline'
+    two_step_dir.mkdir()
+    pipeline_dir.mkdir()
+
+    monkeypatch.chdir(two_step_dir)
+    convert_main(str(input_path), 'data_c_mm.csv', 'C_mm', use_snapshot=False)
+    # converter writes comma separated values, diagram generator reads semicolon separated ones
+    pd.read_csv('data_c_mm.csv', index_col=['Station', 'Element']).to_csv('diagram_data.csv', sep=';')
+    diagram_main('diagram_data.csv', use_snapshot=False)
+    monkeypatch.chdir(pipeline_dir)
+    main(str(input_path), 'data_c_mm.csv', use_snapshot=False)
+
+    assert (pipeline_dir / 'data_c_mm.csv').read_bytes() == (two_step_dir / 'data_c_mm.csv').read_bytes()
+    for station in ('Warsaw', 'Vostok'):
+        assert (pipeline_dir / f'{station}.jpg').read_bytes() == (two_step_dir / f'{station}.jpg').read_bytes()
+
+
+def test_main_without_output_creates_only_diagrams(tmp_path, monkeypatch):
+    input_path = tmp_path / 'data_f_inch.csv'
+    input_path.write_text('''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;29.3;31.3;37.8;48.6;57.7;63.9;67.5;66.4;57.2;47.7;38.8;31.8
+Warsaw;Precipitation;1.22;1.17;1.14;1.38;2.19;2.06;1.58;1.81;1.98;1.58;1.42;1.42''')
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    monkeypatch.chdir(output_dir)
+
+    main(str(input_path), use_cache=False, use_snapshot=False)
+
+    assert sorted(path.name for path in output_dir.iterdir()) == ['.climate_diagrams.json', 'Warsaw.jpg']
+
+
+def test_main_with_workers_writes_output_after_diagrams(tmp_path, monkeypatch):
+    input_path = tmp_path / 'data_f_inch.csv'
+    input_path.write_text('''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;29.3;31.3;37.8;48.6;57.7;63.9;67.5;66.4;57.2;47.7;38.8;31.8
+Warsaw;Precipitation;1.22;1.17;1.14;1.38;2.19;2.06;1.58;1.81;1.98;1.58;1.42;1.42''')
+    monkeypatch.chdir(tmp_path)
+    threads_at_render = []
+    monkeypatch.setattr(climate_pipeline, 'create_diagrams',
+                        lambda *args: threads_at_render.append(threading.active_count()))
+
+    main(str(input_path), 'data_c_mm.csv', workers=2, use_snapshot=False)
+
+    assert threads_at_render == [threading.active_count()]  # no writing thread while render processes start
+    assert (tmp_path / 'data_c_mm.csv').read_text().startswith('Station,Element,Jan')
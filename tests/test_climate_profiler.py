@@ -0,0 +1,116 @@
+import csv
+import json
+
+from pytest import mark
+
+from climate_diagram_generator import main
+from climate_profiler import (
+    NULL_PROFILER,
+    PhaseTimer,
+    Profiler,
+    Stopwatch,
+    Timing,
+    get_hwm,
+    get_peak_rss,
+    get_rss
+)
+
+
+def test_profiler_report_percentiles_and_slowest():
+    profiler = Profiler()
+    with profiler.stage('load'):
+        pass
+    for i in range(1, 101):
+        profiler.add_item(f'station{i}', Timing(wall=i / 100, cpu=i / 200, rss_delta=i), {'draw': i / 400})
+
+    report = profiler.report(num_slowest=3)
+
+    assert list(report['stages']) == ['load']
+    assert report['items']['count'] == 100
+    assert report['items']['wall_percentiles']['p50'] == 0.505
+    assert round(report['items']['wall_percentiles']['p99'], 4) == 0.9901
+    assert [item['station'] for item in report['slowest']] == ['station100', 'station99', 'station98']
+    assert report['slowest'][0]['draw_wall'] == 0.25
+    assert report['items']['phase_wall_totals'] == {'draw': sum(range(1, 101)) / 400}
+
+
+@mark.skipif(get_rss() is None, reason='RSS is not available on this platform')
+def test_stopwatch_measures_rss_increase_of_block():
+    with Stopwatch() as stopwatch:
+        data = bytearray(64 << 20)
+        data[::4096] = b'x' * len(data[::4096])  # touch every page
+    assert stopwatch.timing.rss_delta >= 32 << 20
+    with Stopwatch() as stopwatch:
+        pass
+    assert stopwatch.timing.rss_delta < 32 << 20  # not the high-water mark of the process
+
+
+def allocate(size: int) -> None:
+    data = bytearray(size)
+    data[::4096] = b'x' * len(data[::4096])  # touch every page
+
+
+@mark.skipif(get_hwm() is None, reason='RSS high-water mark is not available on this platform')
+def test_stopwatch_measures_transient_peak_rss_of_nested_blocks():
+    with Stopwatch() as outer:
+        allocate(96 << 20)  # freed before inner block starts
+        with Stopwatch() as inner:
+            allocate(64 << 20)
+        with Stopwatch() as empty:
+            pass
+    if outer.timing.rss_peak is None:  # high-water mark can not be reset
+        return
+    assert inner.timing.rss_peak - inner.timing.rss_delta >= 48 << 20  # freed at the end of block
+    assert outer.timing.rss_peak >= inner.timing.rss_peak + (16 << 20)
+    assert empty.timing.rss_peak < inner.timing.rss_peak - (32 << 20)
+    assert get_peak_rss() >= outer.timing.rss_peak
+
+
+def test_phase_timer_adds_up_repeated_phases():
+    timer = PhaseTimer()
+    for _ in range(3):
+        with timer.phase('draw'):
+            pass
+        with timer.phase('save'):
+            pass
+    assert list(timer.walls) == ['draw', 'save']
+    assert all(wall > 0 for wall in timer.walls.values())
+
+
+def test_null_profiler_does_nothing(tmp_path):
+    with NULL_PROFILER.stage('load'):
+        pass
+    NULL_PROFILER.add_item('Warsaw', Timing(1.0, 1.0, None))
+    NULL_PROFILER.save(str(tmp_path / 'report.json'))
+
+    assert not NULL_PROFILER.enabled
+    assert not (tmp_path / 'report.json').exists()
+
+
+def test_main_profile_reports(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text('''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6''')
+
+    main(str(data_path), use_cache=False, profile_path='report.json')
+    main(str(data_path), use_cache=False, profile_path='report.csv')
+
+    report = json.loads((tmp_path / 'report.json').read_text())
+    assert list(report['stages']) == ['load', 'validate', 'limits', 'statistics', 'render']
+    assert report['items']['count'] == 2
+    assert set(report['items']['phase_wall_totals']) == {'setup', 'draw', 'save'}
+    assert all(wall > 0 for wall in report['items']['phase_wall_totals'].values())
+    assert all(item['draw_wall'] + item['save_wall'] <= item['wall'] for item in report['slowest'])
+    assert {item['station'] for item in report['slowest']} == {'Warsaw', 'Vostok'}
+
+    with open(tmp_path / 'report.csv', newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f, delimiter=';'))
+    assert [row['name'] for row in rows if row['record'] == 'station'] == ['Warsaw', 'Vostok']
+    assert all(float(row['save_wall']) > 0 for row in rows if row['record'] == 'station')
+    peaks = [row['rss_peak'] for row in rows if row['record'] in ('stage', 'station')]
+    assert all(int(peak) > 0 for peak in peaks) or not any(peaks)  # empty if RSS high-water mark can not be reset
+    assert [row['name'] for row in rows if row['record'] == 'percentile'] == ['p50', 'p95', 'p99']
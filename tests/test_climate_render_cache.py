@@ -0,0 +1,54 @@
+from io import StringIO
+import pandas as pd
+
+from climate_render_cache import RenderCache
+
+DATA = '''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1'''
+
+
+def get_station_data() -> pd.DataFrame:
+    df = pd.read_table(StringIO(DATA), delimiter=';', index_col=['Station', 'Element'])
+    return df.loc['Warsaw']
+
+
+def test_render_cache_hit_after_save(tmp_path):
+    station_data = get_station_data()
+    diagram = tmp_path / 'Warsaw.jpg'
+    diagram.write_bytes(b'')
+
+    cache = RenderCache(tmp_path, (-5, 20, 100), (600, 'jpg'))
+    key = cache.key(station_data)
+    assert not cache.is_fresh('Warsaw', key, diagram)
+    cache.update('Warsaw', key)
+    cache.save()
+
+    cache = RenderCache(tmp_path, (-5, 20, 100), (600, 'jpg'))
+    assert cache.is_fresh('Warsaw', cache.key(station_data), diagram)
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_render_cache_miss_on_changed_data_or_missing_file(tmp_path):
+    station_data = get_station_data()
+    diagram = tmp_path / 'Warsaw.jpg'
+    diagram.write_bytes(b'')
+    cache = RenderCache(tmp_path, (-5, 20, 100), (600, 'jpg'))
+    cache.update('Warsaw', cache.key(station_data))
+
+    changed_data = station_data.copy()
+    changed_data.loc['Temp', 'Jan'] = -1.6
+    assert not cache.is_fresh('Warsaw', cache.key(changed_data), diagram)
+
+    diagram.unlink()
+    assert not cache.is_fresh('Warsaw', cache.key(station_data), diagram)
+
+
+def test_render_cache_invalidated_by_yaxis_limits(tmp_path):
+    cache = RenderCache(tmp_path, (-5, 20, 100), (600, 'jpg'))
+    cache.update('Warsaw', cache.key(get_station_data()))
+    cache.save()
+
+    assert RenderCache(tmp_path, (-5, 20, 100), (600, 'jpg')).entries
+    assert not RenderCache(tmp_path, (-10, 20, 100), (600, 'jpg')).entries
+    assert not RenderCache(tmp_path, (-5, 20, 100), (150, 'jpg')).entries
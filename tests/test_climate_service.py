@@ -0,0 +1,131 @@
+from urllib.error import HTTPError
+from urllib.request import (
+    Request,
+    urlopen
+)
+import json
+import os
+import threading
+
+from pytest import (
+    fixture,
+    mark,
+    raises
+)
+
+import climate_service
+from climate_diagram_generator import RenderSettings
+from climate_service import (
+    ClimateService,
+    get_token_path,
+    read_token,
+    save_token,
+    submit_job
+)
+
+DATA = '''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
+Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73
+'''
+
+
+@fixture
+def port(tmp_path, monkeypatch):
+    monkeypatch.setattr(climate_service, 'TOKEN_DIR', tmp_path / 'tokens')
+    service = ClimateService(port=0, workers=2)
+    save_token(service.server_address[1], service.token)
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    yield service.server_address[1]
+    service.shutdown()
+    service.server_close()
+    thread.join()
+
+
+def test_render_job(tmp_path, port):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA)
+    settings = RenderSettings(dpi=20, output_dir=str(tmp_path / 'diagrams'), pyramid=(10,))
+    params = {'data_path': str(data_path), 'settings': settings._asdict()}
+    expected = [str(tmp_path / 'diagrams' / name)
+                for name in ('Sydney.jpg', 'Sydney_10dpi.jpg', 'Warsaw.jpg', 'Warsaw_10dpi.jpg')]
+
+    result = submit_job('render', params, port, timeout=60)
+    assert sorted(result['outputs']) == expected
+    assert result['errors'] == {}
+    assert all((tmp_path / 'diagrams' / name).exists() for name in expected)
+    # diagrams up to date - skipped by cache, but still returned
+    assert sorted(submit_job('render', params, port, timeout=60)['outputs']) == expected
+
+
+def test_convert_job(tmp_path, port):
+    input_path = tmp_path / 'input.csv'
+    input_path.write_text(DATA)
+    params = {'input_path': str(input_path), 'output_path': str(tmp_path / 'output.csv'), 'target_unit': 'F_inch'}
+    assert submit_job('convert', params, port, timeout=60) == {'outputs': [params['output_path']], 'errors': {}}
+    assert 'Warsaw,Temp,29.3' in (tmp_path / 'output.csv').read_text()
+
+
+def test_invalid_jobs(tmp_path, port):
+    input_path = tmp_path / 'input.csv'
+    input_path.write_text(DATA + 'Rome;Temp;7.5;8.2;10.2;12.6;17.2;21.1;24.1;24.5;20.8;16.4;11.4;x\n')
+    params = {'input_path': str(input_path), 'output_path': str(tmp_path / 'output.csv'), 'target_unit': 'F_inch'}
+    with raises(RuntimeError, match='1 invalid station'):
+        submit_job('convert', params, port, timeout=60)
+    assert submit_job('convert', {**params, 'skip_invalid': True}, port, timeout=60)['outputs']
+
+    with raises(RuntimeError, match='Invalid request'):
+        submit_job('convert', {**params, 'unit': 'F_inch'}, port, timeout=60)
+    with raises(RuntimeError, match='Unknown job'):
+        submit_job('plot', params, port, timeout=60)
+    with raises(RuntimeError, match='Invalid request'):
+        submit_job('convert', [params['input_path']], port, timeout=60)
+    for settings in ({'colour': 'red'}, {'dpi': '600'}, {'pyramid': 300}, {'dpi': 300, 'pyramid': [300]},
+                     {'file_format': 'pdf'}, {'file_format': 'svg', 'pyramid': [300]}, []):
+        with raises(RuntimeError, match='^Invalid request: '):
+            submit_job('render', {'data_path': str(input_path), 'settings': settings}, port, timeout=60)
+
+
+def test_status_counts_finished_jobs(tmp_path, port):
+    input_path = tmp_path / 'input.csv'
+    input_path.write_text(DATA)
+    threads = [threading.Thread(target=submit_job, args=('convert', {
+        'input_path': str(input_path), 'output_path': str(tmp_path / f'output{i}.csv'), 'target_unit': 'F_inch'
+    }, port, 60)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with urlopen(f'http://127.0.0.1:{port}/status', timeout=60) as response:
+        assert json.loads(response.read()) == {'workers': 2, 'jobs': 8}
+
+
+@mark.parametrize("headers, status", [
+    ({'Content-Type': 'text/plain'}, 415),  # simple cross-site request
+    ({'Content-Type': 'application/json'}, 403),
+    ({'Content-Type': 'application/json', 'X-Climate-Token': 'guessed'}, 403)
+])
+def test_job_request_without_json_or_token_rejected(tmp_path, port, headers, status):
+    params = {'input_path': str(tmp_path / 'input.csv'), 'output_path': str(tmp_path / 'output.csv'),
+              'target_unit': 'F_inch'}
+    (tmp_path / 'input.csv').write_text(DATA)
+    request = Request(f'http://127.0.0.1:{port}/convert', data=json.dumps(params).encode('utf-8'), headers=headers,
+                      method='POST')
+    with raises(HTTPError) as error:
+        urlopen(request, timeout=60)  # pylint: disable=consider-using-with
+    assert error.value.code == status
+    assert not (tmp_path / 'output.csv').exists()
+    with raises(RuntimeError, match='wrong token'):
+        submit_job('convert', params, port, timeout=60, token='guessed')
+
+
+def test_token_file_readable_only_by_user(tmp_path, monkeypatch):
+    monkeypatch.setattr(climate_service, 'TOKEN_DIR', tmp_path / 'tokens')
+    save_token(8765, 'old')
+    os.chmod(get_token_path(8765), 0o644)
+    save_token(8765, 'new')
+    assert read_token(8765) == 'new'
+    assert get_token_path(8765).stat().st_mode & 0o777 == 0o600
+    assert read_token(8766) is None
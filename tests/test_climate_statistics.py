@@ -0,0 +1,119 @@
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+from pytest import mark
+
+import climate_diagram_generator
+from climate_diagram_generator import (
+    RenderSettings,
+    YAxisLimits
+)
+from climate_diagram_svg import SvgDiagramTemplate
+from climate_statistics import (
+    compute_statistics,
+    get_annual_values,
+    get_station_statistics,
+    iter_statistics,
+    main
+)
+
+DATA = '''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
+Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6
+Singapore;Temp;26.5;27.1;27.5;28.0;28.3;28.3;27.9;27.9;27.6;27.6;26.9;26.4
+Singapore;Precipitation;242;162;185;179;172;162;158;176;169;194;256;288
+Cairo;Temp;14.0;15.1;17.6;21.3;24.7;27.1;27.6;27.7;26.1;23.0;18.7;15.2
+Cairo;Precipitation;5;3.8;3.8;1.1;0.5;0.1;0;0;0;0.7;3.8;5.9
+Rome;Temp;7.5;8.2;10.2;12.6;17.2;21.1;24.1;24.5;20.8;16.4;11.4;8.4
+Rome;Precipitation;67;73;58;81;53;34;19;37;73;113;115;81
+Yakutsk;Temp;-38.6;-33.8;-20.1;-4.8;7.5;16.4;19.5;15.2;6.1;-7.8;-27.0;-37.6
+Yakutsk;Precipitation;9;8;7;10;19;33;40;41;25;19;14;10
+Hong Kong;Temp;16.3;16.8;19.1;22.6;25.9;27.9;28.8;28.6;27.7;25.5;21.8;17.9
+Hong Kong;Precipitation;33;34;74;137;292;490;375;445;314;126;31;26
+Darwin;Temp;28.3;28.1;28.2;28.0;26.6;24.9;24.6;25.6;27.6;29.0;29.3;29.0
+Darwin;Precipitation;467;422;318;102;22;1;1;6;16;69;142;259'''
+
+
+def get_data(dtype=np.float64) -> pd.DataFrame:
+    df = pd.read_csv(StringIO(DATA), sep=';', index_col=['Station', 'Element'])
+    return df.astype(dtype)
+
+
+@mark.parametrize("station, koppen", [
+    ('Sydney', 'Cfa'),
+    ('Warsaw', 'Dfb'),
+    ('Vostok', 'EF'),
+    ('Singapore', 'Af'),
+    ('Cairo', 'BWh'),
+    ('Rome', 'Csa'),
+    ('Yakutsk', 'Dfd'),
+    ('Hong Kong', 'Cwa'),
+    ('Darwin', 'Aw')
+])
+def test_koppen_class(station, koppen):
+    assert compute_statistics(get_data()).loc[station, 'Koppen'] == koppen
+
+
+def test_compute_statistics():
+    statistics = compute_statistics(get_data())
+    assert list(statistics.index) == list(get_data().index.unique(level='Station'))
+    assert statistics.loc['Sydney'].tolist() == [18.8, 13.4, 23.5, 10.1, 1147.1, 'Sep', 'Jun', 'Cfa']
+
+
+def test_station_statistics_same_as_vectorized():
+    rng = np.random.default_rng(0)
+    stations = [f'Station {i}' for i in range(500)]
+    index = pd.MultiIndex.from_product([stations, ['Temp', 'Precipitation']], names=['Station', 'Element'])
+    values = np.round(rng.uniform(-40, 40, (1000, 12)), 1)
+    values[1::2] = np.abs(values[1::2]) * 5
+    climate_data = pd.DataFrame(values, index=index, columns=get_data().columns).astype(np.float32)
+
+    statistics = dict(iter_statistics(compute_statistics(climate_data)))
+    for station in stations:
+        station_data = climate_data.loc[station]
+        assert get_station_statistics(station_data) == statistics[station]
+        assert get_annual_values(station_data) == (statistics[station].mean_temp, statistics[station].sum_precip)
+
+
+@mark.parametrize("dtype", [np.float32, np.float64])
+def test_statistics_of_float32_values_same_as_of_parsed_values(dtype):
+    # mean of float32 values converted to float64 is -9.349999..., of parsed values -9.35 rounded to -9.4
+    tie = 'Tie;Temp;6.5;-21.2;-10.1;31.0;8.7;3.9;-35.1;-36.1;-24.1;-29.7;33.8;-39.8\nTie;Precipitation' + ';1' * 12
+    climate_data = pd.read_csv(StringIO(DATA + '\n' + tie), sep=';', index_col=['Station', 'Element']).astype(dtype)
+    assert get_annual_values(climate_data.loc['Tie']) == (-9.4, 12)
+    assert get_station_statistics(climate_data.loc['Tie']).mean_temp == -9.4
+    assert compute_statistics(climate_data).loc['Tie', 'MeanTemp'] == -9.4
+    assert compute_statistics(climate_data).drop(index='Tie').equals(compute_statistics(get_data()))
+
+
+def test_precomputed_statistics_render_same_diagram(tmp_path):
+    climate_data = get_data(np.float32)
+    statistics = dict(iter_statistics(compute_statistics(climate_data)))
+    settings = RenderSettings(file_format='svg', backend='fast')
+    with SvgDiagramTemplate(YAxisLimits(tmin=-70, tmax=40, pmax=500), settings) as template:
+        template.render(climate_data.loc['Rome'], tmp_path / 'computed.svg')
+        template.render(climate_data.loc['Rome'], tmp_path / 'precomputed.svg', statistics['Rome'])
+    assert (tmp_path / 'computed.svg').read_bytes() == (tmp_path / 'precomputed.svg').read_bytes()
+
+
+def test_main_saves_statistics(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'data.csv').write_text(DATA)
+
+    main('data.csv', 'statistics.csv', use_snapshot=False)
+    climate_diagram_generator.main('data.csv', settings=RenderSettings(dpi=20), use_snapshot=False,
+                                   statistics_path='generator_statistics.csv')
+
+    lines = (tmp_path / 'statistics.csv').read_text().splitlines()
+    assert lines[0] == 'Station;MeanTemp;MinTemp;MaxTemp;TempAmplitude;SumPrecip;DriestMonth;WettestMonth;Koppen'
+    assert lines[1] == 'Sydney;18.8;13.4;23.5;10.1;1147.1;Sep;Jun;Cfa'
+    assert len(lines) == 10
+    generator_statistics = pd.read_csv(tmp_path / 'generator_statistics.csv', sep=';', index_col='Station')
+    statistics = pd.read_csv(tmp_path / 'statistics.csv', sep=';', index_col='Station')
+    assert generator_statistics.columns.equals(statistics.columns)
+    assert generator_statistics['Koppen'].equals(statistics['Koppen'])
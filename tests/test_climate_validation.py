@@ -0,0 +1,130 @@
+import gc
+import weakref
+
+from pytest import (
+    mark,
+    raises
+)
+
+import climate_data_unit_converter
+import climate_diagram_generator
+from climate_data_loader import read_climate_csv
+from climate_data_stream import read_chunks
+from climate_diagram_generator import RenderSettings
+from climate_validation import (
+    InvalidDataError,
+    ValidationIssue,
+    validate_chunks,
+    validate_climate_data
+)
+
+DATA = '''Station;Element;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec
+Warsaw;Temp;-1.5;-0.4;3.2;9.2;14.3;17.7;19.7;19.1;14.0;8.7;3.8;-0.1
+Warsaw;Precipitation;31.0;29.8;29.0;35.1;55.5;52.4;40.1;46.0;50.4;40.2;36.0;36.1
+Vostok;Temp;-31.7;-44.2;-58.2;-64.5;-65.7;-66.0;-65.9;-67.4;-66.1;-56.5;-41.6;-31.1
+Vostok;Precipitation;1.7;1.1;1.9;2.7;2.8;2.4;1.9;1.8;1.9;2.5;1.6;1.6
+Sydney;Temp;23.5;23.4;22.1;19.5;16.6;14.2;13.4;14.5;17;18.9;20.4;22.1
+Sydney;Precipitation;91.1;131.5;117.5;114.1;100.8;142;80.3;75.1;63.4;67.7;90.6;73
+'''
+
+INVALID_DATA = DATA + '''Lima;Temp;22.5;23.4;23.0;21.0;19.3;17.7;16.8;16.5;16.9;17.8;19.1;21.0
+Oslo;Temp;-4.3;-4.0;-0.2;4.5;10.8;15.2;16.4;15.2;10.8;6.3;0.7;-3.1
+Oslo;Precipitation;49;36;47;41;53;65;81;89;90;84;73;55
+Oslo;Precipitation;49;36;47;41;53;65;81;89;90;84;73;55
+Rome;Temp;7.5;8.2;10.2;12.6;17.2;21.1;24.1;24.5;20.8;16.4;11.4;8.4
+Rome;Precipitation;67;73;58;81;53;34;19;37;73;x;115;81
+Cairo;Temp;14.0;15.1;17.6;21.3;24.7;27.1;27.6;27.7;26.1;23.0;;15.2
+Cairo;Precipitation;5;3.8;3.8;1.1;0.5;0.1;0;0;0;0.7;3.8;5.9
+Mars;Temp;-60.0;-60.0;-60.0;-60.0;-60.0;-60.0;-60.0;-60.0;-60.0;-60.0;-60.0;-125.0
+Mars;Precipitation;0;0;0;0;0;0;0;0;-1;-1;0;0
+'''
+
+ISSUES = [
+    ValidationIssue('Oslo', 'Precipitation', 'duplicate'),
+    ValidationIssue('Lima', 'Precipitation', 'missing_element'),
+    ValidationIssue('Rome', 'Precipitation', 'non_numeric', 'Oct'),
+    ValidationIssue('Cairo', 'Temp', 'missing_value', 'Nov'),
+    ValidationIssue('Mars', 'Temp', 'out_of_range', 'Dec'),
+    ValidationIssue('Mars', 'Precipitation', 'out_of_range', 'Sep Oct')
+]
+
+
+def test_valid_data(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA)
+    report = validate_climate_data(read_climate_csv(data_path))
+    assert (report.rows, report.stations, report.issues) == (6, 3, [])
+
+
+def test_validate_climate_data(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(INVALID_DATA)
+    report = validate_climate_data(read_climate_csv(data_path))
+    assert report.stations == 8
+    assert report.issues == ISSUES
+    assert report.invalid_stations == ['Oslo', 'Lima', 'Rome', 'Cairo', 'Mars']
+
+
+@mark.parametrize("chunk_size", [1, 4, 100])
+def test_validate_chunks(tmp_path, chunk_size):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(INVALID_DATA)
+    report = validate_chunks(read_chunks(str(data_path), chunk_size))
+    assert (report.rows, report.stations) == (16, 8)
+    assert sorted(report.issues) == sorted(ISSUES)
+
+
+def test_out_of_range_depends_on_unit(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(DATA.replace('Sydney;Temp;23.5', 'Sydney;Temp;123.5'))
+    assert validate_climate_data(read_climate_csv(data_path), 'C_mm').invalid_stations == ['Sydney']
+    assert validate_climate_data(read_climate_csv(data_path), 'F_inch').issues == []
+
+
+@mark.parametrize("chunk_size", [None, 3])
+def test_generator_stops_on_invalid_data(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'data.csv').write_text(INVALID_DATA)
+    with raises(InvalidDataError, match='5 invalid station'):
+        climate_diagram_generator.main('data.csv', chunk_size=chunk_size, settings=RenderSettings(dpi=20))
+    assert not list(tmp_path.glob('*.jpg'))
+
+
+@mark.parametrize("chunk_size", [None, 3])
+def test_generator_skips_invalid_stations(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'data.csv').write_text(INVALID_DATA)
+    climate_diagram_generator.main('data.csv', chunk_size=chunk_size, settings=RenderSettings(dpi=20),
+                                   skip_invalid=True)
+    assert sorted(path.name for path in tmp_path.glob('*.jpg')) == ['Sydney.jpg', 'Vostok.jpg', 'Warsaw.jpg']
+
+
+@mark.parametrize("chunk_size", [None, 3])
+def test_converter_skips_invalid_stations(tmp_path, chunk_size):
+    input_path = tmp_path / 'input.csv'
+    input_path.write_text(INVALID_DATA)
+    with raises(InvalidDataError):
+        climate_data_unit_converter.main(str(input_path), str(tmp_path / 'output.csv'), 'F_inch', chunk_size)
+    assert not (tmp_path / 'output.csv').exists()
+
+    climate_data_unit_converter.main(str(input_path), str(tmp_path / 'output.csv'), 'F_inch', chunk_size,
+                                     skip_invalid=True)
+    output = (tmp_path / 'output.csv').read_text().splitlines()
+    assert [line.split(',')[0] for line in output[1:]] == ['Sydney'] * 2 + ['Vostok'] * 2 + ['Warsaw'] * 2
+
+
+def test_validate_chunks_does_not_keep_rows(tmp_path):
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(INVALID_DATA)
+    indexes = []
+
+    def chunks():
+        for chunk in read_chunks(str(data_path), 2):
+            gc.collect()
+            assert all(index() is None for index in indexes[:-1])  # only the previous chunk may be still referenced
+            indexes.append(weakref.ref(chunk.index))
+            yield chunk
+
+    report = validate_chunks(chunks())
+    assert len(indexes) == 8
+    assert sorted(report.issues) == sorted(ISSUES)
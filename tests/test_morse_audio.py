@@ -0,0 +1,50 @@
+import wave
+
+import numpy as np
+from pytest import (
+    mark,
+    raises
+)
+
+from morse_audio import (
+    AudioSettings,
+    save_morse_audio,
+    synthesize
+)
+from morse_encoder import encode_text
+
+
+@mark.parametrize("code, duration_ms", [
+    (".", 70 + 70),
+    ("_", 210 + 70),
+    (". .", 70 + 70 + 240 + 70 + 70),
+    ("_ . / .", 210 + 70 + 240 + 70 + 70 + 240 + 490 + 240 + 70 + 70)
+])
+def test_duration(code, duration_ms):
+    assert synthesize(code).size == duration_ms * 8
+
+
+def test_wpm_scales_timing():
+    # dit 1200 / 20 = 60 ms, pause after it 60 ms
+    assert synthesize(".", AudioSettings(wpm=20, sample_rate=1000)).size == 120
+
+
+def test_tone():
+    samples = synthesize("_", AudioSettings(frequency=600, sample_rate=8000, ramp_ms=5))
+    tone = samples[:210 * 8]
+    assert np.all(samples[210 * 8:] == 0)
+    assert abs(int(tone[0])) < 10 and abs(int(tone[-1])) < 200  # raised-cosine rise and fall
+    spectrum = np.abs(np.fft.rfft(tone))
+    assert np.fft.rfftfreq(tone.size, 1 / 8000)[spectrum.argmax()] == 600
+
+
+def test_invalid_code():
+    with raises(ValueError, match="Not a Morse code character"):
+        synthesize("._x")
+
+
+def test_save_morse_audio(tmp_path):
+    duration = save_morse_audio(encode_text("SOS"), str(tmp_path / "sos.wav"), AudioSettings(sample_rate=16000))
+    with wave.open(str(tmp_path / "sos.wav"), "rb") as f:
+        assert (f.getnchannels(), f.getsampwidth(), f.getframerate()) == (1, 2, 16000)
+        assert f.getnframes() / 16000 == duration
@@ -0,0 +1,109 @@
+import wave
+
+import numpy as np
+from pytest import (
+    approx,
+    mark,
+    raises
+)
+
+from morse_audio import (
+    AudioSettings,
+    save_morse_audio,
+    synthesize
+)
+from morse_audio_decoder import (
+    decode_audio,
+    decode_wav,
+    get_runs
+)
+from morse_decoder import InvalidSymbolError
+from morse_encoder import encode_text
+
+TEXT = "THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG"
+
+
+def to_float(samples):
+    return samples.astype(np.float32) / 32768
+
+
+@mark.parametrize("settings", [
+    AudioSettings(),
+    AudioSettings(wpm=10),
+    AudioSettings(wpm=40),
+    AudioSettings(frequency=700, sample_rate=11025),
+    AudioSettings(ramp_ms=0)
+])
+def test_round_trip(settings):
+    code = encode_text(TEXT)
+    decoding = decode_audio([to_float(synthesize(code, settings))], settings.sample_rate)
+    assert decoding.code == code
+    assert decoding.text == TEXT
+    assert decoding.frequency == approx(settings.frequency, abs=settings.sample_rate / 2048)
+    assert decoding.wpm == approx(settings.wpm or 1200 / 70, rel=0.05)
+
+
+def test_noise():
+    samples = to_float(synthesize(encode_text(TEXT)))
+    noise = np.random.default_rng(0).normal(0, 0.2, samples.size).astype(np.float32)
+    assert decode_audio([samples + noise], 8000, frequency=400).text == TEXT
+
+
+def test_speed_drift():
+    slow = synthesize(encode_text("SLOW START") + " / ", AudioSettings(wpm=10))
+    fast = synthesize(encode_text("FAST FINISH WITH MORE WORDS"), AudioSettings(wpm=30))
+    assert decode_audio([to_float(np.concatenate((slow, fast)))], 8000).text == "SLOW START FAST FINISH WITH MORE WORDS"
+
+
+def test_blocks():
+    samples = to_float(synthesize(encode_text(TEXT)))
+    blocks = np.array_split(samples, np.arange(400, samples.size, 400))  # 10 frames of 5 ms
+    assert decode_audio(blocks, 8000).text == TEXT
+
+
+def test_silence():
+    decoding = decode_audio([np.zeros(8000, dtype=np.float32)], 8000, frequency=400)
+    assert decoding.code == decoding.text == ""
+    assert decoding.wpm == 0
+
+
+def test_get_runs():
+    states, lengths = get_runs(np.array([0, 0, 1, 1, 1, 0, 1], dtype=bool))
+    assert states.tolist() == [False, True, False, True]
+    assert lengths.tolist() == [2, 3, 1, 1]
+
+
+def test_invalid_symbol():
+    samples = to_float(synthesize("...... / ..."))
+    assert decode_audio([samples], 8000, policy="replace").text == "� S"
+    assert decode_audio([samples], 8000, policy="skip").invalid == 1
+    with raises(InvalidSymbolError):
+        decode_audio([samples], 8000, policy="error")
+
+
+@mark.parametrize("channels, width", [
+    (1, 2),
+    (2, 2),
+    (1, 1),
+    (1, 4)
+])
+def test_decode_wav(tmp_path, channels, width):
+    samples = synthesize(encode_text(TEXT)).astype(np.int32)
+    if width == 1:
+        data = (samples // 256 + 128).astype(np.uint8)
+    else:
+        data = (samples << 16) if width == 4 else samples.astype(np.int16)
+    data = np.repeat(data, channels).astype(data.dtype.newbyteorder("<"))
+    path = str(tmp_path / "message.wav")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(width)
+        f.setframerate(8000)
+        f.writeframes(data.tobytes())
+    assert decode_wav(path).text == TEXT
+
+
+def test_decode_saved_audio(tmp_path):
+    path = str(tmp_path / "message.wav")
+    save_morse_audio(encode_text("SOS"), path, AudioSettings(wpm=25))
+    assert decode_wav(path).text == "SOS"
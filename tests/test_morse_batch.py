@@ -0,0 +1,92 @@
+import random
+import string
+
+from pytest import (
+    mark,
+    raises
+)
+
+from morse_batch import (
+    EncodingResult,
+    encode_batch,
+    encode_messages
+)
+from morse_encoder import (
+    check_message,
+    encode_text
+)
+
+CHARS = string.ascii_letters + string.digits + ".,:?'-/()\"=+@ "
+
+
+def get_messages(seed, count):
+    rng = random.Random(seed)
+    return ["".join(rng.choices(CHARS, k=rng.randrange(1, 50))).strip() or "E" for _ in range(count)]
+
+
+def test_same_as_encode_text():
+    messages = get_messages(0, 1000)
+    assert encode_messages(messages) == [EncodingResult(encode_text(message)) for message in messages]
+
+
+@mark.parametrize("policy", ["error", "skip", "replace"])
+def test_empty_and_blank_messages_fail(policy):
+    assert encode_messages([], policy) == []
+    assert encode_messages(["", "a", " ", "  "], policy) == [
+        EncodingResult(None, 0, "Empty message"),
+        EncodingResult("._"),
+        EncodingResult(None, 0, "Empty message"),
+        EncodingResult(None, 0, "Empty message")
+    ]
+    assert not any(map(check_message, ["", " "]))
+
+
+def test_line_breaks_are_unsupported():
+    assert encode_messages(["AB\nC", "A\rB"]) == [
+        EncodingResult(None, 1, "Unsupported character '\\n' at position 2"),
+        EncodingResult(None, 1, "Unsupported character '\\r' at position 1")
+    ]
+    assert encode_messages(["AB\nC", "A\rB"], "skip") == [
+        EncodingResult("._ _... _._.", 1),
+        EncodingResult("._ _...", 1)
+    ]
+    assert not check_message("AB\nC")
+
+
+def test_error_per_message():
+    results = encode_messages(["SOS", "café", "a\0b#", "73"])
+    assert results == [
+        EncodingResult("... ___ ..."),
+        EncodingResult(None, 1, "Unsupported character 'é' at position 3"),
+        EncodingResult(None, 2, "Unsupported character '\\x00' at position 1"),
+        EncodingResult("__... ...__")
+    ]
+
+
+def test_lone_surrogate_is_unsupported_character():
+    assert encode_messages(["ok", "bad\udcff"]) == [
+        EncodingResult("___ _._"),
+        EncodingResult(None, 1, "Unsupported character '\\udcff' at position 3")
+    ]
+    assert encode_messages(["\ud800ok"], "replace") == [EncodingResult("........ ___ _._", 1)]
+
+
+@mark.parametrize("policy, expected", [
+    ("skip", "_ . ... _ / ._"),
+    ("replace", "_ . ... _ ........ / ._ ........")
+])
+def test_policy(policy, expected):
+    assert encode_messages(["TEST# a€", "e"], policy) == [EncodingResult(expected, 2), EncodingResult(".")]
+
+
+def test_not_supported_policy():
+    with raises(ValueError):
+        list(encode_batch(["a"], "ignore"))
+
+
+@mark.parametrize("workers", [1, 2])
+def test_encode_batch(workers):
+    messages = get_messages(1, 500) + ["xé"]
+    results = list(encode_batch(iter(messages), workers=workers, batch_size=64))
+    assert results == encode_messages(messages)
+    assert results[-1].error == "Unsupported character 'é' at position 1"
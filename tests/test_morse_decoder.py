@@ -0,0 +1,83 @@
+from io import StringIO
+import random
+import string
+
+from pytest import (
+    mark,
+    raises
+)
+
+from morse_decoder import (
+    MAX_SYMBOL_LENGTH,
+    DecodingReport,
+    InvalidSymbolError,
+    decode_stream,
+    decode_text
+)
+from morse_encoder import encode_text
+
+
+def test_decode_text():
+    assert decode_text("_ . ... _ / ._ _... _._.") == "TEST ABC"
+    assert decode_text("... ___ ...\n") == "SOS"
+    assert decode_text("") == ""
+
+
+@mark.parametrize("seed", range(20))
+def test_round_trip(seed):
+    rng = random.Random(seed)
+    chars = string.ascii_letters + string.digits + ".,:?'-/()\"=+@"
+    message = rng.choice(chars) + "".join(rng.choice(chars + " ") for _ in range(rng.randrange(200)))
+    assert decode_text(encode_text(message)) == message.upper()
+
+
+@mark.parametrize("chunk_size", [1, 2, 5, 1000])
+def test_decode_stream_symbols_split_between_chunks(chunk_size):
+    code = encode_text("Hello Morse World")
+    output = StringIO()
+    report = decode_stream(StringIO(code), output, chunk_size=chunk_size)
+    assert output.getvalue() == "HELLO MORSE WORLD"
+    assert report == DecodingReport(len(code.split()), 0, [])
+
+
+@mark.parametrize("policy, expected", [
+    ("skip", "TES"),
+    ("replace", "T\ufffdES\ufffd")
+])
+@mark.parametrize("chunk_size", [3, 1000])
+def test_decode_stream_invalid_symbols(policy, expected, chunk_size):
+    output = StringIO()
+    report = decode_stream(StringIO("_ ........ . ... ._._._._"), output, policy, chunk_size)
+    assert output.getvalue() == expected
+    assert report == DecodingReport(5, 2, [2, 17])
+
+
+def test_decode_stream_error_offset():
+    with raises(InvalidSymbolError, match="'.x' at offset 8") as e:
+        decode_stream(StringIO("_ . ... .x _"), StringIO(), chunk_size=4)
+    assert (e.value.symbol, e.value.offset) == (".x", 8)
+
+
+@mark.parametrize("chunk_size", [1, 7, 1000, 100_000])
+def test_decode_stream_overlong_symbol(chunk_size):
+    code = "_ " + "." * 50_000 + " ._ / " + "_" * 7
+    output = StringIO()
+    report = decode_stream(StringIO(code), output, "replace", chunk_size)
+    assert output.getvalue() == decode_text(code, "replace") == "T\ufffdA \ufffd"
+    assert report == DecodingReport(5, 2, [2, 50_008])
+
+
+@mark.parametrize("separator", ["\x0b", "\x0c", "\u2028", "\u3000"])
+@mark.parametrize("chunk_size", [1, 2, 5, 1000])
+def test_decode_stream_unicode_whitespace_separates_symbols(separator, chunk_size):
+    code = encode_text("HELLO WORLD").replace(" ", separator, 3) + separator
+    output = StringIO()
+    report = decode_stream(StringIO(code), output, chunk_size=chunk_size)
+    assert output.getvalue() == decode_text(code) == "HELLO WORLD"
+    assert report == DecodingReport(len(code.split()), 0, [])
+
+
+def test_decode_stream_overlong_symbol_error():
+    with raises(InvalidSymbolError, match="at offset 2") as e:
+        decode_stream(StringIO("_ " + "." * 50_000), StringIO(), chunk_size=16)
+    assert e.value.symbol == "." * (MAX_SYMBOL_LENGTH + 1)
@@ -1,6 +1,21 @@
-from pytest import mark
+from argparse import Namespace
+from io import StringIO
 
-from morse_encoder import check_message, encode_text
+from pytest import (
+    mark,
+    raises
+)
+
+import morse_encoder
+from morse_decoder import decode_text
+from morse_encoder import (
+    EncodingReport,
+    UnsupportedCharacterError,
+    check_message,
+    encode_file,
+    encode_stream,
+    encode_text
+)
 
 
 @mark.parametrize("msg, expected",
@@ -8,7 +23,10 @@ from morse_encoder import check_message, encode_text
                       ("TEST", True),
                       ("TEST TEST", True),
                       ("test", True),
-                      ("1test", False)
+                      ("1test", True),
+                      ("CQ de SP2XYZ, 73!", False),
+                      ("café", False),
+                      ("", False)
                   ])
 def test_check_message(msg, expected):
     assert check_message(msg) == expected
@@ -18,3 +36,78 @@ def test_encode_text():
     assert encode_text("TEST") == "_ . ... _"
     assert encode_text("test") == "_ . ... _"
     assert encode_text("TEST abc") == "_ . ... _ / ._ _... _._."
+    assert encode_text("z8 1/2, ok?") == "__.. ___.. / .____ _.._. ..___ __..__ / ___ _._ ..__.."
+
+
+@mark.parametrize("chunk_size", [1, 3, 1000])
+def test_encode_stream_same_as_encode_text(chunk_size):
+    output = StringIO()
+    report = encode_stream(StringIO("TEST abc Morse"), output, chunk_size=chunk_size)
+    assert output.getvalue() == encode_text("TEST abc Morse")
+    assert report == EncodingReport(14, 0, [])
+
+
+def test_encode_stream_line_breaks():
+    output = StringIO()
+    encode_stream(StringIO("ab\r\ncd"), output)
+    assert output.getvalue() == encode_text("ab cd")
+
+
+@mark.parametrize("text, expected", [
+    ("ab\n", "ab"),
+    ("ab\r\n", "ab"),
+    ("ab\ncd\n", "ab cd"),
+    ("ab\n\n", "ab "),
+    ("\n", "")
+])
+@mark.parametrize("chunk_size", [1, 2, 1000])
+def test_encode_stream_final_line_break_not_encoded(text, expected, chunk_size):
+    output = StringIO()
+    report = encode_stream(StringIO(text), output, chunk_size=chunk_size)
+    assert output.getvalue() == (encode_text(expected) if expected.strip() else "")
+    assert decode_text(output.getvalue()) == expected.upper()
+    assert report.chars == len(text)
+
+
+def test_encode_file_error_keeps_previous_output(tmp_path):
+    input_path = tmp_path / "input.txt"
+    output_path = tmp_path / "output.txt"
+    input_path.write_text("TEST\n", encoding="utf-8")
+    encode_file(str(input_path), str(output_path))
+    assert output_path.read_text(encoding="utf-8") == encode_text("TEST")
+
+    input_path.write_text("TEST " * 1000 + "café\n", encoding="utf-8")
+    with raises(UnsupportedCharacterError):
+        encode_file(str(input_path), str(output_path))
+    assert output_path.read_text(encoding="utf-8") == encode_text("TEST")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["input.txt", "output.txt"]
+
+
+@mark.parametrize("policy, expected", [
+    ("skip", "_ . ... _ / ._"),
+    ("replace", "_ . ... _ ........ / ._ ........")
+])
+@mark.parametrize("chunk_size", [2, 1000])
+def test_encode_stream_invalid_policy(policy, expected, chunk_size):
+    output = StringIO()
+    report = encode_stream(StringIO("TEST# a%"), output, policy, chunk_size)
+    assert output.getvalue() == expected
+    assert report == EncodingReport(8, 2, [4, 7])
+
+
+def test_encode_stream_error_position():
+    with raises(UnsupportedCharacterError, match="'é' at position 8") as e:
+        encode_stream(StringIO("TEST café"), StringIO(), chunk_size=3)
+    assert (e.value.char, e.value.position) == ("é", 8)
+
+
+def test_main_plays_message_with_given_player(monkeypatch, capsys):
+    played = []
+
+    async def play(message, morse_code, path):
+        played.append((message, morse_code, path))
+
+    monkeypatch.setattr(morse_encoder, "Beep", lambda frequency, duration: None)
+    morse_encoder.main(Namespace(message="SOS", file=None, output=None, invalid="error"), play)
+    assert played == [("SOS", "... ___ ...", None)]
+    assert capsys.readouterr().out == "... ___ ...\n"
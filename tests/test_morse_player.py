@@ -0,0 +1,148 @@
+import asyncio
+
+import numpy as np
+from pytest import (
+    approx,
+    mark,
+    raises
+)
+
+from morse_audio import (
+    AudioSettings,
+    synthesize
+)
+from morse_player import (
+    BufferSink,
+    MorsePlayer,
+    RecorderSink,
+    Sink,
+    Tone,
+    get_timeline
+)
+
+WPM = 60  # dit 20 ms, tests run fast
+TOLERANCE = 0.015  # max lateness of tone start (seconds)
+
+
+@mark.parametrize("code, tones, duration_ms", [
+    (".", [(0, 70)], 140),
+    ("_ .", [(0, 210), (210 + 70 + 240, 70)], 210 + 70 + 240 + 70 + 70),
+    (". / .", [(0, 70), (70 + 70 + 240 + 490 + 240, 70)], 2 * 140 + 240 + 490 + 240),
+    ("", [], 0)
+])
+def test_get_timeline(code, tones, duration_ms):
+    timeline, duration = get_timeline(code)
+    assert timeline == [Tone(approx(start / 1000), approx(length / 1000)) for start, length in tones]
+    assert duration == approx(duration_ms / 1000)
+
+
+def test_get_timeline_invalid_character():
+    with raises(ValueError):
+        get_timeline("._x")
+
+
+def test_timing():
+    code = "... ___ ... / ... ___ ..."
+    sink = RecorderSink()
+
+    async def play():
+        return await MorsePlayer(sink, wpm=WPM).play(code)
+
+    end = asyncio.run(play())
+    tones, duration = get_timeline(code, 1200 / WPM / 70)
+    start = sink.tones[0].deadline
+    assert [tone.deadline - start for tone in sink.tones] == approx([tone.start for tone in tones])
+    assert [tone.duration for tone in sink.tones] == approx([tone.duration for tone in tones])
+    assert max(tone.started - tone.deadline for tone in sink.tones) < TOLERANCE
+    assert end == approx(start + duration)
+
+
+def test_slow_sink_does_not_accumulate_drift():
+    class SlowSink(RecorderSink):
+        async def tone(self, deadline, duration):
+            await super().tone(deadline, duration)
+            await asyncio.sleep(duration + 0.005)  # e.g. overhead of Beep
+
+    sink = SlowSink()
+
+    async def play():
+        await MorsePlayer(sink, wpm=WPM).play("_ _ _ _ _ _ _ _ _ _")
+
+    asyncio.run(play())
+    assert len(sink.tones) == 10
+    assert sink.tones[-1].started - sink.tones[-1].deadline < TOLERANCE  # 10 x 5 ms overhead not accumulated
+
+
+def test_queue():
+    sink = RecorderSink()
+
+    async def play():
+        player = MorsePlayer(sink, wpm=WPM)
+        first, second = player.submit("."), player.submit("_")
+        await player.join()
+        return player, await first, await second
+
+    player, first_end, second_end = asyncio.run(play())
+    assert len(sink.tones) == 2
+    assert sink.tones[1].deadline - first_end == approx(player.message_gap)
+    assert second_end == approx(sink.tones[1].deadline + get_timeline("_", player.time_scale)[1])
+
+
+def test_cancel():
+    sink = RecorderSink()
+
+    async def play():
+        player = MorsePlayer(sink, wpm=WPM)
+        first, second = player.submit("." * 100), player.submit(".")
+        await asyncio.sleep(0.1)
+        player.cancel()
+        await asyncio.sleep(0)
+        return first, second
+
+    first, second = asyncio.run(play())
+    assert first.cancelled() and second.cancelled()
+    assert 0 < len(sink.tones) < 10
+
+
+def test_other_tasks_run_while_playing():
+    events = []
+
+    async def play():
+        player = MorsePlayer(RecorderSink(), wpm=WPM)
+        playing = player.submit(". . .")
+        events.append("submitted")
+        await asyncio.sleep(0.01)
+        events.append("worked")
+        await playing
+        events.append("played")
+
+    asyncio.run(play())
+    assert events == ["submitted", "worked", "played"]
+
+
+def test_buffer_sink():
+    code = "_. / ."
+    settings = AudioSettings(wpm=1200 / 35)  # half of MORSE_TIMING durations, whole numbers of samples
+    sink = BufferSink(settings)
+
+    async def play():
+        await MorsePlayer(sink, wpm=settings.wpm).play(code)
+
+    asyncio.run(play())
+    expected = synthesize(code, settings)
+    assert np.array_equal(sink.samples, expected[:sink.samples.size])
+    assert not expected[sink.samples.size:].any()  # pause after the last tone
+
+
+def test_custom_sink_implements_tone():
+    class CountingSink(Sink):
+        def __init__(self) -> None:
+            self.durations = []
+
+        async def tone(self, deadline: float, duration: float) -> None:
+            self.durations.append(round(duration * 1000))
+
+    sink = CountingSink()
+    asyncio.run(MorsePlayer(sink, wpm=WPM).play("_ . /"))
+    assert sink.durations == [60, 20]
+    assert Sink.__abstractmethods__ == frozenset({"tone"})  # sinks without tone can not be created